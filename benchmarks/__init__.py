@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the COVID-19 analysis pipeline.
+
+Kept outside the ``src`` package so that they are not shipped with it; run
+them from the project root with ``python -m benchmarks.pipeline``.
+"""
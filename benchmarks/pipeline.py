@@ -0,0 +1,893 @@
+"""
+Performance Benchmarks for the COVID-19 Analysis Pipeline
+=========================================================
+
+This module contains small, self-contained benchmarks that compare the
+optimized code paths against the original implementations.
+
+Usage:
+------
+python -m benchmarks.pipeline data/raw/WHO-COVID-19-global-daily-data.csv [snapshot glob]
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+def _time_call(func, n_runs=3):
+    """Return the best wall-clock time (seconds) of ``n_runs`` calls and the last result."""
+    timings = []
+    result = None
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def benchmark_cached_load(file_path, n_runs=3, columns=None):
+    """
+    Compare CSV parsing against loading through the columnar cache.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the raw WHO CSV file
+    n_runs : int
+        Number of timed runs per path (best time is reported)
+    columns : list, optional
+        Column subset for an additional projected cache read
+
+    Returns:
+    --------
+    dict
+        Timings in seconds and speedup factors
+    """
+    from src.optimized_preprocessing import load_covid_data_optimized
+
+    cache_dir = tempfile.mkdtemp(prefix='covid_cache_bench_')
+    try:
+        csv_time, _ = _time_call(
+            lambda: load_covid_data_optimized(file_path, use_cache=False), n_runs)
+
+        # Populate the cache, then time warm loads only
+        _time_call(lambda: load_covid_data_optimized(file_path, cache_dir=cache_dir), 1)
+        cache_time, _ = _time_call(
+            lambda: load_covid_data_optimized(file_path, cache_dir=cache_dir), n_runs)
+
+        results = {
+            'csv_seconds': csv_time,
+            'cache_seconds': cache_time,
+            'speedup': csv_time / cache_time
+        }
+
+        if columns is not None:
+            projected_time, _ = _time_call(
+                lambda: load_covid_data_optimized(file_path, cache_dir=cache_dir,
+                                                  columns=columns), n_runs)
+            results['projected_seconds'] = projected_time
+            results['projected_speedup'] = csv_time / projected_time
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print("⏱️ Columnar cache benchmark:")
+    print(f"  CSV parse:     {results['csv_seconds']:.3f}s")
+    print(f"  Cached load:   {results['cache_seconds']:.3f}s ({results['speedup']:.1f}x faster)")
+    if 'projected_seconds' in results:
+        print(f"  Cached subset: {results['projected_seconds']:.3f}s "
+              f"({results['projected_speedup']:.1f}x faster)")
+
+    return results
+
+
+def benchmark_snapshot_loader(paths, worker_counts=None, n_runs=1):
+    """
+    Measure multi-snapshot loading throughput for increasing worker counts.
+
+    Parameters:
+    -----------
+    paths : str or list
+        Glob pattern or list of snapshot paths
+    worker_counts : list, optional
+        Worker counts to test (defaults to 1, 2, 4, ... up to the CPU count)
+    n_runs : int
+        Number of timed runs per worker count (best time is reported)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Seconds, snapshots per second and speedup per worker count
+    """
+    import pandas as pd
+    from src.snapshot_loader import load_snapshots, resolve_snapshot_paths
+
+    n_files = len(resolve_snapshot_paths(paths))
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, cpus} | {2 ** i for i in range(1, 8) if 2 ** i < cpus})
+
+    rows = []
+    for n_workers in worker_counts:
+        seconds, _ = _time_call(lambda: load_snapshots(paths, n_workers=n_workers), n_runs)
+        rows.append({'workers': n_workers, 'seconds': seconds,
+                     'snapshots_per_second': n_files / seconds})
+
+    results = pd.DataFrame(rows)
+    results['speedup'] = results['seconds'].iloc[0] / results['seconds']
+
+    print(f"⏱️ Snapshot loader benchmark ({n_files} files):")
+    for _, row in results.iterrows():
+        print(f"  {int(row['workers'])} worker(s): {row['seconds']:.3f}s "
+              f"({row['snapshots_per_second']:.1f} files/s, {row['speedup']:.1f}x)")
+
+    return results
+
+
+def _groupby_series_features(df):
+    """Baseline: the groupby-based growth/rolling code formerly in ``create_features``."""
+    df = df.sort_values(['Country', 'Date_reported'])
+    grouped = df.groupby('Country', observed=True)
+    df['Cases_Growth_Rate'] = grouped['Cumulative_cases'].pct_change() * 100
+    df['Deaths_Growth_Rate'] = grouped['Cumulative_deaths'].pct_change() * 100
+    df['New_cases_7day_avg'] = grouped['New_cases'].rolling(7, min_periods=1).mean().reset_index(0, drop=True)
+    df['New_deaths_7day_avg'] = grouped['New_deaths'].rolling(7, min_periods=1).mean().reset_index(0, drop=True)
+    return df
+
+
+def _loop_series_features(df):
+    """Baseline: the per-country loop formerly in ``create_features_optimized``."""
+    import pandas as pd
+
+    df = df.sort_values(['Country', 'Date_reported']).reset_index(drop=True)
+    columns = {name: [] for name in ['Cases_Growth_Rate', 'Deaths_Growth_Rate',
+                                     'New_cases_7day_avg', 'New_deaths_7day_avg']}
+    for country in df['Country'].unique():
+        country_data = df[df['Country'] == country]
+        columns['Cases_Growth_Rate'].extend(
+            (country_data['Cumulative_cases'].pct_change() * 100).fillna(0).tolist())
+        columns['Deaths_Growth_Rate'].extend(
+            (country_data['Cumulative_deaths'].pct_change() * 100).fillna(0).tolist())
+        columns['New_cases_7day_avg'].extend(
+            country_data['New_cases'].rolling(7, min_periods=1).mean().fillna(0).tolist())
+        columns['New_deaths_7day_avg'].extend(
+            country_data['New_deaths'].rolling(7, min_periods=1).mean().fillna(0).tolist())
+    for name, values in columns.items():
+        df[name] = pd.Series(values, dtype='float32')
+    return df
+
+
+def benchmark_feature_engine(df_clean, n_runs=3):
+    """
+    Compare the vectorized feature engine with the former implementations.
+
+    Parameters:
+    -----------
+    df_clean : pd.DataFrame
+        Cleaned dataset
+    n_runs : int
+        Number of timed runs per implementation (best time is reported)
+
+    Returns:
+    --------
+    dict
+        Timings in seconds, speedups and the largest absolute difference
+        between the engine and the groupby baseline
+    """
+    from src.feature_engine import add_series_features
+
+    groupby_time, expected = _time_call(lambda: _groupby_series_features(df_clean), n_runs)
+    loop_time, _ = _time_call(lambda: _loop_series_features(df_clean), n_runs)
+    engine_time, result = _time_call(lambda: add_series_features(df_clean), n_runs)
+
+    feature_cols = ['Cases_Growth_Rate', 'Deaths_Growth_Rate',
+                    'New_cases_7day_avg', 'New_deaths_7day_avg']
+    diff = np.abs(result[feature_cols].to_numpy(dtype=float)
+                  - expected[feature_cols].to_numpy(dtype=float))
+    same_nan = np.isnan(diff) == np.isnan(expected[feature_cols].to_numpy(dtype=float))
+    finite = np.isfinite(diff)
+    max_diff = float(diff[finite].max()) if finite.any() else 0.0
+
+    results = {
+        'groupby_seconds': groupby_time,
+        'loop_seconds': loop_time,
+        'engine_seconds': engine_time,
+        'speedup_vs_groupby': groupby_time / engine_time,
+        'speedup_vs_loop': loop_time / engine_time,
+        'max_abs_diff': max_diff,
+        'same_missing': bool(same_nan.all())
+    }
+
+    print(f"⏱️ Feature engine benchmark ({len(df_clean):,} rows):")
+    print(f"  groupby (create_features):          {groupby_time:.3f}s")
+    print(f"  per-country loop (optimized):       {loop_time:.3f}s")
+    print(f"  vectorized engine:                  {engine_time:.3f}s "
+          f"({results['speedup_vs_groupby']:.1f}x / {results['speedup_vs_loop']:.1f}x faster)")
+    print(f"  max |engine - groupby|: {max_diff:.2e}")
+
+    return results
+
+
+def _copying_clean_data(df):
+    """Baseline: the step-by-step ``clean_data`` that copied the frame at every step."""
+    import pandas as pd
+
+    df_clean = df.copy()
+    df_clean.columns = df_clean.columns.str.strip().str.replace(' ', '_')
+    df_clean['Date_reported'] = pd.to_datetime(df_clean['Date_reported'])
+    for col in ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']:
+        if col in df_clean.columns:
+            df_clean[col] = df_clean[col].fillna(0)
+            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+    return df_clean.drop_duplicates()
+
+
+def _peak_memory(func):
+    """Return the peak traced allocation (MB) of one call."""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        return tracemalloc.get_traced_memory()[1] / 1024**2
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_cleaning(df_raw, n_runs=3):
+    """
+    Compare the cleaning engine with the former copy-per-step cleaning.
+
+    Parameters:
+    -----------
+    df_raw : pd.DataFrame
+        Raw dataset as read from the CSV
+    n_runs : int
+        Number of timed runs per implementation (best time is reported)
+
+    Returns:
+    --------
+    dict
+        Timings, speedup, peak allocations relative to the input size and
+        whether the outputs are identical
+    """
+    from src.data_preprocessing import clean_data
+
+    input_mb = df_raw.memory_usage(deep=True).sum() / 1024**2
+    baseline_time, expected = _time_call(lambda: _copying_clean_data(df_raw), n_runs)
+    engine_time, result = _time_call(lambda: clean_data(df_raw), n_runs)
+    inplace_time, _ = _time_call(lambda: clean_data(df_raw.copy(), inplace=True), n_runs)
+
+    results = {
+        'baseline_seconds': baseline_time,
+        'engine_seconds': engine_time,
+        'speedup': baseline_time / engine_time,
+        'baseline_peak_ratio': _peak_memory(lambda: _copying_clean_data(df_raw)) / input_mb,
+        'engine_peak_ratio': _peak_memory(lambda: clean_data(df_raw)) / input_mb,
+        'identical': bool(result.equals(expected))
+    }
+
+    print(f"⏱️ Cleaning benchmark ({len(df_raw):,} rows, {input_mb:.1f} MB):")
+    print(f"  copy per step:    {baseline_time:.3f}s, "
+          f"allocates {results['baseline_peak_ratio']:.2f}x input")
+    print(f"  cleaning engine:  {engine_time:.3f}s, "
+          f"allocates {results['engine_peak_ratio']:.2f}x input "
+          f"({results['speedup']:.1f}x faster, identical={results['identical']})")
+    print(f"  engine, inplace:  {inplace_time:.3f}s (includes copying the input)")
+
+    return results
+
+
+def with_injected_revisions(df, share=0.01, random_state=42):
+    """
+    Append exact duplicates and conflicting revisions of random rows.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned dataset
+    share : float
+        Share of rows re-appended as exact duplicates, and again as revisions
+        with a changed New_cases value
+    random_state : int
+        Seed of the row selection
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataset with ``2 * share * len(df)`` extra rows
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(random_state)
+    n_rows = max(int(len(df) * share), 1)
+    duplicates = df.iloc[rng.choice(len(df), n_rows, replace=False)]
+    revisions = df.iloc[rng.choice(len(df), n_rows, replace=False)].copy()
+    revisions['New_cases'] = revisions['New_cases'] + rng.integers(1, 100, n_rows)
+    return pd.concat([df, duplicates, revisions], ignore_index=True)
+
+
+def benchmark_deduplication(df_clean, share=0.01, n_runs=3):
+    """
+    Compare full-row ``drop_duplicates`` with key-based deduplication.
+
+    Parameters:
+    -----------
+    df_clean : pd.DataFrame
+        Cleaned dataset (without duplicates)
+    share : float
+        Share of injected exact duplicates and of injected conflicting revisions
+    n_runs : int
+        Number of timed runs per implementation (best time is reported)
+
+    Returns:
+    --------
+    dict
+        Timings, speedup, rows kept by each method and conflicts found
+    """
+    from src.cleaning import dedup_key_columns, resolve_key_conflicts
+
+    df = with_injected_revisions(df_clean, share)
+    key_cols = list(dedup_key_columns(df))
+
+    full_time, full_result = _time_call(lambda: df.drop_duplicates(), n_runs)
+    key_time, (removed, _, conflicts) = _time_call(lambda: resolve_key_conflicts(df), n_runs)
+
+    results = {
+        'full_row_seconds': full_time,
+        'key_seconds': key_time,
+        'speedup': full_time / key_time,
+        'full_row_rows': len(full_result),
+        'full_row_duplicate_keys': int(full_result.duplicated(key_cols).sum()),
+        'key_rows': int((~removed).sum()),
+        'conflicts': len(conflicts)
+    }
+
+    print(f"⏱️ Deduplication benchmark ({len(df):,} rows, {share:.0%} duplicates "
+          f"and {share:.0%} revisions injected):")
+    print(f"  full-row drop_duplicates: {full_time:.3f}s, {results['full_row_rows']:,} rows kept, "
+          f"{results['full_row_duplicate_keys']:,} duplicate keys left")
+    print(f"  key-based dedup:          {key_time:.3f}s, {results['key_rows']:,} rows kept, "
+          f"{results['conflicts']:,} conflicts reported ({results['speedup']:.1f}x faster)")
+
+    return results
+
+
+def benchmark_parallel_features(df_clean, job_counts=None, n_runs=3):
+    """
+    Measure the scaling of ``add_series_features`` across worker process counts.
+
+    Parameters:
+    -----------
+    df_clean : pd.DataFrame
+        Cleaned dataset
+    job_counts : list, optional
+        ``n_jobs`` values to test (defaults to 1, 2, 4, ... up to the CPU count)
+    n_runs : int
+        Number of timed runs per job count (best time is reported)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Seconds, rows per second, speedup and parallel efficiency per job count
+    """
+    import pandas as pd
+    from src.feature_engine import add_series_features
+
+    if job_counts is None:
+        cpus = os.cpu_count() or 1
+        job_counts = sorted({1, cpus} | {2 ** i for i in range(1, 8) if 2 ** i < cpus})
+
+    feature_cols = ['Cases_Growth_Rate', 'Deaths_Growth_Rate',
+                    'New_cases_7day_avg', 'New_deaths_7day_avg']
+    rows = []
+    reference = None
+    for n_jobs in job_counts:
+        seconds, result = _time_call(lambda: add_series_features(df_clean, n_jobs=n_jobs), n_runs)
+        if reference is None:
+            reference = result[feature_cols]
+        rows.append({'n_jobs': n_jobs, 'seconds': seconds,
+                     'rows_per_second': len(df_clean) / seconds,
+                     'identical': bool(result[feature_cols].equals(reference))})
+
+    results = pd.DataFrame(rows)
+    results['speedup'] = results['seconds'].iloc[0] / results['seconds']
+    results['efficiency'] = results['speedup'] / results['n_jobs']
+
+    print(f"⏱️ Parallel feature benchmark ({len(df_clean):,} rows, {os.cpu_count()} CPUs):")
+    for _, row in results.iterrows():
+        print(f"  n_jobs={int(row['n_jobs'])}: {row['seconds']:.3f}s "
+              f"({row['rows_per_second']:,.0f} rows/s, {row['speedup']:.1f}x, "
+              f"efficiency {row['efficiency']:.0%}, identical={row['identical']})")
+
+    return results
+
+
+def _sequential_cluster_sweep(X, k_range=range(2, 11)):
+    """Baseline: the former sweep (exact silhouette per k, then a refit of the winner)."""
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+    from sklearn.preprocessing import StandardScaler
+
+    X_scaled = StandardScaler().fit_transform(X)
+    scores = [silhouette_score(X_scaled, KMeans(n_clusters=k, random_state=42, n_init=10)
+                               .fit_predict(X_scaled)) for k in k_range]
+    optimal_k = k_range[int(np.argmax(scores))]
+    X_scaled = StandardScaler().fit_transform(X)
+    return KMeans(n_clusters=optimal_k, random_state=42, n_init=10).fit_predict(X_scaled)
+
+
+def benchmark_cluster_sweep(X, job_counts=None, silhouette_sample_size=10000):
+    """
+    Compare the former sequential k sweep with ``COVIDClustering.fit_predict``.
+
+    Parameters:
+    -----------
+    X : array-like
+        Feature matrix
+    job_counts : list, optional
+        ``n_jobs`` values to test (defaults to 1 and the CPU count)
+    silhouette_sample_size : int
+        Rows above which the silhouette is computed on a sample
+
+    Returns:
+    --------
+    pd.DataFrame
+        Seconds, speedup and agreement with the baseline labels per configuration
+    """
+    import pandas as pd
+    from src.modeling import COVIDClustering
+
+    if job_counts is None:
+        job_counts = sorted({1, os.cpu_count() or 1})
+
+    baseline_time, expected = _time_call(lambda: _sequential_cluster_sweep(X), n_runs=1)
+    rows = [{'method': 'sequential, exact silhouette', 'seconds': baseline_time,
+             'same_labels': True}]
+    for n_jobs in job_counts:
+        clusterer = COVIDClustering(n_jobs=n_jobs, silhouette_sample_size=silhouette_sample_size)
+        seconds, labels = _time_call(lambda: clusterer.fit_predict(X), n_runs=1)
+        rows.append({'method': f'sweep, n_jobs={n_jobs}', 'seconds': seconds,
+                     'same_labels': bool(np.array_equal(labels, expected))})
+
+    results = pd.DataFrame(rows)
+    results['speedup'] = baseline_time / results['seconds']
+
+    print(f"⏱️ Cluster sweep benchmark ({len(X):,} rows, silhouette sample "
+          f"{silhouette_sample_size:,}):")
+    for _, row in results.iterrows():
+        print(f"  {row['method']}: {row['seconds']:.2f}s ({row['speedup']:.1f}x, "
+              f"same labels={row['same_labels']})")
+
+    return results
+
+
+def benchmark_streaming_clustering(X, chunk_rows=50000, silhouette_sample_size=5000):
+    """
+    Compare streaming mini-batch clustering with the exact in-memory path.
+
+    Parameters:
+    -----------
+    X : np.ndarray
+        Feature matrix, small enough for the exact path
+    chunk_rows : int
+        Rows per chunk fed to ``fit_streaming``
+    silhouette_sample_size : int
+        Sample size of both paths
+
+    Returns:
+    --------
+    dict
+        Chosen k, timings, peak allocations (MB) and label agreement
+        (adjusted Rand index); the streaming peak depends on the chunk and
+        sample sizes, not on the number of rows
+    """
+    from sklearn.metrics import adjusted_rand_score
+    from src.modeling import COVIDClustering
+
+    def chunks():
+        return (X[i:i + chunk_rows] for i in range(0, len(X), chunk_rows))
+
+    exact = COVIDClustering(silhouette_sample_size=silhouette_sample_size)
+    exact_time, exact_labels = _time_call(lambda: exact.fit_predict(X), n_runs=1)
+
+    streaming = COVIDClustering(silhouette_sample_size=silhouette_sample_size)
+    streaming_time, _ = _time_call(lambda: streaming.fit_streaming(chunks), n_runs=1)
+    streaming_labels = np.concatenate(list(streaming.predict_streaming(chunks)))
+
+    results = {
+        'exact_k': exact.n_clusters,
+        'streaming_k': streaming.n_clusters,
+        'exact_seconds': exact_time,
+        'streaming_seconds': streaming_time,
+        'exact_peak_mb': _peak_memory(
+            lambda: COVIDClustering(silhouette_sample_size=silhouette_sample_size)
+            .fit_predict(X)),
+        'streaming_peak_mb': _peak_memory(
+            lambda: COVIDClustering(silhouette_sample_size=silhouette_sample_size)
+            .fit_streaming(chunks)),
+        'adjusted_rand_index': adjusted_rand_score(exact_labels, streaming_labels)
+    }
+
+    print(f"⏱️ Streaming clustering benchmark ({len(X):,} rows, {X.nbytes / 1024**2:.1f} MB, "
+          f"{chunk_rows:,}-row chunks):")
+    print(f"  exact KMeans:       k={results['exact_k']}, {exact_time:.2f}s, "
+          f"peak {results['exact_peak_mb']:.1f} MB")
+    print(f"  mini-batch stream:  k={results['streaming_k']}, {streaming_time:.2f}s, "
+          f"peak {results['streaming_peak_mb']:.1f} MB, "
+          f"ARI vs exact {results['adjusted_rand_index']:.3f}")
+
+    return results
+
+
+def _serial_country_forecasts(df_clean):
+    """Baseline: ``create_time_features`` + ``train`` for one country after another."""
+    from src.modeling import COVIDForecaster
+
+    cases_r2 = []
+    for _, country_data in df_clean.groupby('Country', observed=True):
+        forecaster = COVIDForecaster()
+        results = forecaster.train(forecaster.create_time_features(
+            country_data.sort_values('Date_reported').reset_index(drop=True)))
+        cases_r2.append(results['cases_r2'])
+    return cases_r2
+
+
+def benchmark_batch_forecasting(df_clean, job_counts=None, n_series=None):
+    """
+    Compare a serial per-country training loop with ``COVIDForecaster.train_batch``.
+
+    Parameters:
+    -----------
+    df_clean : pd.DataFrame
+        Cleaned dataset
+    job_counts : list, optional
+        ``n_jobs`` values for the per-series mode (defaults to 1 and the CPU count)
+    n_series : int, optional
+        Only use the first ``n_series`` countries
+
+    Returns:
+    --------
+    pd.DataFrame
+        Seconds, series per second and median cases R² per method
+    """
+    import pandas as pd
+    from src.modeling import COVIDForecaster
+
+    if n_series is not None:
+        countries = sorted(df_clean['Country'].unique())[:n_series]
+        df_clean = df_clean[df_clean['Country'].isin(countries)]
+    n_countries = df_clean['Country'].nunique()
+    if job_counts is None:
+        job_counts = sorted({1, os.cpu_count() or 1})
+
+    baseline_time, cases_r2 = _time_call(lambda: _serial_country_forecasts(df_clean), n_runs=1)
+    rows = [{'method': 'serial loop', 'seconds': baseline_time,
+             'median_cases_r2': float(np.median(cases_r2))}]
+    runs = [('per_series', n_jobs) for n_jobs in job_counts] + [('pooled', job_counts[-1])]
+    for mode, n_jobs in runs:
+        seconds, metrics = _time_call(
+            lambda: COVIDForecaster().train_batch(df_clean, mode=mode, n_jobs=n_jobs), n_runs=1)
+        rows.append({'method': f'{mode}, n_jobs={n_jobs}', 'seconds': seconds,
+                     'median_cases_r2': metrics['cases_r2'].median()})
+
+    results = pd.DataFrame(rows)
+    results['series_per_second'] = n_countries / results['seconds']
+    results['speedup'] = baseline_time / results['seconds']
+
+    print(f"⏱️ Batch forecasting benchmark ({n_countries:,} countries, {os.cpu_count()} CPUs):")
+    for _, row in results.iterrows():
+        print(f"  {row['method']}: {row['seconds']:.1f}s ({row['series_per_second']:.2f} "
+              f"series/s, {row['speedup']:.1f}x, median cases R² {row['median_cases_r2']:.3f})")
+
+    return results
+
+
+def _dataframe_recursive_forecast(forecaster, series, code, horizon, n_iterations=2):
+    """Baseline: recursive forecast of one series, rebuilding a feature DataFrame every step."""
+    import pandas as pd
+    from src.modeling import COVIDForecaster
+
+    cases_model, deaths_model = forecaster.pooled_models
+    start_date = forecaster.start_date
+    series = series[['Date_reported', 'New_cases', 'New_deaths']].reset_index(drop=True)
+    for _ in range(horizon):
+        guess = series.iloc[-1][['New_cases', 'New_deaths']].to_numpy(dtype=np.float64)
+        next_day = series['Date_reported'].iloc[-1] + pd.Timedelta(days=1)
+        for _ in range(n_iterations):
+            extended = pd.concat([series, pd.DataFrame({'Date_reported': [next_day],
+                                                        'New_cases': [guess[0]],
+                                                        'New_deaths': [guess[1]]})],
+                                 ignore_index=True)
+            features = COVIDForecaster().create_time_features(extended)
+            # days_since_start counts from the training start, not from this series
+            features['days_since_start'] = (features['Date_reported'] - start_date).dt.days
+            X = np.append(features[forecaster.FEATURE_COLUMNS].to_numpy()[-1], code)[None, :]
+            guess = np.array([cases_model.predict(X)[0], deaths_model.predict(X)[0]])
+        series = extended
+        series.iloc[-1, 1:] = guess
+    return series.iloc[-horizon:]
+
+
+def benchmark_recursive_forecast(df_clean, horizon=28, n_baseline_series=3):
+    """
+    Compare per-step DataFrame rebuilding with the batched ``COVIDForecaster.forecast``.
+
+    A pooled model is trained first; the baseline forecasts the first
+    ``n_baseline_series`` countries one by one, the batched path forecasts
+    every country in one call.
+
+    Parameters:
+    -----------
+    df_clean : pd.DataFrame
+        Cleaned dataset
+    horizon : int
+        Days to forecast
+    n_baseline_series : int
+        Countries forecast with the baseline
+
+    Returns:
+    --------
+    dict
+        Milliseconds per series for both paths, total batched latency and
+        whether the baseline forecasts are reproduced
+    """
+    from src.modeling import COVIDForecaster
+
+    forecaster = COVIDForecaster()
+    with contextlib.redirect_stdout(io.StringIO()):
+        forecaster.train_batch(df_clean, mode='pooled')
+
+    batched_time, forecasts = _time_call(
+        lambda: forecaster.forecast(df_clean, horizon, group_col='Country'), n_runs=3)
+    n_series = forecasts['Country'].nunique()
+
+    countries = forecaster.series_vocabulary.classes_[:n_baseline_series]
+    start = time.perf_counter()
+    identical = True
+    for code, country in enumerate(countries):
+        series = df_clean[df_clean['Country'] == country].sort_values('Date_reported')
+        expected = _dataframe_recursive_forecast(forecaster, series, code, horizon)
+        result = forecasts[forecasts['Country'] == country]
+        identical &= bool(np.allclose(result['New_cases_forecast'], expected['New_cases'])
+                          and np.allclose(result['New_deaths_forecast'], expected['New_deaths']))
+    baseline_time = time.perf_counter() - start
+
+    results = {
+        'baseline_ms_per_series': baseline_time / len(countries) * 1000,
+        'batched_ms_per_series': batched_time / n_series * 1000,
+        'batched_seconds': batched_time,
+        'identical': identical
+    }
+    results['speedup'] = results['baseline_ms_per_series'] / results['batched_ms_per_series']
+
+    print(f"⏱️ Recursive forecast benchmark ({horizon}-day horizon):")
+    print(f"  DataFrame per step: {results['baseline_ms_per_series']:,.0f} ms/series "
+          f"({len(countries)} series)")
+    print(f"  batched NumPy:      {results['batched_ms_per_series']:,.1f} ms/series "
+          f"({n_series:,} series in {batched_time:.2f}s, {results['speedup']:.0f}x faster, "
+          f"identical={identical})")
+
+    return results
+
+
+def _recomputing_backtest(series, n_folds, horizon):
+    """Baseline: one ``create_time_features`` + ``train`` per expanding fold, in sequence."""
+    from src.modeling import COVIDForecaster
+
+    cases_rmse = []
+    for i in range(n_folds - 1, -1, -1):
+        fold_data = series.iloc[:len(series) - horizon * i].reset_index(drop=True)
+        forecaster = COVIDForecaster()
+        features = forecaster.create_time_features(fold_data)
+        n_rows = len(features[forecaster.FEATURE_COLUMNS].dropna())
+        cases_rmse.append(forecaster.train(features, test_size=horizon / n_rows)['cases_rmse'])
+    return cases_rmse
+
+
+def benchmark_backtest(df_clean, n_folds=5, horizon=28, job_counts=None):
+    """
+    Compare per-fold feature recomputation with ``COVIDForecaster.backtest``.
+
+    Both run expanding-window folds on the global daily series.
+
+    Parameters:
+    -----------
+    df_clean : pd.DataFrame
+        Cleaned dataset
+    n_folds : int
+        Number of folds
+    horizon : int
+        Days in each test window
+    job_counts : list, optional
+        ``n_jobs`` values to test (defaults to 1 and the CPU count)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Seconds, speedup and agreement with the baseline per configuration
+    """
+    import pandas as pd
+    from src.modeling import COVIDForecaster
+
+    series = (df_clean.groupby('Date_reported')[['New_cases', 'New_deaths']].sum()
+              .reset_index())
+    if job_counts is None:
+        job_counts = sorted({1, os.cpu_count() or 1})
+
+    baseline_time, expected = _time_call(
+        lambda: _recomputing_backtest(series, n_folds, horizon), n_runs=1)
+    rows = [{'method': 'recompute per fold', 'seconds': baseline_time, 'same_rmse': True}]
+    for n_jobs in job_counts:
+        seconds, results = _time_call(
+            lambda: COVIDForecaster().backtest(series, n_folds, horizon, n_jobs=n_jobs), n_runs=1)
+        rows.append({'method': f'backtest, n_jobs={n_jobs}', 'seconds': seconds,
+                     'same_rmse': bool(np.allclose(results['cases_rmse'], expected))})
+
+    results = pd.DataFrame(rows)
+    results['speedup'] = baseline_time / results['seconds']
+
+    print(f"⏱️ Backtest benchmark ({n_folds} expanding folds, {horizon}-day horizon, "
+          f"{os.cpu_count()} CPUs):")
+    for _, row in results.iterrows():
+        print(f"  {row['method']}: {row['seconds']:.2f}s ({row['speedup']:.1f}x, "
+              f"same RMSE={row['same_rmse']})")
+
+    return results
+
+
+_OUT_OF_CORE_SCRIPT = """
+import contextlib, io, json, resource, sys, time
+from src.out_of_core import run_out_of_core_pipeline
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    path, modeling_data, _ = run_out_of_core_pipeline(
+        sys.argv[1], sys.argv[2], max_rows=int(sys.argv[3]), sample_for_modeling=int(sys.argv[4]))
+print(json.dumps({'seconds': time.perf_counter() - start,
+                  'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def benchmark_out_of_core_memory(file_paths, max_rows=50000, sample_for_modeling=20000,
+                                 tolerance_mb=32):
+    """
+    Check that peak RSS of the out-of-core pipeline does not grow with dataset size.
+
+    Each dataset is processed in a fresh interpreter so that peak RSS
+    (``ru_maxrss``) covers only that run.
+
+    Parameters:
+    -----------
+    file_paths : list
+        Raw WHO CSV files of increasing size
+    max_rows : int
+        Row budget passed to ``run_out_of_core_pipeline``
+    sample_for_modeling : int
+        Modeling sample size passed to ``run_out_of_core_pipeline``
+    tolerance_mb : float
+        Allowed peak RSS growth between the smallest and the largest dataset
+
+    Returns:
+    --------
+    pd.DataFrame
+        Rows, seconds and peak RSS per dataset, with a 'within_budget' flag
+    """
+    import json
+    import pandas as pd
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    rows = []
+    for file_path in file_paths:
+        output_dir = tempfile.mkdtemp(prefix='covid_ooc_bench_')
+        try:
+            completed = subprocess.run(
+                [sys.executable, '-c', _OUT_OF_CORE_SCRIPT, os.path.abspath(file_path),
+                 output_dir, str(max_rows), str(sample_for_modeling)],
+                cwd=project_root, capture_output=True, text=True, check=True)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        with open(file_path) as f:
+            n_rows = sum(1 for _ in f) - 1
+        rows.append({'file': os.path.basename(file_path), 'rows': n_rows,
+                     **json.loads(completed.stdout.strip().splitlines()[-1])})
+
+    results = pd.DataFrame(rows)
+    results['within_budget'] = (results['peak_rss_mb']
+                                <= results['peak_rss_mb'].iloc[0] + tolerance_mb)
+
+    print(f"⏱️ Out-of-core memory benchmark (max_rows={max_rows:,}):")
+    for _, row in results.iterrows():
+        print(f"  {row['file']}: {row['rows']:,} rows in {row['seconds']:.1f}s, "
+              f"peak RSS {row['peak_rss_mb']:.0f} MB "
+              f"({'✅' if row['within_budget'] else '❌'})")
+
+    return results
+
+
+IMPORT_TIME_BUDGETS = {
+    'src': 0.05,
+    'src.optimized_preprocessing': 1.5,
+}
+
+
+def benchmark_import_time(budgets=None, n_runs=3):
+    """
+    Measure cold import times in fresh interpreters and compare them to budgets.
+
+    Parameters:
+    -----------
+    budgets : dict, optional
+        Module name -> maximum import time in seconds (defaults to IMPORT_TIME_BUDGETS)
+    n_runs : int
+        Number of fresh interpreters per module (best time is reported)
+
+    Returns:
+    --------
+    dict
+        Module name -> (seconds, within_budget)
+    """
+    budgets = budgets or IMPORT_TIME_BUDGETS
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import time; start = time.perf_counter(); import {module}; "
+            "print(time.perf_counter() - start)")
+
+    results = {}
+    print("⏱️ Import time benchmark:")
+    for module, budget in budgets.items():
+        timings = []
+        for _ in range(n_runs):
+            output = subprocess.run([sys.executable, '-c', code.format(module=module)],
+                                    cwd=project_root, capture_output=True, text=True, check=True)
+            timings.append(float(output.stdout.strip()))
+        seconds = min(timings)
+        results[module] = (seconds, seconds <= budget)
+        status = "✅" if seconds <= budget else "❌"
+        print(f"  {status} import {module}: {seconds:.3f}s (budget {budget:.3f}s)")
+
+    return results
+
+
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else 'data/raw/WHO-COVID-19-global-daily-data.csv'
+
+    print("🚀 COVID-19 Pipeline Benchmarks")
+    print("=" * 60)
+
+    benchmark_import_time()
+    benchmark_cached_load(data_path, columns=['Date_reported', 'Country', 'New_cases'])
+
+    import pandas as pd
+    benchmark_cleaning(pd.read_csv(data_path))
+
+    from src.optimized_preprocessing import clean_data_optimized, load_covid_data_optimized
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_clean = clean_data_optimized(load_covid_data_optimized(data_path))
+    benchmark_deduplication(df_clean)
+    benchmark_feature_engine(df_clean)
+    benchmark_parallel_features(df_clean)
+
+    # Several snapshot files if a glob is given, otherwise the single dataset
+    benchmark_snapshot_loader(sys.argv[2] if len(sys.argv) > 2 else data_path)
+
+    count_cols = ['New_cases', 'New_deaths', 'Cumulative_cases', 'Cumulative_deaths']
+    X = (df_clean[count_cols].sample(min(len(df_clean), 20000), random_state=42)
+         .to_numpy(dtype=np.float64))
+    benchmark_cluster_sweep(X)
+    benchmark_streaming_clustering(X, chunk_rows=10000)
+
+    benchmark_batch_forecasting(df_clean, n_series=20)
+    benchmark_recursive_forecast(df_clean)
+    benchmark_backtest(df_clean)
+    benchmark_out_of_core_memory([data_path])
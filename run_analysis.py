@@ -56,7 +56,7 @@ def main():
     df = load_covid_data(data_path)
     
     if df is None:
-        print("❌ Failed to load data. Please check the file path.")
+        print(f"❌ Dataset not found at {data_path}. Please check the file path.")
         return
     
     # Clean data
@@ -161,14 +161,7 @@ def main():
     outbreak_data = modeling_data[modeling_data['Cases_Growth_Rate'].notna()].copy()
     
     predictor = OutbreakPredictor()
-    outbreak_data = predictor.create_risk_labels(outbreak_data)
-    
-    outbreak_features = ['New_cases', 'New_deaths', 'Cumulative_cases', 'Cumulative_deaths',
-                        'Case_Fatality_Rate', 'New_cases_7day_avg', 'New_deaths_7day_avg',
-                        'WHO_region_encoded', 'Month', 'Year']
-    
-    X_outbreak = outbreak_data[outbreak_features].fillna(0)
-    y_outbreak = outbreak_data['Outbreak_Risk']
+    X_outbreak, y_outbreak = predictor.prepare_features(outbreak_data)
     
     outbreak_results = predictor.train(X_outbreak, y_outbreak)
     
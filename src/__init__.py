@@ -29,22 +29,22 @@ __author__ = "[Your Name]"
 __email__ = "[Your Email]"
 __course__ = "INSY 8413 | Introduction to Big Data Analytics"
 
-# Package-level imports
-from .data_preprocessing import (
-    load_covid_data,
-    clean_data,
-    create_features,
-    encode_categorical_variables,
-    prepare_modeling_data
-)
-
-from .modeling import (
-    COVIDClustering,
-    COVIDForecaster,
-    OutbreakPredictor
-)
-
-from .visualization import COVIDVisualizer
+# Package-level names are resolved lazily (PEP 562) so that ``import src``
+# does not pull in scikit-learn, matplotlib, seaborn or plotly until the
+# module that needs them is first used.
+import importlib
+
+_LAZY_IMPORTS = {
+    'load_covid_data': 'data_preprocessing',
+    'clean_data': 'data_preprocessing',
+    'create_features': 'data_preprocessing',
+    'encode_categorical_variables': 'data_preprocessing',
+    'prepare_modeling_data': 'data_preprocessing',
+    'COVIDClustering': 'modeling',
+    'COVIDForecaster': 'modeling',
+    'OutbreakPredictor': 'modeling',
+    'COVIDVisualizer': 'visualization'
+}
 
 __all__ = [
     'load_covid_data',
@@ -56,4 +56,17 @@ __all__ = [
     'COVIDForecaster',
     'OutbreakPredictor',
     'COVIDVisualizer'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
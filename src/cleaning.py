@@ -0,0 +1,331 @@
+"""
+Cleaning Engine for COVID-19 Data
+=================================
+
+Both ``data_preprocessing.clean_data`` and
+``optimized_preprocessing.clean_data_optimized`` delegate to
+``clean_frame``, which runs every cleaning rule without full-frame copies:
+
+- column names are normalised by renaming, not copying
+- date parsing, numeric conversion and missing-value filling are fused into
+  one conversion per column, and only columns that change are replaced
+- duplicate and negative-value rules only build row masks; the combined
+  mask is applied once at the end (and not at all if no row is removed)
+- optional key-based deduplication on (Country_code, Date_reported) that
+  resolves conflicting revisions of the same key and reports them
+- optional cumulative validation/repair (see ``src.validation``)
+
+Without ``inplace`` the input is never modified: the engine works on a
+shallow copy and replaces whole columns, which is safe under pandas
+copy-on-write. With ``inplace=True`` converted and repaired columns are
+written back to the caller's frame, removed rows are dropped from it and
+the row order is kept (validation otherwise returns Country-sorted rows).
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import numpy as np
+import pandas as pd
+
+from .validation import validate_cumulative_consistency
+
+
+COUNT_COLUMNS = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+DEDUP_KEY_COLUMNS = ('Country_code', 'Date_reported')
+CONFLICT_POLICIES = ('latest', 'max', 'error')
+
+
+def normalize_column_names(columns):
+    """Strip column names and replace spaces with underscores."""
+    return pd.Index(columns).str.strip().str.replace(' ', '_')
+
+
+def _convert_counts(series, fill_value=0):
+    """
+    Convert a count column to numbers in one pass.
+
+    Values missing in the input are filled with ``fill_value``; values that
+    cannot be parsed become NaN.
+
+    Returns:
+    --------
+    tuple
+        (converted series or None if unchanged, number of filled values)
+    """
+    missing = series.isna()
+    n_missing = int(missing.sum())
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        if n_missing == 0:
+            return None, 0
+        return series.fillna(fill_value), n_missing
+
+    converted = pd.to_numeric(series, errors='coerce')
+    if n_missing:
+        converted = converted.mask(missing, fill_value)
+    return converted, n_missing
+
+
+def _key_codes(df, key_cols):
+    """One int64 code per row identifying its combination of ``key_cols``."""
+    key = np.zeros(len(df), dtype=np.int64)
+    for col in key_cols:
+        codes, uniques = pd.factorize(df[col])
+        key = key * (len(uniques) + 1) + (codes + 1)
+    return key
+
+
+def duplicated_rows(df, key_cols=('Country', 'Date_reported')):
+    """
+    Boolean mask of fully duplicated rows, like ``df.duplicated()``.
+
+    Duplicates always share their (Country, Date_reported) key, so rows are
+    first screened with one integer key and full rows are compared only for
+    the few rows whose key repeats.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset
+    key_cols : tuple
+        Columns that every duplicate pair shares
+
+    Returns:
+    --------
+    np.ndarray
+        True for every row that repeats an earlier row
+    """
+    if not all(col in df.columns for col in key_cols) or len(df) == 0:
+        return df.duplicated().to_numpy()
+
+    key = _key_codes(df, key_cols)
+    candidates = pd.Series(key).duplicated(keep=False).to_numpy()
+    duplicated = np.zeros(len(df), dtype=bool)
+    if candidates.any():
+        duplicated[candidates] = df[candidates].duplicated().to_numpy()
+    return duplicated
+
+
+def dedup_key_columns(df):
+    """DEDUP_KEY_COLUMNS, with Country standing in for a missing Country_code column."""
+    if 'Country_code' not in df.columns and 'Country' in df.columns:
+        return ('Country', 'Date_reported')
+    return DEDUP_KEY_COLUMNS
+
+
+def resolve_key_conflicts(df, key_cols=None, policy='latest', value_cols=None):
+    """
+    Deduplicate rows by key, resolving conflicting revisions of the same key.
+
+    Only the key columns are hashed. Rows are treated as revisions in input
+    order, so the last row of a key is its latest revision. Keys whose rows
+    differ in any value column are conflicts and are resolved by ``policy``:
+
+    - 'latest' : keep the latest revision
+    - 'max'    : keep the latest revision with numeric columns set to their
+                 maximum over all revisions
+    - 'error'  : raise a ValueError listing the conflicting keys
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset
+    key_cols : tuple, optional
+        Key columns (defaults to ``dedup_key_columns(df)``)
+    policy : str
+        Conflict policy: 'latest', 'max' or 'error'
+    value_cols : list, optional
+        Columns compared between revisions (defaults to all non-key columns)
+
+    Returns:
+    --------
+    tuple
+        (removed, resolved, conflicts) where removed is a boolean row mask of
+        superseded revisions, resolved holds replacement values for kept rows
+        indexed by row position (None unless policy is 'max') and conflicts
+        has one row per conflicting key with the key columns, the number of
+        revisions and the columns that differ
+    """
+    if policy not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy '{policy}', expected one of {CONFLICT_POLICIES}")
+
+    key_cols = list(key_cols or dedup_key_columns(df))
+    value_cols = value_cols or [c for c in df.columns if c not in key_cols]
+    removed = np.zeros(len(df), dtype=bool)
+    conflicts = pd.DataFrame(columns=key_cols + ['revisions', 'differing_columns'])
+
+    key = _key_codes(df, key_cols)
+    repeated = pd.Series(key).duplicated(keep=False).to_numpy()
+    if not repeated.any():
+        return removed, None, conflicts
+
+    # Everything below only touches rows whose key repeats
+    positions = np.flatnonzero(repeated)
+    repeated_key = key[positions]
+    latest = ~pd.Series(repeated_key).duplicated(keep='last').to_numpy()
+    removed[positions[~latest]] = True
+
+    revisions = df[value_cols].iloc[positions].groupby(repeated_key, sort=False)
+    differs = revisions.nunique(dropna=False) > 1
+    conflicting = differs.any(axis=1).to_numpy()
+    if not conflicting.any():
+        return removed, None, conflicts
+
+    latest_position = pd.Series(positions[latest], index=repeated_key[latest])
+    conflict_rows = latest_position.reindex(differs.index[conflicting]).to_numpy()
+    names = np.array(value_cols, dtype=object)
+    conflicts = df[key_cols].iloc[conflict_rows].reset_index(drop=True)
+    conflicts['revisions'] = revisions.size().to_numpy()[conflicting]
+    conflicts['differing_columns'] = [', '.join(names[row])
+                                      for row in differs.to_numpy()[conflicting]]
+
+    if policy == 'error':
+        preview = '; '.join(' / '.join(map(str, row))
+                            for row in conflicts[key_cols].head(5).itertuples(index=False))
+        raise ValueError(f"{len(conflicts):,} key(s) have conflicting revisions: {preview}")
+
+    resolved = None
+    if policy == 'max':
+        numeric_cols = [c for c in value_cols if pd.api.types.is_numeric_dtype(df[c].dtype)]
+        resolved = revisions[numeric_cols].max()[conflicting]
+        resolved.index = conflict_rows
+    return removed, resolved, conflicts
+
+
+def clean_frame(df, count_cols=None, fill_value=0, parse_dates=True, drop_duplicates=True,
+                drop_negative=False, validate=False, repair_policy=None, conflict_policy=None,
+                key_cols=None, inplace=False):
+    """
+    Clean a WHO COVID-19 frame in a single pass over its columns.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Raw dataset
+    count_cols : list, optional
+        Count columns to convert and fill (defaults to COUNT_COLUMNS)
+    fill_value : float
+        Value used for missing counts
+    parse_dates : bool
+        Convert Date_reported to datetime if it is not already
+    drop_duplicates : bool
+        Remove fully duplicated rows, or duplicated keys if ``conflict_policy`` is set
+    drop_negative : bool
+        Remove rows with a negative count (after repair, if any)
+    validate : bool
+        Run ``validate_cumulative_consistency`` (sorts by Country and date)
+    repair_policy : str, optional
+        Repair policy for the validation ('flag', 'clip' or 'redistribute')
+    conflict_policy : str, optional
+        Deduplicate by key with ``resolve_key_conflicts`` using this policy
+        ('latest', 'max' or 'error'); full-row deduplication if None
+    key_cols : tuple, optional
+        Key columns of the key-based deduplication
+    inplace : bool
+        Modify ``df`` itself (in its original row order) instead of returning a new frame
+
+    Returns:
+    --------
+    tuple
+        (cleaned dataframe, report) where report holds 'filled' (missing
+        values filled per column), 'removed' (rows removed per rule, each
+        row counted under the first rule that removes it), 'conflicts' (the
+        key conflict table, or None) and 'anomalies' (the validation
+        anomaly table, or None)
+    """
+    if inplace and not df.index.is_unique:
+        raise ValueError("inplace cleaning needs a unique index")
+
+    out = df if inplace else df.copy(deep=False)
+    report = {'filled': {}, 'removed': {}, 'conflicts': None, 'anomalies': None}
+
+    columns = normalize_column_names(out.columns)
+    if not columns.equals(out.columns):
+        out.columns = columns
+
+    # Fused per-column conversions; untouched columns keep sharing memory with df
+    if parse_dates and 'Date_reported' in out.columns \
+            and not pd.api.types.is_datetime64_any_dtype(out['Date_reported']):
+        out['Date_reported'] = pd.to_datetime(out['Date_reported'])
+
+    count_cols = [c for c in (count_cols or COUNT_COLUMNS) if c in out.columns]
+    for col in count_cols:
+        converted, n_filled = _convert_counts(out[col], fill_value)
+        if converted is not None:
+            out[col] = converted
+        report['filled'][col] = n_filled
+
+    # Row rules only build masks; rows are removed once
+    removed = np.zeros(len(out), dtype=bool)
+    if drop_duplicates and conflict_policy is not None:
+        duplicated, resolved, report['conflicts'] = resolve_key_conflicts(
+            out, key_cols, policy=conflict_policy)
+        if resolved is not None:
+            _write_positions(out, resolved)
+        report['removed']['duplicates'] = int(duplicated.sum())
+        removed |= duplicated
+    elif drop_duplicates:
+        duplicated = duplicated_rows(out)
+        report['removed']['duplicates'] = int(duplicated.sum())
+        removed |= duplicated
+
+    negative_rules = drop_negative and not validate
+    if negative_rules:
+        removed = _negative_mask(out, count_cols, removed, report)
+
+    out = _remove_rows(out, removed, inplace)
+
+    if validate:
+        validated, report['anomalies'] = validate_cumulative_consistency(out, policy=repair_policy)
+        if inplace:
+            # Write repaired and flag columns back by index label, keeping the row order
+            changed = [c for c in validated.columns if c not in out.columns]
+            if repair_policy in ('clip', 'redistribute'):
+                changed += count_cols
+            for col in changed:
+                out[col] = validated[col]
+        else:
+            out = validated
+        if drop_negative:
+            removed = _negative_mask(out, count_cols, np.zeros(len(out), dtype=bool), report)
+            out = _remove_rows(out, removed, inplace)
+
+    return out, report
+
+
+def _negative_mask(df, count_cols, removed, report):
+    """Add one 'negative_<col>' rule per count column to the removal mask."""
+    negative = df[count_cols].to_numpy() < 0
+    for i, col in enumerate(count_cols):
+        newly_removed = negative[:, i] & ~removed
+        report['removed'][f'negative_{col}'] = int(newly_removed.sum())
+        removed = removed | newly_removed
+    return removed
+
+
+def _write_positions(df, values):
+    """
+    Replace whole columns with copies where the rows at ``values.index`` are updated.
+
+    The copies are taken from the column arrays, so nullable (Int32, Int64)
+    columns keep their extension dtype.
+    """
+    positions = values.index.to_numpy()
+    for col in values.columns:
+        column = df[col].array.copy()
+        column[positions] = values[col].array
+        df[col] = column
+
+
+def _remove_rows(df, removed, inplace):
+    if not removed.any():
+        return df
+    if inplace:
+        df.drop(index=df.index[removed], inplace=True)
+        return df
+    return df[~removed]
+
+
+if __name__ == "__main__":
+    print("COVID-19 Cleaning Engine Module")
+    print("This module cleans datasets in one pass without full-frame copies.")
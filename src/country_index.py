@@ -0,0 +1,187 @@
+"""
+Country Offset Index Module for COVID-19 Analysis
+=================================================
+
+Per-country loops of the form ``df[df['Country'] == country]`` scan the whole
+frame once per country. On a frame sorted by (Country, Date_reported) every
+country occupies one contiguous block of rows, so this module records the
+start/stop offsets of each block once and then serves O(1) positional slices.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _country_sort_codes(series):
+    """Integer codes that order like ``sort_values`` (missing values last)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        n_values = len(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        n_values = len(uniques)
+    return np.where(codes < 0, n_values, codes)
+
+
+def sort_by_country(df, date_col='Date_reported'):
+    """
+    Sort a frame by Country and date with a stable sort.
+
+    The order is computed with ``np.lexsort`` on integer country codes and
+    date values; frames that are already in order are returned as a shallow
+    copy without reordering any column.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset with Country and date columns
+    date_col : str
+        Name of the date column
+
+    Returns:
+    --------
+    pd.DataFrame
+        Sorted dataset (original index labels are kept)
+    """
+    if not pd.api.types.is_datetime64_any_dtype(df[date_col]) or len(df) == 0:
+        return df.sort_values(['Country', date_col], kind='mergesort')
+
+    country_codes = _country_sort_codes(df['Country'])
+    dates = df[date_col].to_numpy().view(np.int64)
+    dates = np.where(np.isnat(df[date_col].to_numpy()), np.iinfo(np.int64).max, dates)
+
+    in_order = (country_codes[1:] > country_codes[:-1]) | \
+        ((country_codes[1:] == country_codes[:-1]) & (dates[1:] >= dates[:-1]))
+    if in_order.all():
+        return df.copy(deep=False)
+    return df.take(np.lexsort((dates, country_codes)))
+
+
+class CountryIndex:
+    """
+    Start/stop row offsets of every country in a country-sorted frame.
+    """
+
+    def __init__(self, countries, starts, stops, regions=None):
+        self.countries = np.asarray(countries, dtype=object)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.stops = np.asarray(stops, dtype=np.int64)
+        self.regions = None if regions is None else np.asarray(regions, dtype=object)
+        self._positions = {country: i for i, country in enumerate(self.countries)}
+
+    @classmethod
+    def build(cls, df, key='Country', region_col='WHO_region'):
+        """
+        Build the index from a frame whose rows are grouped by ``key``.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Dataset sorted (or at least grouped) by ``key``, e.g. with ``sort_by_country``
+        key : str
+            Column whose values form contiguous blocks
+        region_col : str
+            Region column recorded per block (skipped if missing)
+
+        Returns:
+        --------
+        CountryIndex
+            Index over the blocks of ``df``
+        """
+        codes, _ = pd.factorize(df[key], sort=False)
+        n_rows = len(codes)
+        if n_rows == 0:
+            return cls([], [], [], [] if region_col in df.columns else None)
+
+        boundaries = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [n_rows]))
+
+        if len(starts) != len(np.unique(codes)):
+            raise ValueError(f"Rows of each '{key}' must be contiguous; sort the frame first "
+                             f"(see sort_by_country)")
+
+        countries = df[key].to_numpy()[starts]
+        regions = df[region_col].to_numpy()[starts] if region_col in df.columns else None
+        return cls(countries, starts, stops, regions)
+
+    def __len__(self):
+        return len(self.countries)
+
+    def __contains__(self, country):
+        return country in self._positions
+
+    @property
+    def lengths(self):
+        """Number of rows per country."""
+        return self.stops - self.starts
+
+    def slice(self, country):
+        """Return the positional row slice of a country."""
+        i = self._positions[country]
+        return slice(int(self.starts[i]), int(self.stops[i]))
+
+    def get(self, df, country):
+        """Return the rows of a country from the indexed frame."""
+        return df.iloc[self.slice(country)]
+
+    def iter_slices(self):
+        """Yield (country, slice) pairs in row order."""
+        for country, start, stop in zip(self.countries, self.starts, self.stops):
+            yield country, slice(int(start), int(stop))
+
+    def region_slices(self, region):
+        """
+        Return the row slices of a WHO region, merging adjacent blocks.
+
+        On a frame sorted by (WHO_region, Country, date) this is a single
+        slice; on a (Country, date) sort it is one slice per run of
+        neighbouring countries of that region.
+
+        Parameters:
+        -----------
+        region : str
+            WHO region code
+
+        Returns:
+        --------
+        list
+            Positional slices in row order
+        """
+        if self.regions is None:
+            raise ValueError("Index was built without a region column")
+
+        slices = []
+        for i in np.flatnonzero(self.regions == region):
+            start, stop = int(self.starts[i]), int(self.stops[i])
+            if slices and slices[-1].stop == start:
+                slices[-1] = slice(slices[-1].start, stop)
+            else:
+                slices.append(slice(start, stop))
+        return slices
+
+    def get_region(self, df, region):
+        """Return the rows of a WHO region from the indexed frame."""
+        slices = self.region_slices(region)
+        if len(slices) == 1:
+            return df.iloc[slices[0]]
+        return df.iloc[np.concatenate([np.arange(s.start, s.stop) for s in slices])]
+
+    def segment_ids(self):
+        """
+        Return the block number of every row.
+
+        Returns:
+        --------
+        np.ndarray
+            Array of length n_rows with values 0..n_countries-1
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths)
+
+
+if __name__ == "__main__":
+    print("COVID-19 Country Offset Index Module")
+    print("This module provides O(1) per-country slices of country-sorted frames.")
@@ -0,0 +1,208 @@
+"""
+Columnar Cache Module for COVID-19 Datasets
+===========================================
+
+This module keeps a typed Arrow (Feather v2) copy of the raw WHO CSV so that
+repeated runs skip CSV parsing, date parsing and category conversion.
+
+The cache is keyed by the source file size, modification time and content
+hash. Cached files are written uncompressed so later loads can memory-map
+them and read only the requested columns.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _default_cache_dir(file_path):
+    """Return the default cache directory, located next to the source file."""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), '.covid_cache')
+
+
+def compute_file_hash(file_path, block_size=HASH_BLOCK_SIZE):
+    """
+    Compute the BLAKE2b content hash of a file, reading it in blocks.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the file
+    block_size : int
+        Number of bytes read per block
+
+    Returns:
+    --------
+    str
+        Hex digest of the file content
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def get_cache_key(file_path, cache_dir=None):
+    """
+    Build the cache key (size, mtime, content hash) for a source file.
+
+    The content hash is only recomputed when the size or modification time
+    differ from the values recorded in the cache index, so an unchanged file
+    costs a single ``os.stat`` call.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source CSV file
+    cache_dir : str, optional
+        Cache directory (defaults to ``.covid_cache`` next to the source)
+
+    Returns:
+    --------
+    dict
+        Dictionary with ``size``, ``mtime_ns`` and ``hash`` keys
+    """
+    cache_dir = cache_dir or _default_cache_dir(file_path)
+    stat = os.stat(file_path)
+    index = _read_index(file_path, cache_dir)
+
+    if index.get('size') == stat.st_size and index.get('mtime_ns') == stat.st_mtime_ns:
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': index['hash']}
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': compute_file_hash(file_path)
+    }
+
+
+def _index_path(file_path, cache_dir):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f'{stem}.index.json')
+
+
+def _cache_path(file_path, cache_dir, variant, content_hash):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f'{stem}-{variant}-{content_hash}.arrow')
+
+
+def _read_index(file_path, cache_dir):
+    try:
+        with open(_index_path(file_path, cache_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(file_path, cache_dir, key):
+    index_path = _index_path(file_path, cache_dir)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(key, f)
+    os.replace(tmp_path, index_path)
+
+
+def _remove_stale_entries(file_path, cache_dir, variant, keep_path):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    prefix = f'{stem}-{variant}-'
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith(prefix) and name.endswith('.arrow') and path != keep_path:
+            os.remove(path)
+
+
+def load_cached_frame(file_path, parser, variant='typed', columns=None,
+                      cache_dir=None, refresh=False):
+    """
+    Load a CSV through the columnar cache, parsing it only on a cache miss.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source CSV file
+    parser : callable
+        Function ``parser(file_path) -> pd.DataFrame`` used on a cache miss
+    variant : str
+        Name distinguishing different parsers of the same source file
+    columns : list, optional
+        Columns to return (all columns if None)
+    cache_dir : str, optional
+        Cache directory (defaults to ``.covid_cache`` next to the source)
+    refresh : bool
+        Force a re-parse and overwrite the cached copy
+
+    Returns:
+    --------
+    tuple
+        (dataframe, cache_hit)
+    """
+    from pyarrow import feather
+
+    cache_dir = cache_dir or _default_cache_dir(file_path)
+    key = get_cache_key(file_path, cache_dir)
+    cache_path = _cache_path(file_path, cache_dir, variant, key['hash'])
+
+    if not refresh and os.path.exists(cache_path):
+        table = feather.read_table(cache_path, columns=columns, memory_map=True)
+        if _read_index(file_path, cache_dir) != key:
+            _write_index(file_path, cache_dir, key)
+        return table.to_pandas(), True
+
+    df = parser(file_path)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+        _write_index(file_path, cache_dir, key)
+        _remove_stale_entries(file_path, cache_dir, variant, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write columnar cache: {e}")
+
+    if columns is not None:
+        df = df[list(columns)]
+    return df, False
+
+
+def clear_cache(file_path, cache_dir=None):
+    """
+    Remove every cached copy of a source file.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source CSV file
+    cache_dir : str, optional
+        Cache directory (defaults to ``.covid_cache`` next to the source)
+
+    Returns:
+    --------
+    int
+        Number of files removed
+    """
+    cache_dir = cache_dir or _default_cache_dir(file_path)
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.startswith(f'{stem}-') or name == f'{stem}.index.json':
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    print("COVID-19 Columnar Cache Module")
+    print("This module caches parsed WHO CSV files as memory-mappable Arrow files.")
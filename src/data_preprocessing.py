@@ -6,7 +6,12 @@ This module contains functions for cleaning and preprocessing the WHO COVID-19 d
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
+
+from .cleaning import clean_frame
+from .country_index import sort_by_country
+from .feature_registry import CREATE_FEATURES_COLUMNS, compute_features
+from .streaming import map_partitions
+from .vocabulary import encode_with_vocabulary
 
 
 def load_covid_data(file_path):
@@ -21,7 +26,8 @@ def load_covid_data(file_path):
     Returns:
     --------
     pd.DataFrame
-        Loaded dataset
+        Loaded dataset, or None if the file does not exist (other errors,
+        such as a malformed file, are raised after printing them)
     """
     try:
         df = pd.read_csv(file_path, encoding='utf-8')
@@ -32,103 +38,84 @@ def load_covid_data(file_path):
         return None
     except Exception as e:
         print(f"❌ Error loading dataset: {e}")
-        return None
+        raise
 
 
-def clean_data(df):
+def clean_data(df, conflict_policy=None, inplace=False, verbose=True):
     """
     Clean and preprocess the COVID-19 dataset.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        Raw dataset
+    df : pd.DataFrame or iterator
+        Raw dataset, or an iterator of (key, partition) pairs such as
+        ``src.streaming.stream_covid_partitions``
+    conflict_policy : str, optional
+        Deduplicate by (Country_code, Date_reported), resolving conflicting
+        revisions with 'latest', 'max' or 'error'; full-row deduplication if None
+    inplace : bool
+        Clean ``df`` itself instead of returning a new frame
+    verbose : bool
+        Print progress (partitions are always processed silently)
     
     Returns:
     --------
-    pd.DataFrame
-        Cleaned dataset
+    pd.DataFrame or generator
+        Cleaned dataset, or a generator of cleaned (key, partition) pairs
     """
-    df_clean = df.copy()
-    
-    # Standardize column names
-    df_clean.columns = df_clean.columns.str.strip().str.replace(' ', '_')
-    
-    # Convert date column
-    df_clean['Date_reported'] = pd.to_datetime(df_clean['Date_reported'])
+    if not isinstance(df, pd.DataFrame):
+        return map_partitions(clean_data, df, conflict_policy=conflict_policy, inplace=inplace,
+                              verbose=False)
     
-    # Handle missing values in numerical columns
-    numerical_cols = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
-    for col in numerical_cols:
-        if col in df_clean.columns:
-            df_clean[col] = df_clean[col].fillna(0)
-            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+    df_clean, report = clean_frame(df, conflict_policy=conflict_policy, inplace=inplace)
     
-    # Remove duplicates
-    df_clean = df_clean.drop_duplicates()
-    
-    print(f"✅ Data cleaned. Final shape: {df_clean.shape}")
+    if verbose:
+        if report['conflicts'] is not None and len(report['conflicts']):
+            print(f"⚠️ Resolved {len(report['conflicts']):,} conflicting keys with the "
+                  f"'{conflict_policy}' policy")
+        print(f"✅ Data cleaned. Final shape: {df_clean.shape}")
     return df_clean
 
 
-def create_features(df):
+def create_features(df, phase_calendar=None, columns=None, cache_dir=None, verbose=True):
     """
     Create additional features for analysis.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        Cleaned dataset
+    df : pd.DataFrame or iterator
+        Cleaned dataset, or an iterator of cleaned (key, partition) pairs
+    phase_calendar : PhaseCalendar, dict or str, optional
+        Pandemic phase calendar, config or JSON path (see ``src.phase_calendar``)
+    columns : list, optional
+        Feature columns to compute (all features if None, see ``src.feature_registry``)
+    cache_dir : str, optional
+        Directory of the on-disk feature column cache (no caching if None)
+    verbose : bool
+        Print progress (partitions are always processed silently)
     
     Returns:
     --------
-    pd.DataFrame
-        Dataset with additional features
+    pd.DataFrame or generator
+        Dataset with additional features, sorted by Country and Date_reported,
+        or a generator of (key, partition) pairs
     """
-    df_features = df.copy()
-    
-    # Date-based features
-    df_features['Year'] = df_features['Date_reported'].dt.year
-    df_features['Month'] = df_features['Date_reported'].dt.month
-    df_features['Day_of_week'] = df_features['Date_reported'].dt.dayofweek
-    df_features['Week_of_year'] = df_features['Date_reported'].dt.isocalendar().week
-    
-    # Case Fatality Rate
-    df_features['Case_Fatality_Rate'] = np.where(
-        df_features['Cumulative_cases'] > 0,
-        (df_features['Cumulative_deaths'] / df_features['Cumulative_cases']) * 100,
-        0
-    )
-    
-    # Growth rates
-    df_features = df_features.sort_values(['Country', 'Date_reported'])
-    df_features['Cases_Growth_Rate'] = df_features.groupby('Country')['Cumulative_cases'].pct_change() * 100
-    df_features['Deaths_Growth_Rate'] = df_features.groupby('Country')['Cumulative_deaths'].pct_change() * 100
-    
-    # Rolling averages
-    df_features['New_cases_7day_avg'] = df_features.groupby('Country')['New_cases'].rolling(7, min_periods=1).mean().reset_index(0, drop=True)
-    df_features['New_deaths_7day_avg'] = df_features.groupby('Country')['New_deaths'].rolling(7, min_periods=1).mean().reset_index(0, drop=True)
-    
-    # Pandemic phases
-    def get_pandemic_phase(date):
-        if date < '2020-06-01':
-            return 'Early_Phase'
-        elif date < '2021-01-01':
-            return 'First_Wave'
-        elif date < '2022-01-01':
-            return 'Vaccination_Phase'
-        else:
-            return 'Endemic_Phase'
-    
-    df_features['Pandemic_Phase'] = df_features['Date_reported'].apply(get_pandemic_phase)
-    
-    print("✅ Features created successfully")
+    if not isinstance(df, pd.DataFrame):
+        return map_partitions(create_features, df, phase_calendar=phase_calendar,
+                              columns=columns, cache_dir=cache_dir, verbose=False)
+    
+    # Series features need each country's rows contiguous and in date order
+    df_features = compute_features(sort_by_country(df), columns or CREATE_FEATURES_COLUMNS,
+                                   cache_dir=cache_dir, phase_calendar=phase_calendar)
+    
+    if verbose:
+        print("✅ Features created successfully")
     return df_features
 
 
-def encode_categorical_variables(df, categorical_vars=None):
+def encode_categorical_variables(df, categorical_vars=None, vocabulary_path=None, unseen='add'):
     """
-    Encode categorical variables using LabelEncoder.
+    Encode categorical variables with stable vocabulary codes.
     
     Parameters:
     -----------
@@ -136,26 +123,25 @@ def encode_categorical_variables(df, categorical_vars=None):
         Dataset with categorical variables
     categorical_vars : list, optional
         List of categorical variables to encode
+    vocabulary_path : str, optional
+        JSON vocabulary store keeping codes stable across runs (see ``src.vocabulary``)
+    unseen : str
+        Policy for values missing from the vocabulary: 'add', 'unknown' or 'error'
     
     Returns:
     --------
     tuple
-        (encoded_dataframe, label_encoders_dict)
+        (encoded_dataframe, vocabularies_dict)
     """
     if categorical_vars is None:
         categorical_vars = ['Country', 'WHO_region', 'Pandemic_Phase']
     
-    df_encoded = df.copy()
-    label_encoders = {}
-    
-    for var in categorical_vars:
-        if var in df_encoded.columns:
-            le = LabelEncoder()
-            df_encoded[f'{var}_encoded'] = le.fit_transform(df_encoded[var])
-            label_encoders[var] = le
+    df_encoded, vocabularies = encode_with_vocabulary(df, categorical_vars,
+                                                      vocabulary_path=vocabulary_path,
+                                                      unseen=unseen)
     
-    print(f"✅ Encoded {len(label_encoders)} categorical variables")
-    return df_encoded, label_encoders
+    print(f"✅ Encoded {len(vocabularies)} categorical variables")
+    return df_encoded, vocabularies
 
 
 def prepare_modeling_data(df):
@@ -0,0 +1,235 @@
+"""
+Dtype Optimization Module for COVID-19 DataFrames
+=================================================
+
+This module shrinks DataFrames to the smallest safe column types:
+
+- integer columns use the smallest signed integer type holding their range
+- count columns (New_cases, Cumulative_cases, New_deaths, Cumulative_deaths)
+  are never narrower than int32; those with missing values use pandas
+  nullable integers
+- float columns use float32 only when every value survives the round trip
+  exactly (or within an explicit relative tolerance)
+- text columns (Country, Country_code, WHO_region, Pandemic_Phase and other
+  low-cardinality strings) become categoricals
+
+Narrow integer types wrap around silently on overflow (an int8 column
+holding 100 gives -56 when multiplied by 2). Count columns are the inputs of
+later arithmetic (differences, sums, repairs), so they keep at least 32
+bits; other integer columns are downcast to their value range only. Signed
+types are used so that differences of counts stay representable.
+
+float32 keeps about 7 significant digits: every finite float64 value within
+its range rounds to a float32 with a relative error below 6e-8, so a
+tolerance check such as ``allclose(rtol=1e-6)`` would accept any column. By
+default only exact round trips are downcast.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import numpy as np
+import pandas as pd
+
+
+CATEGORICAL_COLUMNS = ['Country', 'Country_code', 'WHO_region', 'Pandemic_Phase']
+COUNT_COLUMNS = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+
+SIGNED_INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+MIN_COUNT_INT_TYPE = np.int32
+NULLABLE_INT_TYPES = {np.int8: 'Int8', np.int16: 'Int16', np.int32: 'Int32', np.int64: 'Int64'}
+
+
+def smallest_int_dtype(min_value, max_value, min_dtype=np.int8):
+    """
+    Return the smallest signed integer type holding ``[min_value, max_value]``.
+
+    Parameters:
+    -----------
+    min_value, max_value : int
+        Range of the values
+    min_dtype : type
+        Narrowest type that may be returned
+
+    Returns:
+    --------
+    type or None
+        NumPy integer type, or None if the range does not fit into int64
+    """
+    for dtype in SIGNED_INT_TYPES[SIGNED_INT_TYPES.index(min_dtype):]:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return dtype
+    return None
+
+
+def _optimize_integer(series, min_dtype=np.int8):
+    """Downcast a NumPy or nullable integer column (not below ``min_dtype``)."""
+    has_na = series.isna().any()
+    valid = series.dropna() if has_na else series
+    if valid.empty:
+        return series
+
+    dtype = smallest_int_dtype(int(valid.min()), int(valid.max()), min_dtype)
+    if dtype is None:
+        return series
+    if has_na:
+        return series.astype(NULLABLE_INT_TYPES[dtype])
+    return series.astype(dtype)
+
+
+def _optimize_count_float(series):
+    """Convert an integral-valued float count column to a (nullable) integer."""
+    values = series.to_numpy()
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, ~np.isnan(values)):
+        return None
+    if not np.array_equal(values[finite], np.round(values[finite])):
+        return None
+    if not finite.any():
+        return None
+
+    dtype = smallest_int_dtype(values[finite].min(), values[finite].max(), MIN_COUNT_INT_TYPE)
+    if dtype is None:
+        return None
+    if finite.all():
+        return series.astype(dtype)
+    return series.astype(NULLABLE_INT_TYPES[dtype])
+
+
+def _optimize_float(series, float_rtol=0.0):
+    """Downcast a float64 column to float32 when its values survive the round trip."""
+    if series.dtype != np.float64:
+        return series
+
+    values = series.to_numpy()
+    with np.errstate(over='ignore', invalid='ignore'):
+        downcast = values.astype(np.float32)
+        if float_rtol:
+            lossless = np.allclose(downcast, values, rtol=float_rtol, atol=0, equal_nan=True)
+        else:
+            lossless = np.array_equal(downcast, values, equal_nan=True)
+    return series.astype(np.float32) if lossless else series
+
+
+def optimize_dtypes(df, categorical_cols=None, count_cols=None, float_rtol=0.0,
+                    max_category_ratio=0.5, inplace=False, report=True, label=None):
+    """
+    Downcast every column of a DataFrame to its smallest safe type.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset to optimize
+    categorical_cols : list, optional
+        Columns always converted to categoricals (defaults to CATEGORICAL_COLUMNS)
+    count_cols : list, optional
+        Count columns: kept at int32 or wider, and converted from float to
+        (nullable) integers when integral (defaults to COUNT_COLUMNS)
+    float_rtol : float
+        Maximum relative error accepted when downcasting float64 to float32
+        (0: only columns whose values are exactly representable in float32)
+    max_category_ratio : float
+        Other text columns become categoricals when unique/rows is at most this ratio
+    inplace : bool
+        Replace the columns of ``df`` instead of returning a shallow copy
+    report : bool
+        Print a per-column before/after memory report
+    label : str, optional
+        Stage name shown in the report header
+
+    Returns:
+    --------
+    pd.DataFrame
+        Optimized dataset (``df`` itself when ``inplace`` is True)
+    """
+    categorical_cols = CATEGORICAL_COLUMNS if categorical_cols is None else categorical_cols
+    count_cols = COUNT_COLUMNS if count_cols is None else count_cols
+
+    before = df.memory_usage(deep=True, index=False) if report else None
+    dtypes_before = df.dtypes.copy() if report else None
+    result = df if inplace else df.copy(deep=False)
+
+    for col in result.columns:
+        series = result[col]
+        dtype = series.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype) \
+                or pd.api.types.is_datetime64_any_dtype(dtype):
+            continue
+
+        if col in categorical_cols:
+            converted = series.astype('category')
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            if len(series) and series.nunique() / len(series) <= max_category_ratio:
+                converted = series.astype('category')
+            else:
+                continue
+        elif pd.api.types.is_integer_dtype(dtype):
+            converted = _optimize_integer(
+                series, MIN_COUNT_INT_TYPE if col in count_cols else np.int8)
+        elif pd.api.types.is_float_dtype(dtype):
+            converted = _optimize_count_float(series) if col in count_cols else None
+            if converted is None:
+                converted = _optimize_float(series, float_rtol)
+        else:
+            continue
+
+        if converted.dtype != dtype:
+            result[col] = converted
+
+    if report:
+        print_memory_report(before, result.memory_usage(deep=True, index=False),
+                            dtypes_before, result.dtypes, label=label)
+
+    return result
+
+
+def memory_report(before, after, dtypes_before, dtypes_after):
+    """
+    Build a per-column before/after memory table.
+
+    Parameters:
+    -----------
+    before, after : pd.Series
+        Column memory usage in bytes (``memory_usage(deep=True, index=False)``)
+    dtypes_before, dtypes_after : pd.Series
+        Column dtypes before and after optimization
+
+    Returns:
+    --------
+    pd.DataFrame
+        Table with dtypes and sizes (MB) per column and the reduction factor
+    """
+    table = pd.DataFrame({
+        'dtype_before': dtypes_before.astype(str),
+        'dtype_after': dtypes_after.astype(str),
+        'mb_before': before / 1024**2,
+        'mb_after': after / 1024**2,
+    })
+    table['reduction'] = table['mb_before'] / table['mb_after'].where(table['mb_after'] > 0)
+    return table
+
+
+def print_memory_report(before, after, dtypes_before, dtypes_after, label=None):
+    """Print the table built by ``memory_report`` with a total line."""
+    table = memory_report(before, after, dtypes_before, dtypes_after)
+    total_before = table['mb_before'].sum()
+    total_after = table['mb_after'].sum()
+
+    header = f"💾 Memory optimization ({label})" if label else "💾 Memory optimization"
+    print(f"{header}:")
+    for col, row in table.iterrows():
+        if row['dtype_before'] == row['dtype_after']:
+            continue
+        print(f"    - {col}: {row['dtype_before']} → {row['dtype_after']} "
+              f"({row['mb_before']:.2f} MB → {row['mb_after']:.2f} MB)")
+
+    factor = total_before / total_after if total_after > 0 else float('nan')
+    print(f"  📊 Total: {total_before:.2f} MB → {total_after:.2f} MB ({factor:.1f}x smaller)")
+    return table
+
+
+if __name__ == "__main__":
+    print("COVID-19 Dtype Optimization Module")
+    print("This module downcasts DataFrame columns to their smallest safe types.")
@@ -0,0 +1,405 @@
+"""
+Vectorized Feature Engine for COVID-19 Time Series
+==================================================
+
+This module computes the history-dependent features (growth rates, lags and
+rolling statistics) for all countries in one pass over contiguous NumPy
+arrays, instead of looping over countries in Python.
+
+The frame is sorted once by (Country, Date_reported); the country blocks of
+the sorted frame are the segments of every computation, and results are
+assigned back as arrays to that same sorted frame, so values always stay on
+their own rows.
+
+With ``n_jobs`` the country blocks are split into contiguous row ranges that
+are processed by worker processes. Input columns and results are exchanged
+through ``multiprocessing.shared_memory`` blocks, so no DataFrame is pickled,
+and every worker writes its results to its own rows of the output block.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .country_index import CountryIndex, sort_by_country
+
+
+def _segment_starts_per_row(starts, lengths):
+    """Return, for every row, the position of the first row of its segment."""
+    return np.repeat(starts, lengths)
+
+
+def segmented_ffill(values, row_starts):
+    """
+    Forward-fill NaNs within segments.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Float values in segment order
+    row_starts : np.ndarray
+        First row position of the segment of every row
+
+    Returns:
+    --------
+    np.ndarray
+        Values with NaNs replaced by the last valid value of the same segment
+    """
+    positions = np.arange(len(values))
+    last_valid = np.where(np.isnan(values), -1, positions)
+    last_valid = np.maximum.accumulate(last_valid)
+
+    filled = values[np.maximum(last_valid, 0)]
+    filled[last_valid < row_starts] = np.nan
+    return filled
+
+
+def segmented_shift(values, row_starts, periods=1):
+    """
+    Shift values forward within segments, filling the first rows with NaN.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Values in segment order, 1-D or (rows, columns)
+    row_starts : np.ndarray
+        First row position of the segment of every row
+    periods : int
+        Number of rows to shift by
+
+    Returns:
+    --------
+    np.ndarray
+        Shifted float values
+    """
+    shifted = np.full(values.shape, np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    shifted[np.arange(len(values)) - row_starts < periods] = np.nan
+    return shifted
+
+
+def segmented_pct_change(values, row_starts):
+    """
+    Percentage change within segments, matching ``groupby().pct_change() * 100``.
+
+    NaNs are forward-filled within the segment first, as pandas does.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Values in segment order
+    row_starts : np.ndarray
+        First row position of the segment of every row
+
+    Returns:
+    --------
+    np.ndarray
+        Growth rates in percent (NaN for the first row of each segment)
+    """
+    filled = segmented_ffill(values.astype(np.float64), row_starts)
+    previous = segmented_shift(filled, row_starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (filled / previous - 1) * 100
+
+
+ROLLING_STATS = ('sum', 'mean', 'std', 'min', 'max', 'count')
+
+
+def _windowed_reduce(values, row_starts, window, stat, block_size):
+    """Reduce trailing windows with a sliding-window view, processed in row blocks."""
+    n_rows, n_cols = values.shape
+    padded = np.vstack([np.full((window - 1, n_cols), np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+    offsets = np.arange(window) - (window - 1)
+    reducer = {'min': np.nanmin, 'max': np.nanmax,
+               'std': lambda x, axis: np.nanstd(x, axis=axis, ddof=1)}[stat]
+
+    result = np.empty((n_rows, n_cols))
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        positions = np.arange(start, stop)[:, None] + offsets[None, :]
+        outside = positions < row_starts[start:stop, None]
+        block = np.where(outside[:, None, :], np.nan, windows[start:stop])
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            result[start:stop] = reducer(block, axis=-1)
+    return result
+
+
+def segmented_rolling(values, row_starts, windows=(7,), stats=('mean',), min_periods=1,
+                      block_size=65536):
+    """
+    Trailing rolling statistics for several windows and columns at once.
+
+    Sums, means and counts come from one cumulative sum over all rows;
+    window boundaries are clipped to the segment start of every row, so no
+    window crosses a country boundary. Standard deviation, min and max are
+    reduced over a sliding-window view in row blocks. NaNs are skipped, as in
+    pandas ``rolling``.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        Values in segment order, 1-D or (rows, columns)
+    row_starts : np.ndarray
+        First row position of the segment of every row
+    windows : iterable of int
+        Window lengths in rows
+    stats : iterable of str
+        Statistics from ROLLING_STATS
+    min_periods : int or None
+        Minimum number of valid values for a result (None: the window length)
+    block_size : int
+        Rows per block for the std/min/max reductions
+
+    Returns:
+    --------
+    dict
+        (window, stat) -> array with the shape of ``values``
+    """
+    unknown = set(stats) - set(ROLLING_STATS)
+    if unknown:
+        raise ValueError(f"Unknown rolling statistics {sorted(unknown)}, expected {ROLLING_STATS}")
+
+    values = np.asarray(values, dtype=np.float64)
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, None]
+
+    valid = ~np.isnan(values)
+    zeros = np.zeros((1, values.shape[1]))
+    sums = np.vstack([zeros, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.vstack([zeros, np.cumsum(valid, axis=0)])
+    positions = np.arange(len(values))
+
+    results = {}
+    for window in windows:
+        window_start = np.maximum(positions - window + 1, row_starts)
+        window_sums = sums[positions + 1] - sums[window_start]
+        window_counts = counts[positions + 1] - counts[window_start]
+        required = window if min_periods is None else min_periods
+        too_few = window_counts < required
+
+        for stat in stats:
+            if stat == 'count':
+                # As in pandas, counts need min_periods rows, valid or not
+                window_rows = (positions + 1 - window_start)[:, None]
+                out = np.where(window_rows < required, np.nan, window_counts)
+            elif stat == 'sum':
+                out = window_sums
+            elif stat == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out = window_sums / window_counts
+            else:
+                out = _windowed_reduce(values, row_starts, window, stat, block_size)
+
+            if stat != 'count':
+                out = np.where(too_few, np.nan, out)
+            results[(window, stat)] = out[:, 0] if squeeze else out
+
+    return results
+
+
+def rolling_features(df, columns, windows=(7,), stats=('mean',), lags=(), group_col=None,
+                     min_periods=1, aliases=None, name_format='{column}_rolling_{window}_{stat}',
+                     lag_format='{column}_lag_{lag}'):
+    """
+    Compute rolling statistics and lags of several columns as a DataFrame.
+
+    Rows must already be ordered by date within each group, and the rows of
+    each group must be contiguous (e.g. after ``sort_by_country``).
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Ordered dataset
+    columns : list
+        Metric columns
+    windows : iterable of int
+        Window lengths in rows
+    stats : iterable of str
+        Statistics from ROLLING_STATS
+    lags : iterable of int
+        Lag lengths in rows
+    group_col : str, optional
+        Segment column (the whole frame is one series if None)
+    min_periods : int or None
+        Minimum number of valid values for a result (None: the window length)
+    aliases : dict, optional
+        Column -> name used in the output column names
+    name_format, lag_format : str
+        Output column name templates
+
+    Returns:
+    --------
+    pd.DataFrame
+        Feature columns indexed like ``df``
+    """
+    import pandas as pd
+
+    if group_col is None:
+        row_starts = np.zeros(len(df), dtype=np.int64)
+    else:
+        index = CountryIndex.build(df, key=group_col)
+        row_starts = _segment_starts_per_row(index.starts, index.lengths)
+
+    columns = list(columns)
+    aliases = aliases or {}
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    output = {}
+    rolled = segmented_rolling(values, row_starts, windows, stats, min_periods)
+    for (window, stat), block in rolled.items():
+        for i, column in enumerate(columns):
+            name = name_format.format(column=aliases.get(column, column), window=window, stat=stat)
+            output[name] = block[:, i]
+
+    for lag in lags:
+        block = segmented_shift(values, row_starts, lag)
+        for i, column in enumerate(columns):
+            output[lag_format.format(column=aliases.get(column, column), lag=lag)] = block[:, i]
+
+    return pd.DataFrame(output, index=df.index)
+
+
+SERIES_INPUT_COLUMNS = ['Cumulative_cases', 'Cumulative_deaths', 'New_cases', 'New_deaths']
+
+
+def _series_feature_block(inputs, row_starts, window):
+    """Growth rates and rolling means of a (rows, 4) block of SERIES_INPUT_COLUMNS."""
+    means = segmented_rolling(inputs[:, 2:], row_starts, windows=(window,))[(window, 'mean')]
+    return np.column_stack([segmented_pct_change(inputs[:, 0], row_starts),
+                            segmented_pct_change(inputs[:, 1], row_starts),
+                            means[:, 0], means[:, 1]])
+
+
+def _series_feature_worker(input_name, output_name, shape, start, stop, lengths, window):
+    """Worker: compute the features of rows [start, stop) between shared-memory blocks."""
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray(shape, dtype=np.float64, buffer=input_shm.buf)
+        outputs = np.ndarray(shape, dtype=np.float64, buffer=output_shm.buf)
+        local_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        row_starts = _segment_starts_per_row(local_starts, lengths)
+        outputs[start:stop] = _series_feature_block(inputs[start:stop], row_starts, window)
+        del inputs, outputs
+    finally:
+        input_shm.close()
+        output_shm.close()
+    return stop - start
+
+
+def resolve_n_jobs(n_jobs):
+    """Return the number of worker processes for ``n_jobs`` (None: 1, negative: all CPUs)."""
+    cpus = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(cpus + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def balanced_blocks(index, n_blocks):
+    """
+    Split the segments of an index into contiguous groups with similar row counts.
+
+    Parameters:
+    -----------
+    index : CountryIndex
+        Index of a country-sorted frame
+    n_blocks : int
+        Requested number of groups
+
+    Returns:
+    --------
+    list
+        (first_segment, stop_segment) pairs covering all segments in order
+    """
+    n_rows = int(index.stops[-1]) if len(index) else 0
+    targets = np.linspace(0, n_rows, n_blocks + 1)[1:-1]
+    cuts = np.unique(np.searchsorted(index.starts, targets))
+    bounds = [0] + [int(c) for c in cuts if 0 < c < len(index)] + [len(index)]
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _parallel_series_features(inputs, index, window, n_jobs):
+    """Compute series features of country blocks in worker processes via shared memory."""
+    blocks = balanced_blocks(index, n_jobs)
+    input_shm = shared_memory.SharedMemory(create=True, size=max(inputs.nbytes, 1))
+    output_shm = shared_memory.SharedMemory(create=True, size=max(inputs.nbytes, 1))
+    try:
+        np.ndarray(inputs.shape, dtype=np.float64, buffer=input_shm.buf)[:] = inputs
+        lengths = index.lengths
+        with ProcessPoolExecutor(max_workers=len(blocks)) as executor:
+            futures = [executor.submit(_series_feature_worker, input_shm.name, output_shm.name,
+                                       inputs.shape, int(index.starts[a]), int(index.stops[b - 1]),
+                                       lengths[a:b], window)
+                       for a, b in blocks]
+            for future in futures:
+                future.result()
+        return np.ndarray(inputs.shape, dtype=np.float64, buffer=output_shm.buf).copy()
+    finally:
+        input_shm.close()
+        input_shm.unlink()
+        output_shm.close()
+        output_shm.unlink()
+
+
+def add_series_features(df, window=7, float_dtype='float64', fill_value=None, n_jobs=None):
+    """
+    Add growth rates and rolling averages for every country in one pass.
+
+    Adds Cases_Growth_Rate, Deaths_Growth_Rate, New_cases_7day_avg and
+    New_deaths_7day_avg.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned dataset (it is not modified)
+    window : int
+        Rolling window length in rows
+    float_dtype : str
+        Dtype of the created columns
+    fill_value : float, optional
+        Value replacing NaN results (kept as NaN if None)
+    n_jobs : int, optional
+        Number of worker processes (None or 1: in-process, -1: all CPUs)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataset sorted by Country and Date_reported with the new columns
+    """
+    df_sorted = sort_by_country(df)
+    index = CountryIndex.build(df_sorted)
+    inputs = df_sorted[SERIES_INPUT_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    n_jobs = min(resolve_n_jobs(n_jobs), len(index))
+    if n_jobs > 1:
+        features = _parallel_series_features(inputs, index, window, n_jobs)
+    else:
+        row_starts = _segment_starts_per_row(index.starts, index.lengths)
+        features = _series_feature_block(inputs, row_starts, window)
+
+    names = ['Cases_Growth_Rate', 'Deaths_Growth_Rate',
+             f'New_cases_{window}day_avg', f'New_deaths_{window}day_avg']
+    for i, name in enumerate(names):
+        values = features[:, i]
+        if fill_value is not None:
+            values = np.where(np.isnan(values), fill_value, values)
+        df_sorted[name] = values.astype(float_dtype)
+
+    return df_sorted
+
+
+if __name__ == "__main__":
+    print("COVID-19 Vectorized Feature Engine Module")
+    print("This module computes growth and rolling features for all countries in one pass.")
@@ -0,0 +1,435 @@
+"""
+Feature Registry Module for COVID-19 Analysis
+=============================================
+
+Every feature is registered with the columns it produces, the raw input
+columns it reads and the features it depends on. Callers ask for a set of
+output columns and only the subgraph needed for them is computed, in
+dependency order.
+
+Computed columns can be cached on disk. A feature's fingerprint combines
+the content hash of its input columns, its version, its parameters and the
+fingerprints of its dependencies, so a cached feature is reused - without
+computing its dependencies - as long as none of these change.
+
+Series features (growth rates, lags, rolling statistics) treat each Country
+block as a separate series; rows must be grouped by Country and ordered by
+date (see ``src.country_index.sort_by_country``). Frames without a Country
+column are treated as a single series.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .country_index import CountryIndex
+from .feature_engine import (_segment_starts_per_row, rolling_features, segmented_pct_change,
+                             segmented_rolling)
+from .phase_calendar import assign_pandemic_phase
+from .vocabulary import encode_with_vocabulary
+
+
+class Feature:
+    """
+    A registered feature: a function producing one or more output columns.
+    """
+
+    def __init__(self, name, func, outputs, inputs=(), depends=(), params=(), version=1):
+        self.name = name
+        self.func = func
+        self.outputs = list(outputs)
+        self.inputs = list(inputs)
+        self.depends = list(depends)
+        self.params = list(params)
+        self.version = version
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, outputs={self.outputs})"
+
+
+def _param_token(value):
+    """Return a JSON-serialisable token of a feature parameter for fingerprints."""
+    if hasattr(value, 'to_config'):
+        value = value.to_config()
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def column_fingerprint(series):
+    """
+    Content hash of a column, including its row order and dtype.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Column to hash
+
+    Returns:
+    --------
+    str
+        Hex digest
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(series.dtype).encode())
+    hasher.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+class FeatureRegistry:
+    """
+    Registry of features with dependency resolution and column-level caching.
+    """
+
+    def __init__(self):
+        self.features = {}
+        self.producers = {}
+
+    def register(self, name, outputs, inputs=(), depends=(), params=(), version=1):
+        """
+        Decorator registering ``func(df, **params) -> dict`` as a feature.
+
+        Parameters:
+        -----------
+        name : str
+            Feature name
+        outputs : list
+            Columns produced by the feature
+        inputs : list
+            Raw columns read by the feature
+        depends : list
+            Output columns of other features read by the feature
+        params : list
+            Names of keyword parameters accepted by the feature
+        version : int
+            Bump to invalidate cached results after changing the feature
+
+        Returns:
+        --------
+        callable
+            Decorator returning the function unchanged
+        """
+        def decorator(func):
+            feature = Feature(name, func, outputs, inputs, depends, params, version)
+            for column in feature.outputs:
+                if column in self.producers:
+                    raise ValueError(f"Column '{column}' is already produced by "
+                                     f"'{self.producers[column]}'")
+            self.features[name] = feature
+            for column in feature.outputs:
+                self.producers[column] = name
+            return func
+        return decorator
+
+    @property
+    def outputs(self):
+        """All columns the registry can produce."""
+        return list(self.producers)
+
+    def resolve(self, columns, available=()):
+        """
+        Return the features needed for ``columns``, dependencies first.
+
+        Parameters:
+        -----------
+        columns : list
+            Requested output columns
+        available : iterable
+            Columns already present, used as-is when another feature depends on them
+
+        Returns:
+        --------
+        list
+            Feature names in computation order
+        """
+        order = []
+        visiting = set()
+        available = set(available)
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Feature dependency cycle through '{name}'")
+            visiting.add(name)
+            for column in self.features[name].depends:
+                if column not in available:
+                    visit(self._producer(column))
+            visiting.discard(name)
+            order.append(name)
+
+        for column in columns:
+            visit(self._producer(column))
+        return order
+
+    def _producer(self, column):
+        if column not in self.producers:
+            raise KeyError(f"No registered feature produces '{column}'")
+        return self.producers[column]
+
+    def _fingerprints(self, df, order, params):
+        """Fingerprint every feature of ``order`` without computing any of them."""
+        column_hashes = {}
+        fingerprints = {}
+        for name in order:
+            feature = self.features[name]
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(f'{name}:{feature.version}:{len(df)}'.encode())
+            for column in feature.inputs:
+                if column not in df.columns:
+                    # Optional inputs such as Country for single-series frames
+                    hasher.update(f'{column}=absent'.encode())
+                    continue
+                if column not in column_hashes:
+                    column_hashes[column] = column_fingerprint(df[column])
+                hasher.update(f'{column}={column_hashes[column]}'.encode())
+            for param in feature.params:
+                hasher.update(f'{param}={_param_token(params.get(param))}'.encode())
+            for column in feature.depends:
+                producer = self._producer(column)
+                if producer in fingerprints:
+                    hasher.update(fingerprints[producer].encode())
+                else:
+                    hasher.update(column_fingerprint(df[column]).encode())
+            fingerprints[name] = hasher.hexdigest()
+        return fingerprints
+
+    def compute(self, df, columns, cache_dir=None, **params):
+        """
+        Compute the requested feature columns and add them to a copy of ``df``.
+
+        Requested columns are always (re)computed; other columns already in
+        ``df`` are used as they are by the features that depend on them.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Input dataset
+        columns : list
+            Requested output columns
+        cache_dir : str, optional
+            Directory of the on-disk column cache (no caching if None)
+        **params
+            Feature parameters, e.g. ``phase_calendar``
+
+        Returns:
+        --------
+        pd.DataFrame
+            Copy of ``df`` with the requested columns
+        """
+        columns = list(columns)
+        available = [c for c in df.columns if c not in columns]
+        order = self.resolve(columns, available)
+        fingerprints = self._fingerprints(df, order, params) if cache_dir else {}
+        needed = {self._producer(c) for c in columns}
+
+        result = df.copy()
+        materialized = set()
+        cached = {}
+        if cache_dir:
+            for name in order:
+                path = self._cache_path(cache_dir, name, fingerprints[name])
+                if os.path.exists(path):
+                    cached[name] = path
+
+        def materialize(name):
+            if name in materialized:
+                return
+            feature = self.features[name]
+            if name in cached:
+                values = pd.read_feather(cached[name])
+                for column in feature.outputs:
+                    result[column] = values[column].array
+            else:
+                for column in feature.depends:
+                    if column not in available:
+                        materialize(self._producer(column))
+                kwargs = {param: params.get(param) for param in feature.params}
+                values = feature.func(result, **kwargs)
+                for column in feature.outputs:
+                    result[column] = values[column]
+                if cache_dir:
+                    self._write_cache(cache_dir, name, fingerprints[name], result[feature.outputs])
+            materialized.add(name)
+
+        for name in order:
+            if name in needed:
+                materialize(name)
+
+        # Dependencies computed on a cache miss are not part of the result
+        extra = [c for c in result.columns if c not in df.columns and c not in columns]
+        return result.drop(columns=extra)
+
+    def _cache_path(self, cache_dir, name, fingerprint):
+        return os.path.join(cache_dir, f'{name}-{fingerprint}.arrow')
+
+    def _write_cache(self, cache_dir, name, fingerprint, frame):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = self._cache_path(cache_dir, name, fingerprint)
+            tmp_path = path + '.tmp'
+            frame.reset_index(drop=True).to_feather(tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write feature cache for '{name}': {e}")
+
+
+def _series_row_starts(df):
+    """Segment start of every row: Country blocks, or one series without Country."""
+    if 'Country' not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    index = CountryIndex.build(df)
+    return _segment_starts_per_row(index.starts, index.lengths)
+
+
+def _float_column(df, column):
+    return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+DEFAULT_REGISTRY = FeatureRegistry()
+register = DEFAULT_REGISTRY.register
+
+
+@register('date_parts', outputs=['Year', 'Month', 'Day_of_week', 'Week_of_year'],
+          inputs=['Date_reported'])
+def _date_parts(df):
+    dates = df['Date_reported'].dt
+    return {'Year': dates.year, 'Month': dates.month, 'Day_of_week': dates.dayofweek,
+            'Week_of_year': dates.isocalendar().week}
+
+
+@register('case_fatality_rate', outputs=['Case_Fatality_Rate'],
+          inputs=['Cumulative_cases', 'Cumulative_deaths'])
+def _case_fatality_rate(df):
+    return {'Case_Fatality_Rate': np.where(
+        df['Cumulative_cases'] > 0,
+        (df['Cumulative_deaths'] / df['Cumulative_cases']) * 100,
+        0
+    )}
+
+
+@register('growth_rates', outputs=['Cases_Growth_Rate', 'Deaths_Growth_Rate'],
+          inputs=['Country', 'Cumulative_cases', 'Cumulative_deaths'])
+def _growth_rates(df):
+    row_starts = _series_row_starts(df)
+    return {'Cases_Growth_Rate': segmented_pct_change(_float_column(df, 'Cumulative_cases'),
+                                                      row_starts),
+            'Deaths_Growth_Rate': segmented_pct_change(_float_column(df, 'Cumulative_deaths'),
+                                                       row_starts)}
+
+
+@register('rolling_averages', outputs=['New_cases_7day_avg', 'New_deaths_7day_avg'],
+          inputs=['Country', 'New_cases', 'New_deaths'])
+def _rolling_averages(df):
+    counts = df[['New_cases', 'New_deaths']].to_numpy(dtype=np.float64, na_value=np.nan)
+    means = segmented_rolling(counts, _series_row_starts(df), windows=(7,))[(7, 'mean')]
+    return {'New_cases_7day_avg': means[:, 0], 'New_deaths_7day_avg': means[:, 1]}
+
+
+@register('pandemic_phase', outputs=['Pandemic_Phase'], inputs=['Date_reported', 'WHO_region'],
+          params=['phase_calendar'])
+def _pandemic_phase(df, phase_calendar=None):
+    return {'Pandemic_Phase': assign_pandemic_phase(df, phase_calendar)}
+
+
+@register('who_region_code', outputs=['WHO_region_encoded'], inputs=['WHO_region'],
+          params=['vocabulary_path'], version=2)
+def _who_region_code(df, vocabulary_path=None):
+    # Stable codes from the vocabulary store, whatever regions this frame holds
+    encoded, _ = encode_with_vocabulary(df[['WHO_region']], ['WHO_region'], vocabulary_path)
+    return {'WHO_region_encoded': encoded['WHO_region_encoded']}
+
+
+RISK_LEVELS = ['Low', 'Medium', 'High']
+
+
+def outbreak_risk_levels(growth):
+    """
+    Label growth rates by their percentile within ``growth``.
+
+    Parameters:
+    -----------
+    growth : pd.Series
+        Growth rates
+
+    Returns:
+    --------
+    np.ndarray
+        'Low' up to the 75th percentile, 'Medium' up to the 90th, 'High'
+        above it ('Low' for missing values)
+    """
+    growth_p75, growth_p90 = growth.quantile(0.75), growth.quantile(0.90)
+    conditions = [growth <= growth_p75,
+                  (growth > growth_p75) & (growth <= growth_p90),
+                  growth > growth_p90]
+    return np.select(conditions, RISK_LEVELS, default='Low')
+
+
+@register('outbreak_risk', outputs=['Outbreak_Risk'], depends=['Cases_Growth_Rate'])
+def _outbreak_risk(df):
+    return {'Outbreak_Risk': outbreak_risk_levels(df['Cases_Growth_Rate'])}
+
+
+@register('forecast_time', outputs=['day_of_year', 'month', 'quarter', 'year', 'days_since_start'],
+          inputs=['Date_reported'])
+def _forecast_time(df):
+    dates = df['Date_reported']
+    return {'day_of_year': dates.dt.dayofyear, 'month': dates.dt.month,
+            'quarter': dates.dt.quarter, 'year': dates.dt.year,
+            'days_since_start': (dates - dates.min()).dt.days}
+
+
+FORECAST_LAG_COLUMNS = ['cases_lag_7', 'cases_lag_14', 'deaths_lag_7', 'deaths_lag_14',
+                        'cases_rolling_7', 'cases_rolling_14', 'deaths_rolling_7',
+                        'deaths_rolling_14']
+
+
+@register('forecast_lags', outputs=FORECAST_LAG_COLUMNS,
+          inputs=['Country', 'New_cases', 'New_deaths'])
+def _forecast_lags(df):
+    group_col = 'Country' if 'Country' in df.columns else None
+    return rolling_features(
+        df, ['New_cases', 'New_deaths'], windows=(7, 14), stats=('mean',), lags=(7, 14),
+        group_col=group_col, min_periods=None,
+        aliases={'New_cases': 'cases', 'New_deaths': 'deaths'},
+        name_format='{column}_rolling_{window}'
+    )
+
+
+CREATE_FEATURES_COLUMNS = ['Year', 'Month', 'Day_of_week', 'Week_of_year', 'Case_Fatality_Rate',
+                           'Cases_Growth_Rate', 'Deaths_Growth_Rate', 'New_cases_7day_avg',
+                           'New_deaths_7day_avg', 'Pandemic_Phase']
+
+
+def compute_features(df, columns, cache_dir=None, registry=None, **params):
+    """
+    Compute only the requested feature columns with the default registry.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataset (grouped by Country and ordered by date for series features)
+    columns : list
+        Requested output columns
+    cache_dir : str, optional
+        Directory of the on-disk column cache (no caching if None)
+    registry : FeatureRegistry, optional
+        Registry to use (defaults to DEFAULT_REGISTRY)
+    **params
+        Feature parameters, e.g. ``phase_calendar``
+
+    Returns:
+    --------
+    pd.DataFrame
+        Copy of ``df`` with the requested columns
+    """
+    return (registry or DEFAULT_REGISTRY).compute(df, columns, cache_dir=cache_dir, **params)
+
+
+if __name__ == "__main__":
+    print("COVID-19 Feature Registry Module")
+    print("This module computes requested features from a dependency graph with column caching.")
@@ -0,0 +1,232 @@
+"""
+Incremental Ingest Module for Daily WHO Snapshots
+=================================================
+
+WHO snapshots only append recent dates, so most of the processed history is
+unchanged between two runs. This module keeps the feature-engineered dataset
+in a persisted store and, for each new snapshot, processes only the rows
+whose ``Date_reported`` is newer than the last stored date of their country.
+
+Rolling averages and growth rates depend on the previous rows of a country,
+so each country's new rows are computed together with a trailing context of
+stored rows (the rolling window). Case Fatality Rate, date features and
+pandemic phases are row-local. The appended rows are therefore identical to
+the rows a full recompute would produce.
+
+Each part ``part-<sequence>.arrow`` is written with a small context sidecar,
+``context-<sequence>.arrow``, holding the last ``window - 1`` rows of every
+country in the store. An update reads only the sidecar of the latest part;
+the stored parts are scanned only for stores written without one.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import glob
+import os
+
+import pandas as pd
+
+from .data_preprocessing import clean_data, create_features
+
+
+ROLLING_WINDOW = 7
+
+# Columns required to recompute the history-dependent features of new rows
+CONTEXT_COLUMNS = ['Date_reported', 'Country_code', 'Country', 'WHO_region',
+                   'New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+
+
+def _sequence(path):
+    """Sequence number of a part or context file (``part-00000012.arrow`` -> 12)."""
+    return int(os.path.basename(path).split('-', 1)[1].split('.', 1)[0])
+
+
+def _part_paths(store_path):
+    # Numeric order, so the zero padding width does not matter
+    return sorted(glob.glob(os.path.join(store_path, 'part-*.arrow')), key=_sequence)
+
+
+def _context_path(store_path, sequence):
+    return os.path.join(store_path, f'context-{sequence:08d}.arrow')
+
+
+def _context_rows(df, window):
+    """Last ``window - 1`` rows of every country, sorted by Country and Date_reported."""
+    df = df[CONTEXT_COLUMNS].sort_values(['Country', 'Date_reported'], kind='mergesort')
+    return df.groupby('Country', sort=False).tail(max(window - 1, 1)).reset_index(drop=True)
+
+
+def _write_part(df, context, store_path, window):
+    """Write the next part and the context sidecar for the store including it."""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    os.makedirs(store_path, exist_ok=True)
+    parts = _part_paths(store_path)
+    sequence = _sequence(parts[-1]) + 1 if parts else 0
+
+    # The sidecar goes first: a part without its sidecar only costs a full scan
+    table = pa.Table.from_pandas(context, preserve_index=False)
+    metadata = dict(table.schema.metadata or {}, window=str(window))
+    feather.write_feather(table.replace_schema_metadata(metadata),
+                          _context_path(store_path, sequence), compression='uncompressed')
+
+    part_path = os.path.join(store_path, f'part-{sequence:08d}.arrow')
+    feather.write_feather(df.reset_index(drop=True), part_path, compression='uncompressed')
+
+    for path in glob.glob(os.path.join(store_path, 'context-*.arrow')):
+        if _sequence(path) != sequence:
+            os.remove(path)
+    return part_path
+
+
+def _load_context(store_path, window):
+    """
+    Read the context sidecar of the latest part.
+
+    Returns:
+    --------
+    pd.DataFrame or None
+        Last rows of every stored country, or None if the latest part has no
+        sidecar or it was written for a smaller window
+    """
+    from pyarrow import feather
+
+    path = _context_path(store_path, _sequence(_part_paths(store_path)[-1]))
+    if not os.path.exists(path):
+        return None
+    table = feather.read_table(path)
+    if int(table.schema.metadata.get(b'window', 0)) < window:
+        return None
+    return table.to_pandas()
+
+
+def _empty_feature_frame(store_path):
+    """Zero-row frame with the full schema of the stored feature rows."""
+    from pyarrow import feather
+
+    return feather.read_table(_part_paths(store_path)[0], memory_map=True) \
+        .schema.empty_table().to_pandas()
+
+
+def load_feature_store(store_path, columns=None):
+    """
+    Load the persisted feature store.
+
+    Parameters:
+    -----------
+    store_path : str
+        Directory of the feature store
+    columns : list, optional
+        Columns to read (all columns if None)
+
+    Returns:
+    --------
+    pd.DataFrame or None
+        Stored rows sorted by Country and Date_reported, or None if the store is empty
+    """
+    from pyarrow import feather
+
+    parts = _part_paths(store_path)
+    if not parts:
+        return None
+
+    df = pd.concat([feather.read_table(p, columns=columns, memory_map=True).to_pandas()
+                    for p in parts], ignore_index=True)
+    return df.sort_values(['Country', 'Date_reported'], kind='mergesort').reset_index(drop=True)
+
+
+def detect_new_rows(raw_df, last_dates):
+    """
+    Select the raw rows that are newer than the last stored date of their country.
+
+    Parameters:
+    -----------
+    raw_df : pd.DataFrame
+        Raw snapshot (as returned by ``load_covid_data``)
+    last_dates : pd.Series
+        Last stored Date_reported per Country
+
+    Returns:
+    --------
+    pd.DataFrame
+        Raw rows to ingest; countries absent from the store are kept entirely
+    """
+    raw = raw_df.copy()
+    raw.columns = raw.columns.str.strip().str.replace(' ', '_')
+    dates = pd.to_datetime(raw['Date_reported'])
+
+    cutoff = raw['Country'].map(last_dates)
+    is_new = cutoff.isna() | (dates > cutoff)
+    return raw[is_new.to_numpy()]
+
+
+def incremental_update(raw_df, store_path, window=ROLLING_WINDOW):
+    """
+    Append the new dates of a snapshot to the feature store.
+
+    On the first call (empty store) the full snapshot is cleaned and
+    feature-engineered. Later calls only process rows newer than each
+    country's last stored date, together with the last ``window - 1`` stored
+    rows of that country (read from the context sidecar) as context for
+    rolling and growth features.
+
+    Revised values for dates that are already stored are not detected;
+    rebuild the store from scratch when WHO revises history.
+
+    Parameters:
+    -----------
+    raw_df : pd.DataFrame
+        Raw snapshot (as returned by ``load_covid_data``)
+    store_path : str
+        Directory of the feature store
+    window : int
+        Rolling window length used by ``create_features``
+
+    Returns:
+    --------
+    pd.DataFrame
+        Newly appended feature rows (empty if the snapshot had no new dates)
+    """
+    if not _part_paths(store_path):
+        print("🆕 Feature store is empty, running full processing...")
+        new_features = create_features(clean_data(raw_df))
+        _write_part(new_features, _context_rows(new_features, window), store_path, window)
+        print(f"✅ Feature store initialised with {len(new_features):,} rows")
+        return new_features.reset_index(drop=True)
+
+    stored = _load_context(store_path, window)
+    if stored is None:
+        print("⚠️ No context sidecar for this window, scanning the stored parts...")
+        stored = _context_rows(load_feature_store(store_path, columns=CONTEXT_COLUMNS), window)
+
+    last_dates = stored.groupby('Country', sort=False)['Date_reported'].max()
+    new_raw = detect_new_rows(raw_df, last_dates)
+
+    if new_raw.empty:
+        print("✅ Feature store is up to date, no new rows")
+        return _empty_feature_frame(store_path)
+
+    new_clean = clean_data(new_raw)
+    print(f"📥 {len(new_clean):,} new rows for {new_clean['Country'].nunique()} countries")
+
+    # Trailing context rows of the affected countries
+    affected = stored[stored['Country'].isin(new_clean['Country'].unique())]
+    context = affected.groupby('Country', sort=False).tail(max(window - 1, 1))
+
+    combined = pd.concat([context.assign(_is_new=False), new_clean.assign(_is_new=True)],
+                         ignore_index=True)
+    features = create_features(combined.drop(columns='_is_new'))
+    new_features = features[combined.loc[features.index, '_is_new'].to_numpy()]
+
+    context = _context_rows(pd.concat([stored, new_features[CONTEXT_COLUMNS]],
+                                      ignore_index=True), window)
+    _write_part(new_features, context, store_path, window)
+    print(f"✅ Appended {len(new_features):,} rows to the feature store")
+    return new_features.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print("COVID-19 Incremental Ingest Module")
+    print("This module appends new WHO snapshot dates to a persisted feature store.")
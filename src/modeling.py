@@ -3,9 +3,13 @@ Machine Learning Models Module for COVID-19 Analysis
 This module contains machine learning models for clustering, forecasting, and classification.
 """
 
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans, kmeans_plusplus
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 from sklearn.ensemble import GradientBoostingClassifier, VotingClassifier
 from sklearn.svm import SVC
@@ -13,7 +17,124 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import (silhouette_score, mean_squared_error, r2_score,
-                           accuracy_score, precision_score, recall_score, f1_score)
+                           accuracy_score, precision_score, recall_score, f1_score,
+                           calinski_harabasz_score, davies_bouldin_score)
+from threadpoolctl import threadpool_limits
+
+from .country_index import CountryIndex
+from .feature_engine import balanced_blocks, resolve_n_jobs
+from .feature_registry import FORECAST_LAG_COLUMNS, compute_features, outbreak_risk_levels
+from .vocabulary import encode_with_vocabulary
+
+
+# Criterion -> (score column, True if higher is better)
+CLUSTER_CRITERIA = {
+    'silhouette': ('silhouette', True),
+    'calinski_harabasz': ('calinski_harabasz', True),
+    'davies_bouldin': ('davies_bouldin', False),
+    'elbow': ('inertia', None)
+}
+
+
+def _check_criterion(criterion):
+    if criterion not in CLUSTER_CRITERIA:
+        raise ValueError(f"Unknown criterion '{criterion}', expected one of "
+                         f"{list(CLUSTER_CRITERIA)}")
+
+
+def _fit_cluster_candidate(X_scaled, k, silhouette_sample_size, random_state):
+    """Fit KMeans for one k and score it with every criterion."""
+    start = time.perf_counter()
+    kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=10)
+    labels = kmeans.fit_predict(X_scaled)
+    scores = _cluster_scores(X_scaled, labels, k, kmeans.inertia_, silhouette_sample_size,
+                             random_state)
+    scores['seconds'] = time.perf_counter() - start
+    return scores, kmeans
+
+
+def _cluster_scores(X_scaled, labels, k, inertia, silhouette_sample_size, random_state):
+    """Score one clustering with every criterion (silhouette sampled above the sample size)."""
+    if len(np.unique(labels)) < 2:
+        # Degenerate clustering: worst possible scores
+        return {'k': k, 'inertia': inertia, 'silhouette': -1.0,
+                'calinski_harabasz': 0.0, 'davies_bouldin': np.inf}
+    sample_size = silhouette_sample_size if len(X_scaled) > silhouette_sample_size else None
+    return {
+        'k': k,
+        'inertia': inertia,
+        'silhouette': silhouette_score(X_scaled, labels, sample_size=sample_size,
+                                       random_state=random_state),
+        'calinski_harabasz': calinski_harabasz_score(X_scaled, labels),
+        'davies_bouldin': davies_bouldin_score(X_scaled, labels)
+    }
+
+
+def _cluster_candidate_worker(shm_name, shape, k, silhouette_sample_size, random_state):
+    """Worker: fit one k on the scaled matrix held in shared memory."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        X_scaled = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        # One BLAS/OpenMP thread per worker; the parallelism is across k
+        with threadpool_limits(limits=1):
+            result = _fit_cluster_candidate(X_scaled, k, silhouette_sample_size, random_state)
+        del X_scaled
+    finally:
+        shm.close()
+    return result
+
+
+def elbow_k(ks, inertias):
+    """
+    Pick the elbow of an inertia curve.
+
+    The elbow is the k whose point lies farthest below the straight line
+    between the first and last points of the normalised curve.
+
+    Parameters:
+    -----------
+    ks : array-like
+        Tested numbers of clusters, increasing
+    inertias : array-like
+        KMeans inertia for each k
+
+    Returns:
+    --------
+    int
+        Elbow k
+    """
+    ks = np.asarray(ks, dtype=np.float64)
+    inertias = np.asarray(inertias, dtype=np.float64)
+    if len(ks) < 3:
+        return int(ks[-1])
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = inertias[0] - inertias[-1]
+    y = (inertias - inertias[-1]) / span if span > 0 else np.zeros_like(inertias)
+    # Chord runs from (0, 1) to (1, 0); distance below it is 1 - x - y
+    return int(ks[np.argmax(1 - x - y)])
+
+
+def _iter_chunks(chunks, columns=None):
+    """
+    Iterate float64 arrays over one pass of a chunk source.
+
+    ``chunks`` is a callable returning a fresh iterable (called once per
+    pass) or a re-iterable such as a list of arrays or DataFrames.
+    """
+    for chunk in (chunks() if callable(chunks) else chunks):
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[columns] if columns is not None else chunk
+            chunk = chunk.to_numpy(dtype=np.float64)
+        yield np.asarray(chunk, dtype=np.float64)
+
+
+def _add_center(sample, centers, rng):
+    """Warm start for k + 1: keep the k centers and seed one more by D² sampling."""
+    distances = ((sample[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+    total = distances.sum()
+    probabilities = distances / total if total > 0 else None
+    new_center = sample[rng.choice(len(sample), p=probabilities)]
+    return np.vstack([centers, new_center])
 
 
 class COVIDClustering:
@@ -21,15 +142,27 @@ class COVIDClustering:
     Country clustering based on COVID-19 response patterns.
     """
     
-    def __init__(self, n_clusters=None):
+    def __init__(self, n_clusters=None, n_jobs=None, silhouette_sample_size=10000,
+                 random_state=42):
         self.n_clusters = n_clusters
+        self.n_jobs = n_jobs
+        self.silhouette_sample_size = silhouette_sample_size
+        self.random_state = random_state
         self.scaler = StandardScaler()
         self.kmeans = None
         self.silhouette_scores = []
+        self.cluster_scores = None
+        self._fitted_X = None
         
-    def find_optimal_clusters(self, X, k_range=range(2, 11)):
+    def find_optimal_clusters(self, X, k_range=range(2, 11), criterion='silhouette'):
         """
-        Find optimal number of clusters using silhouette analysis.
+        Find optimal number of clusters with a (parallel) sweep over k.
+        
+        Every k is fitted once on a single scaled matrix, in ``n_jobs``
+        worker processes sharing it through shared memory, and scored with
+        all criteria in the same pass. Above ``silhouette_sample_size`` rows
+        the silhouette is computed on a random sample. The winning model is
+        kept, so ``fit_predict`` on the same data does not refit.
         
         Parameters:
         -----------
@@ -37,33 +170,77 @@ class COVIDClustering:
             Feature matrix
         k_range : range
             Range of k values to test
+        criterion : str
+            'silhouette' (highest), 'calinski_harabasz' (highest),
+            'davies_bouldin' (lowest) or 'elbow' (knee of the inertia curve)
         
         Returns:
         --------
         int
             Optimal number of clusters
         """
-        X_scaled = self.scaler.fit_transform(X)
+        _check_criterion(criterion)
         
-        self.silhouette_scores = []
-        for k in k_range:
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-            labels = kmeans.fit_predict(X_scaled)
-            score = silhouette_score(X_scaled, labels)
-            self.silhouette_scores.append(score)
+        X_raw = np.asarray(X, dtype=np.float64)
+        X_scaled = np.ascontiguousarray(self.scaler.fit_transform(X_raw), dtype=np.float64)
+        ks = [k for k in k_range if k < len(X_scaled)]
         
-        optimal_k = k_range[np.argmax(self.silhouette_scores)]
-        self.n_clusters = optimal_k
+        n_jobs = min(resolve_n_jobs(self.n_jobs), len(ks))
+        if n_jobs > 1:
+            results = self._parallel_sweep(X_scaled, ks, n_jobs)
+        else:
+            results = [_fit_cluster_candidate(X_scaled, k, self.silhouette_sample_size,
+                                              self.random_state) for k in ks]
         
-        print(f"🎯 Optimal number of clusters: {optimal_k}")
-        print(f"📊 Best silhouette score: {max(self.silhouette_scores):.3f}")
+        self.cluster_scores = pd.DataFrame([scores for scores, _ in results])
+        self.silhouette_scores = self.cluster_scores['silhouette'].tolist()
         
+        optimal_k = self._select_k(criterion)
+        self.n_clusters = optimal_k
+        self.kmeans = results[ks.index(optimal_k)][1]
+        self._fitted_X = X_raw
+        
+        self._print_selection(criterion)
         return optimal_k
     
+    def _select_k(self, criterion):
+        """Pick k from ``cluster_scores`` with the given criterion."""
+        if criterion == 'elbow':
+            return elbow_k(self.cluster_scores['k'], self.cluster_scores['inertia'])
+        column, higher_is_better = CLUSTER_CRITERIA[criterion]
+        scores = self.cluster_scores[column].to_numpy()
+        best = np.argmax(scores) if higher_is_better else np.argmin(scores)
+        return int(self.cluster_scores['k'].iloc[best])
+    
+    def _print_selection(self, criterion):
+        best_row = self.cluster_scores[self.cluster_scores['k'] == self.n_clusters].iloc[0]
+        print(f"🎯 Optimal number of clusters ({criterion}): {self.n_clusters}")
+        print(f"📊 Silhouette score: {best_row['silhouette']:.3f}, "
+              f"Calinski-Harabasz: {best_row['calinski_harabasz']:,.1f}, "
+              f"Davies-Bouldin: {best_row['davies_bouldin']:.3f}")
+    
+    def _parallel_sweep(self, X_scaled, ks, n_jobs):
+        """Fit every k in worker processes that share the scaled matrix."""
+        shm = shared_memory.SharedMemory(create=True, size=max(X_scaled.nbytes, 1))
+        try:
+            np.ndarray(X_scaled.shape, dtype=np.float64, buffer=shm.buf)[:] = X_scaled
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                # Largest k first: they take longest
+                futures = {k: executor.submit(_cluster_candidate_worker, shm.name, X_scaled.shape,
+                                              k, self.silhouette_sample_size, self.random_state)
+                           for k in sorted(ks, reverse=True)}
+                return [futures[k].result() for k in ks]
+        finally:
+            shm.close()
+            shm.unlink()
+    
     def fit_predict(self, X):
         """
         Fit clustering model and predict clusters.
         
+        If the k sweep already ran on the same data, its winning model is
+        reused instead of being refitted.
+        
         Parameters:
         -----------
         X : array-like
@@ -77,60 +254,357 @@ class COVIDClustering:
         if self.n_clusters is None:
             self.find_optimal_clusters(X)
         
-        X_scaled = self.scaler.fit_transform(X)
-        self.kmeans = KMeans(n_clusters=self.n_clusters, random_state=42, n_init=10)
-        labels = self.kmeans.fit_predict(X_scaled)
+        X_raw = np.asarray(X, dtype=np.float64)
+        reusable = (self.kmeans is not None and self.kmeans.n_clusters == self.n_clusters
+                    and self._fitted_X is not None and np.array_equal(self._fitted_X, X_raw))
+        if reusable:
+            labels = self.kmeans.labels_
+        else:
+            X_scaled = self.scaler.fit_transform(X_raw)
+            self.kmeans = KMeans(n_clusters=self.n_clusters, random_state=self.random_state,
+                                 n_init=10)
+            labels = self.kmeans.fit_predict(X_scaled)
+            self._fitted_X = X_raw
         
         print(f"✅ Clustering completed with {self.n_clusters} clusters")
         return labels
+    
+    def fit_streaming(self, chunks, k_range=range(2, 11), criterion='silhouette', columns=None,
+                      batch_size=4096, n_epochs=2):
+        """
+        Fit mini-batch k-means over chunks that need not fit in memory.
+        
+        A first pass fits the scaler incrementally and keeps a uniform
+        random sample of ``silhouette_sample_size`` rows. Each k is then
+        trained with ``MiniBatchKMeans.partial_fit`` over ``n_epochs`` passes,
+        warm-started from the centers of the previous k plus one center
+        seeded from the sample, and scored on the sample with every
+        criterion. Memory is bounded by the sample plus one chunk.
+        
+        Parameters:
+        -----------
+        chunks : callable or iterable
+            Callable returning a fresh iterable of arrays/DataFrames for
+            every pass, or a re-iterable such as a list
+        k_range : range
+            Range of k values to test (only ``n_clusters`` if it is set)
+        criterion : str
+            'silhouette', 'calinski_harabasz', 'davies_bouldin' or 'elbow'
+        columns : list, optional
+            Feature columns to take from DataFrame chunks
+        batch_size : int
+            Rows per ``partial_fit`` step
+        n_epochs : int
+            Passes over the chunks per k
+        
+        Returns:
+        --------
+        int
+            Chosen number of clusters
+        """
+        _check_criterion(criterion)
+        rng = np.random.default_rng(self.random_state)
+        self.scaler = StandardScaler()
+        
+        # Pass 1: incremental scaler and a bounded uniform sample (smallest random keys)
+        sample, keys, n_rows = None, None, 0
+        for X_chunk in _iter_chunks(chunks, columns):
+            self.scaler.partial_fit(X_chunk)
+            chunk_keys = rng.random(len(X_chunk))
+            sample = X_chunk if sample is None else np.vstack([sample, X_chunk])
+            keys = chunk_keys if keys is None else np.concatenate([keys, chunk_keys])
+            size = self.silhouette_sample_size
+            if len(keys) > size:
+                keep = np.argpartition(keys, size)[:size]
+                sample, keys = sample[keep], keys[keep]
+            n_rows += len(X_chunk)
+        if sample is None:
+            raise ValueError("No rows in the chunks")
+        sample = self.scaler.transform(sample)
+        
+        ks = [self.n_clusters] if self.n_clusters else [k for k in k_range if k < len(sample)]
+        print(f"🌊 Streaming clustering of {n_rows:,} rows (k = {ks[0]}..{ks[-1]}, "
+              f"{n_epochs} epochs, scored on {len(sample):,} sampled rows)")
+        
+        rows, models, centers = [], {}, None
+        for k in ks:
+            start = time.perf_counter()
+            if centers is None or len(centers) != k - 1:
+                centers, _ = kmeans_plusplus(sample, k, random_state=self.random_state)
+            else:
+                centers = _add_center(sample, centers, rng)
+            
+            model = MiniBatchKMeans(n_clusters=k, init=centers, n_init=1, batch_size=batch_size,
+                                    random_state=self.random_state)
+            for _ in range(n_epochs):
+                for X_chunk in _iter_chunks(chunks, columns):
+                    X_chunk = self.scaler.transform(X_chunk)
+                    for batch_start in range(0, len(X_chunk), batch_size):
+                        model.partial_fit(X_chunk[batch_start:batch_start + batch_size])
+            
+            labels = model.predict(sample)
+            inertia = -model.score(sample)
+            scores = _cluster_scores(sample, labels, k, inertia, len(sample), self.random_state)
+            scores['seconds'] = time.perf_counter() - start
+            rows.append(scores)
+            models[k] = model
+            centers = model.cluster_centers_
+        
+        self.cluster_scores = pd.DataFrame(rows)
+        self.silhouette_scores = self.cluster_scores['silhouette'].tolist()
+        self.n_clusters = ks[0] if len(ks) == 1 else self._select_k(criterion)
+        self.kmeans = models[self.n_clusters]
+        self._fitted_X = None
+        
+        self._print_selection(criterion)
+        return self.n_clusters
+    
+    def predict_streaming(self, chunks, columns=None):
+        """
+        Assign cluster labels chunk by chunk with the fitted model.
+        
+        Parameters:
+        -----------
+        chunks : callable or iterable
+            Chunks of the feature matrix (arrays or DataFrames)
+        columns : list, optional
+            Feature columns to take from DataFrame chunks
+        
+        Yields:
+        -------
+        np.ndarray
+            Cluster labels of each chunk
+        """
+        if self.kmeans is None:
+            raise ValueError("The clustering model is not fitted")
+        for X_chunk in _iter_chunks(chunks, columns):
+            yield self.kmeans.predict(self.scaler.transform(X_chunk))
+
+
+FORECAST_MODEL_PARAMS = {'n_estimators': 100, 'random_state': 42, 'max_depth': 10}
+FORECAST_TARGETS = ['New_cases', 'New_deaths']
+
+
+def _forecast_metrics(y_cases, cases_pred, y_deaths, deaths_pred):
+    """RMSE and R² of the cases and deaths predictions."""
+    return {
+        'cases_rmse': np.sqrt(mean_squared_error(y_cases, cases_pred)),
+        'cases_r2': r2_score(y_cases, cases_pred),
+        'deaths_rmse': np.sqrt(mean_squared_error(y_deaths, deaths_pred)),
+        'deaths_r2': r2_score(y_deaths, deaths_pred)
+    }
+
+
+def _fit_series_models(X, y_cases, y_deaths, test_size, model_params):
+    """Train and evaluate the cases/deaths forests of one series with a chronological split."""
+    start = time.perf_counter()
+    split_idx = int((1 - test_size) * len(X))
+    cases_model = RandomForestRegressor(**model_params).fit(X[:split_idx], y_cases[:split_idx])
+    deaths_model = RandomForestRegressor(**model_params).fit(X[:split_idx], y_deaths[:split_idx])
+    metrics = {'n_train': split_idx, 'n_test': len(X) - split_idx}
+    metrics.update(_forecast_metrics(y_cases[split_idx:], cases_model.predict(X[split_idx:]),
+                                     y_deaths[split_idx:], deaths_model.predict(X[split_idx:])))
+    metrics['seconds'] = time.perf_counter() - start
+    return metrics, (cases_model, deaths_model)
+
+
+def _series_models_worker(shm_name, shape, starts, stops, test_size, model_params, keep_models):
+    """Worker: train the series in rows [starts[i], stops[i]) of the shared matrix."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        results = []
+        with threadpool_limits(limits=1):
+            for start, stop in zip(starts, stops):
+                block = matrix[start:stop]
+                metrics, models = _fit_series_models(block[:, :-2], block[:, -2], block[:, -1],
+                                                     test_size, model_params)
+                results.append((metrics, models if keep_models else None))
+        del matrix, block
+    finally:
+        shm.close()
+    return results
+
+
+FORECAST_LAGS = (7, 14)
+FORECAST_WINDOWS = (7, 14)
+FORECAST_HISTORY = max(FORECAST_LAGS + FORECAST_WINDOWS)
+
+
+def _calendar_features(dates, start_date):
+    """(n, 5) day_of_year, month, quarter, year and days_since_start of datetime64 values."""
+    dates = pd.DatetimeIndex(dates)
+    return np.column_stack([dates.dayofyear, dates.month, dates.quarter, dates.year,
+                            (dates - pd.Timestamp(start_date)).days]).astype(np.float64)
+
+
+def _lag_features(values, step, guess):
+    """
+    Lag and rolling features of day ``step`` for every series at once.
+
+    ``values`` is an (n_series, n_days, 2) array of cases and deaths whose
+    days before ``step`` are known or already forecast; the rolling means
+    include the current day, for which ``guess`` (n_series, 2) is used.
+    Columns follow FORECAST_LAG_COLUMNS.
+    """
+    lags = [values[:, step - lag, :] for lag in FORECAST_LAGS]
+    means = [(values[:, step - window + 1:step, :].sum(axis=1) + guess) / window
+             for window in FORECAST_WINDOWS]
+    # cases_lag_7, cases_lag_14, deaths_lag_7, deaths_lag_14, then the rolling means
+    return np.column_stack([lags[0][:, 0], lags[1][:, 0], lags[0][:, 1], lags[1][:, 1],
+                            means[0][:, 0], means[1][:, 0], means[0][:, 1], means[1][:, 1]])
+
+
+def _stack_forests(forests):
+    """
+    Flatten the trees of fitted regression forests into one set of node arrays.
+    
+    Node indices are global, and leaves point to themselves so that every
+    tree can be walked for the same number of levels. Returns (roots of
+    shape (n_forests, n_trees), feature, threshold, left, right, value, depth).
+    """
+    trees = [[tree.tree_ for tree in forest.estimators_] for forest in forests]
+    if len({len(forest_trees) for forest_trees in trees}) > 1:
+        raise ValueError("All stacked forests need the same number of trees")
+    
+    flat = [tree for forest_trees in trees for tree in forest_trees]
+    counts = np.array([tree.node_count for tree in flat])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    feature, threshold, left, right, value = [], [], [], [], []
+    for tree, offset in zip(flat, offsets):
+        nodes = np.arange(tree.node_count) + offset
+        leaf = tree.children_left == -1
+        feature.append(np.where(leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(leaf, nodes, tree.children_left + offset))
+        right.append(np.where(leaf, nodes, tree.children_right + offset))
+        value.append(tree.value[:, 0, 0])
+    
+    roots = offsets.reshape(len(forests), -1)
+    depth = max(tree.max_depth for tree in flat)
+    return (roots, np.concatenate(feature), np.concatenate(threshold),
+            np.concatenate(left), np.concatenate(right), np.concatenate(value), depth)
+
+
+def _predict_stacked(stacked, X, rows):
+    """
+    Predict row ``rows[f]`` of ``X`` with forest ``f`` for all stacked forests at once.
+    
+    Matches ``RandomForestRegressor.predict``: inputs are compared in float32
+    and the tree predictions are summed in tree order.
+    """
+    roots, feature, threshold, left, right, value, depth = stacked
+    X = X.astype(np.float32).astype(np.float64)
+    node = roots.T
+    row = rows[None, :]
+    for _ in range(depth):
+        go_left = X[row, feature[node]] <= threshold[node]
+        node = np.where(go_left, left[node], right[node])
+    return value[node].sum(axis=0) / roots.shape[1]
+
+
+BACKTEST_WINDOWS = ('expanding', 'sliding')
+
+
+def _mape(y_true, y_pred):
+    """Mean absolute percentage error (in %) over days with a non-zero actual value."""
+    nonzero = y_true != 0
+    if not nonzero.any():
+        return np.nan
+    return float(np.mean(np.abs((y_true[nonzero] - y_pred[nonzero]) / y_true[nonzero])) * 100)
+
+
+def _fit_backtest_fold(matrix, n_features, train_start, test_start, test_end, model_params):
+    """
+    Fit and score one walk-forward fold of a shared backtest matrix.
+
+    ``matrix`` holds the features, the day number and both targets; the fold
+    trains on days [train_start, test_start) and tests on [test_start, test_end).
+    """
+    days = matrix[:, n_features]
+    train = (days >= train_start) & (days < test_start)
+    test = (days >= test_start) & (days < test_end)
+    X, y = matrix[:, :n_features], matrix[:, n_features + 1:]
+    
+    start = time.perf_counter()
+    models = [RandomForestRegressor(**model_params).fit(X[train], y[train, i]) for i in range(2)]
+    fit_seconds = time.perf_counter() - start
+    predictions = [model.predict(X[test]) for model in models]
+    
+    scores = {'n_train': int(train.sum()), 'n_test': int(test.sum())}
+    scores.update(_forecast_metrics(y[test, 0], predictions[0], y[test, 1], predictions[1]))
+    scores['cases_mape'] = _mape(y[test, 0], predictions[0])
+    scores['deaths_mape'] = _mape(y[test, 1], predictions[1])
+    scores['fit_seconds'] = fit_seconds
+    scores['seconds'] = time.perf_counter() - start
+    return scores
+
+
+def _backtest_fold_worker(shm_name, shape, n_features, folds, model_params):
+    """Worker: run (train_start, test_start, test_end) folds on the shared backtest matrix."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        with threadpool_limits(limits=1):
+            results = [_fit_backtest_fold(matrix, n_features, *fold, model_params)
+                       for fold in folds]
+        del matrix
+    finally:
+        shm.close()
+    return results
 
 
 class COVIDForecaster:
     """
     Time series forecasting for COVID-19 cases and deaths.
+    
+    Series codes of the pooled model come from the vocabulary store at
+    ``vocabulary_path`` (in memory if None), so a series keeps its code
+    across runs and new series are appended.
     """
     
-    def __init__(self):
-        self.cases_model = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
-        self.deaths_model = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
+    FEATURE_COLUMNS = (['day_of_year', 'month', 'quarter', 'year', 'days_since_start']
+                       + FORECAST_LAG_COLUMNS)
+    
+    def __init__(self, vocabulary_path=None):
+        self.vocabulary_path = vocabulary_path
+        self.cases_model = RandomForestRegressor(**FORECAST_MODEL_PARAMS)
+        self.deaths_model = RandomForestRegressor(**FORECAST_MODEL_PARAMS)
         self.feature_cols = None
+        self.series_models = {}
+        self.pooled_models = None
+        self.series_vocabulary = None
+        self.batch_stats = None
+        self.start_date = None
         
-    def create_time_features(self, df, date_col='Date_reported'):
+    def create_time_features(self, df, date_col='Date_reported', cache_dir=None):
         """
         Create time-based features for forecasting.
         
+        Only the forecasting features are computed, through the feature
+        registry; the whole frame is treated as a single ordered series.
+        
         Parameters:
         -----------
         df : pd.DataFrame
             Time series data
         date_col : str
             Name of date column
+        cache_dir : str, optional
+            Directory of the on-disk feature column cache (no caching if None)
         
         Returns:
         --------
         pd.DataFrame
             Data with time features
         """
-        df_features = df.copy()
+        series = df[[date_col, 'New_cases', 'New_deaths']].rename(columns={date_col: 'Date_reported'})
+        features = compute_features(series, self.FEATURE_COLUMNS, cache_dir=cache_dir)
+        self.start_date = series['Date_reported'].min()
         
-        # Basic time features
-        df_features['day_of_year'] = df_features[date_col].dt.dayofyear
-        df_features['month'] = df_features[date_col].dt.month
-        df_features['quarter'] = df_features[date_col].dt.quarter
-        df_features['year'] = df_features[date_col].dt.year
-        df_features['days_since_start'] = (df_features[date_col] - df_features[date_col].min()).dt.days
-        
-        # Lag features
-        df_features['cases_lag_7'] = df_features['New_cases'].shift(7)
-        df_features['cases_lag_14'] = df_features['New_cases'].shift(14)
-        df_features['deaths_lag_7'] = df_features['New_deaths'].shift(7)
-        df_features['deaths_lag_14'] = df_features['New_deaths'].shift(14)
-        
-        # Rolling averages
-        df_features['cases_rolling_7'] = df_features['New_cases'].rolling(7).mean()
-        df_features['cases_rolling_14'] = df_features['New_cases'].rolling(14).mean()
-        df_features['deaths_rolling_7'] = df_features['New_deaths'].rolling(7).mean()
-        df_features['deaths_rolling_14'] = df_features['New_deaths'].rolling(14).mean()
+        df_features = df.copy()
+        for col in self.FEATURE_COLUMNS:
+            df_features[col] = features[col].to_numpy()
         
         return df_features
     
@@ -151,9 +625,7 @@ class COVIDForecaster:
             Training results and metrics
         """
         # Prepare features
-        self.feature_cols = ['day_of_year', 'month', 'quarter', 'year', 'days_since_start',
-                           'cases_lag_7', 'cases_lag_14', 'deaths_lag_7', 'deaths_lag_14',
-                           'cases_rolling_7', 'cases_rolling_14', 'deaths_rolling_7', 'deaths_rolling_14']
+        self.feature_cols = list(self.FEATURE_COLUMNS)
         
         X = ts_data[self.feature_cols].dropna()
         y_cases = ts_data.loc[X.index, 'New_cases']
@@ -165,13 +637,13 @@ class COVIDForecaster:
         y_cases_train, y_cases_test = y_cases[:split_idx], y_cases[split_idx:]
         y_deaths_train, y_deaths_test = y_deaths[:split_idx], y_deaths[split_idx:]
         
-        # Train models
-        self.cases_model.fit(X_train, y_cases_train)
-        self.deaths_model.fit(X_train, y_deaths_train)
+        # Train models on arrays so that forecast steps predict without building frames
+        self.cases_model.fit(X_train.to_numpy(dtype=np.float64), y_cases_train)
+        self.deaths_model.fit(X_train.to_numpy(dtype=np.float64), y_deaths_train)
         
         # Make predictions
-        cases_pred = self.cases_model.predict(X_test)
-        deaths_pred = self.deaths_model.predict(X_test)
+        cases_pred = self.cases_model.predict(X_test.to_numpy(dtype=np.float64))
+        deaths_pred = self.deaths_model.predict(X_test.to_numpy(dtype=np.float64))
         
         # Calculate metrics
         results = {
@@ -192,6 +664,443 @@ class COVIDForecaster:
         print(f"  Deaths - RMSE: {results['deaths_rmse']:,.0f}, R²: {results['deaths_r2']:.3f}")
         
         return results
+    
+    def prepare_series(self, data, group_col='Country', date_col='Date_reported', cache_dir=None):
+        """
+        Build forecasting features for every series of a multi-series frame.
+        
+        Rows are summed per (group, date), so ``group_col='WHO_region'``
+        gives one series per region. Lag and rolling features are computed
+        per series in one registry call; the first 14 rows of every series
+        (incomplete lags) are dropped.
+        
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Daily data with ``group_col``, ``date_col``, New_cases and New_deaths
+        group_col : str
+            Column identifying a series ('Country' or 'WHO_region')
+        date_col : str
+            Name of date column
+        cache_dir : str, optional
+            Directory of the on-disk feature column cache (no caching if None)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Series features sorted by group and date, with a ``group_col`` column
+        """
+        daily = (data.groupby([group_col, date_col], observed=True, sort=True)[FORECAST_TARGETS]
+                 .sum().reset_index())
+        # The registry computes lag features per 'Country' block
+        series = daily.rename(columns={group_col: 'Country', date_col: 'Date_reported'})
+        features = compute_features(series, self.FEATURE_COLUMNS, cache_dir=cache_dir)
+        self.start_date = series['Date_reported'].min()
+        features = features.dropna(subset=self.FEATURE_COLUMNS).reset_index(drop=True)
+        return features.rename(columns={'Country': group_col, 'Date_reported': date_col})
+    
+    def train_batch(self, data, group_col='Country', mode='per_series', test_size=0.2,
+                    n_jobs=None, min_rows=60, keep_models=False, cache_dir=None):
+        """
+        Train and evaluate forecasting models for every country (or region).
+        
+        With ``mode='per_series'`` each series gets its own cases/deaths
+        forests, trained in ``n_jobs`` worker processes that read the
+        feature matrix from shared memory. With ``mode='pooled'`` one pair of
+        forests is trained on all series with the series code as an extra
+        feature, which is much faster. Both modes use the last
+        ``test_size`` share of every series as its test set, so their
+        metrics are comparable.
+        
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Daily data with ``group_col``, Date_reported, New_cases and New_deaths
+        group_col : str
+            Column identifying a series ('Country' or 'WHO_region')
+        mode : str
+            'per_series' or 'pooled'
+        test_size : float
+            Proportion of every series used for testing
+        n_jobs : int, optional
+            Worker processes for 'per_series', threads of the forests for
+            'pooled' (None: 1, negative: all CPUs)
+        min_rows : int
+            Series with fewer rows (after dropping incomplete lags) are skipped
+        keep_models : bool
+            Keep the fitted per-series models in ``series_models``
+        cache_dir : str, optional
+            Directory of the on-disk feature column cache (no caching if None)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            One row per series: group, n_train, n_test, RMSE and R² for
+            cases and deaths, and training seconds
+        """
+        if mode not in ('per_series', 'pooled'):
+            raise ValueError("mode must be 'per_series' or 'pooled'")
+        
+        start = time.perf_counter()
+        features = self.prepare_series(data, group_col, cache_dir=cache_dir)
+        index = CountryIndex.build(features, key=group_col, region_col=None)
+        eligible = index.lengths >= min_rows
+        n_skipped = int((~eligible).sum())
+        
+        self.feature_cols = list(self.FEATURE_COLUMNS)
+        matrix = np.ascontiguousarray(
+            features[self.feature_cols + FORECAST_TARGETS].to_numpy(dtype=np.float64))
+        
+        print(f"📈 Training {mode} forecasting models for {int(eligible.sum()):,} series "
+              f"by {group_col} ({n_skipped:,} with fewer than {min_rows} rows skipped)...")
+        
+        if mode == 'pooled':
+            metrics = self._train_pooled(features, matrix, index, eligible, group_col,
+                                         test_size, n_jobs)
+            n_models = 1
+        else:
+            metrics = self._train_per_series(matrix, index, eligible, group_col, test_size,
+                                             n_jobs, keep_models)
+            n_models = len(metrics)
+        
+        seconds = time.perf_counter() - start
+        self.batch_stats = {'mode': mode, 'series': len(metrics), 'models': n_models,
+                            'seconds': seconds, 'series_per_second': len(metrics) / seconds,
+                            'models_per_second': n_models / seconds}
+        
+        print(f"✅ {len(metrics):,} series forecast in {seconds:.1f}s "
+              f"({self.batch_stats['series_per_second']:.2f} series/s, "
+              f"{self.batch_stats['models_per_second']:.2f} models/s)")
+        print(f"📊 Median R² - Cases: {metrics['cases_r2'].median():.3f}, "
+              f"Deaths: {metrics['deaths_r2'].median():.3f}")
+        
+        return metrics
+    
+    def _train_per_series(self, matrix, index, eligible, group_col, test_size, n_jobs,
+                          keep_models):
+        """Fit one pair of forests per eligible series, in worker processes if n_jobs > 1."""
+        positions = np.flatnonzero(eligible)
+        n_jobs = min(resolve_n_jobs(n_jobs), max(len(positions), 1))
+        model_params = dict(FORECAST_MODEL_PARAMS, n_jobs=1)
+        self.series_models = {}
+        
+        if n_jobs > 1:
+            eligible_index = CountryIndex(index.countries[positions], index.starts[positions],
+                                          index.stops[positions])
+            # Several blocks per worker so that long series do not leave workers idle
+            blocks = balanced_blocks(eligible_index, 4 * n_jobs)
+            shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+            try:
+                np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    futures = [executor.submit(_series_models_worker, shm.name, matrix.shape,
+                                               eligible_index.starts[a:b],
+                                               eligible_index.stops[a:b],
+                                               test_size, model_params, keep_models)
+                               for a, b in blocks]
+                    results = [result for future in futures for result in future.result()]
+            finally:
+                shm.close()
+                shm.unlink()
+        else:
+            results = []
+            for i in positions:
+                block = matrix[index.starts[i]:index.stops[i]]
+                metrics, models = _fit_series_models(block[:, :-2], block[:, -2], block[:, -1],
+                                                     test_size, model_params)
+                results.append((metrics, models if keep_models else None))
+        
+        rows = []
+        for i, (metrics, models) in zip(positions, results):
+            rows.append(dict({group_col: index.countries[i]}, **metrics))
+            if models is not None:
+                self.series_models[index.countries[i]] = models
+        return pd.DataFrame(rows, columns=[group_col, 'n_train', 'n_test', 'cases_rmse',
+                                           'cases_r2', 'deaths_rmse', 'deaths_r2', 'seconds'])
+    
+    def _train_pooled(self, features, matrix, index, eligible, group_col, test_size, n_jobs):
+        """Fit one pair of forests on all eligible series with the series code as a feature."""
+        start = time.perf_counter()
+        codes, self.series_vocabulary = self._series_codes(features, group_col)
+        X = np.column_stack([matrix[:, :-2], codes])
+        
+        # Chronological split inside every series
+        lengths = index.lengths
+        split = index.starts + ((1 - test_size) * lengths).astype(np.int64)
+        series_id = np.repeat(np.arange(len(index)), lengths)
+        position = np.arange(len(matrix))
+        train = eligible[series_id] & (position < split[series_id])
+        test = eligible[series_id] & ~train
+        
+        model_params = dict(FORECAST_MODEL_PARAMS, n_jobs=resolve_n_jobs(n_jobs))
+        cases_model = RandomForestRegressor(**model_params).fit(X[train], matrix[train, -2])
+        deaths_model = RandomForestRegressor(**model_params).fit(X[train], matrix[train, -1])
+        self.pooled_models = (cases_model, deaths_model)
+        
+        cases_pred = cases_model.predict(X[test])
+        deaths_pred = deaths_model.predict(X[test])
+        seconds = time.perf_counter() - start
+        
+        rows = []
+        positions = np.flatnonzero(eligible)
+        test_ids = series_id[test]
+        y_cases, y_deaths = matrix[test, -2], matrix[test, -1]
+        bounds = np.searchsorted(test_ids, positions, side='left')
+        stops = np.searchsorted(test_ids, positions, side='right')
+        for i, a, b in zip(positions, bounds, stops):
+            rows.append(dict({group_col: index.countries[i],
+                              'n_train': int(split[i] - index.starts[i]),
+                              'n_test': int(b - a)},
+                             **_forecast_metrics(y_cases[a:b], cases_pred[a:b],
+                                                 y_deaths[a:b], deaths_pred[a:b])))
+        metrics = pd.DataFrame(rows, columns=[group_col, 'n_train', 'n_test', 'cases_rmse',
+                                              'cases_r2', 'deaths_rmse', 'deaths_r2'])
+        # One model for all series: its training time is shared equally
+        metrics['seconds'] = seconds / max(len(metrics), 1)
+        return metrics
+    
+    def forecast(self, history, horizon=28, group_col=None, date_col='Date_reported',
+                 n_iterations=2, unseen='unknown'):
+        """
+        Forecast the next ``horizon`` days of every series recursively.
+        
+        The last 14 days of each series are loaded into one NumPy array and
+        rolled forward one day at a time: every step builds the features of
+        the next day for all series at once, predicts it and writes the
+        prediction back, so later lags and rolling means use it. As the
+        rolling means of the features include the current day, each step
+        runs ``n_iterations`` fixed-point iterations starting from the
+        previous day's value.
+        
+        The pooled model (``train_batch(mode='pooled')``) predicts all series
+        in one call per step; without it, the trees of the kept per-series
+        models (``train_batch(keep_models=True)``) are stacked once and
+        walked for all series together, and otherwise the models fitted by
+        ``train`` are applied to every series in one call per step.
+        
+        Parameters:
+        -----------
+        history : pd.DataFrame
+            Daily data with ``date_col``, New_cases, New_deaths (and
+            ``group_col``); at least 14 consecutive days per series
+        horizon : int
+            Number of days to forecast
+        group_col : str, optional
+            Column identifying the series (one series if None)
+        date_col : str
+            Name of date column
+        n_iterations : int
+            Fixed-point iterations per step for the current-day rolling term
+        unseen : str
+            Series missing from the pooled model's vocabulary: 'unknown'
+            (predicted with the unknown code) or 'error'
+        
+        Returns:
+        --------
+        pd.DataFrame
+            ``horizon`` rows per series: group, date, New_cases_forecast and
+            New_deaths_forecast
+        """
+        keys = [group_col, date_col] if group_col else [date_col]
+        daily = history.groupby(keys, observed=True, sort=True)[FORECAST_TARGETS].sum()
+        daily = daily.reset_index()
+        if group_col:
+            index = CountryIndex.build(daily, key=group_col, region_col=None)
+            groups, starts, stops = index.countries, index.starts, index.stops
+        else:
+            groups, starts, stops = np.array([None]), np.array([0]), np.array([len(daily)])
+        if (stops - starts).min() < FORECAST_HISTORY:
+            raise ValueError(f"Every series needs at least {FORECAST_HISTORY} days of history")
+        
+        # (series, day, target) state: the last FORECAST_HISTORY days, then the forecasts
+        n_series = len(groups)
+        tail = (stops[:, None] - FORECAST_HISTORY + np.arange(FORECAST_HISTORY)).ravel()
+        values = np.empty((n_series, FORECAST_HISTORY + horizon, 2), dtype=np.float64)
+        values[:, :FORECAST_HISTORY] = daily[FORECAST_TARGETS].to_numpy(
+            dtype=np.float64)[tail].reshape(n_series, FORECAST_HISTORY, 2)
+        
+        last_dates = daily[date_col].to_numpy()[stops - 1]
+        dates = last_dates[:, None] + np.arange(1, horizon + 1) * np.timedelta64(1, 'D')
+        start_date = self.start_date if self.start_date is not None else daily[date_col].min()
+        calendar = _calendar_features(dates.ravel(), start_date).reshape(n_series, horizon, -1)
+        
+        predict_step = self._forecast_predictor(groups, group_col, unseen)
+        for h in range(horizon):
+            step = FORECAST_HISTORY + h
+            guess = values[:, step - 1, :]
+            for _ in range(max(n_iterations, 1)):
+                X = np.column_stack([calendar[:, h, :], _lag_features(values, step, guess)])
+                guess = predict_step(X)
+            values[:, step, :] = guess
+        
+        forecasts = pd.DataFrame({
+            date_col: dates.ravel(),
+            'New_cases_forecast': values[:, FORECAST_HISTORY:, 0].ravel(),
+            'New_deaths_forecast': values[:, FORECAST_HISTORY:, 1].ravel()
+        })
+        if group_col:
+            forecasts.insert(0, group_col, np.repeat(groups, horizon))
+        return forecasts
+    
+    def backtest(self, data, n_folds=5, horizon=28, window='expanding', train_days=None,
+                 step=None, group_col=None, date_col='Date_reported', n_jobs=None,
+                 cache_dir=None):
+        """
+        Walk-forward backtest of the forecasting models.
+        
+        The feature matrix is built once and shared with ``n_jobs`` worker
+        processes through shared memory. Every fold trains fresh cases and
+        deaths forests on the days before its cutoff and scores the next
+        ``horizon`` days, like the held-out slice in ``train``. The last fold
+        ends on the last day of the data and earlier cutoffs move back by
+        ``step`` days.
+        
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Daily data with ``date_col``, New_cases and New_deaths (one
+            ordered series if ``group_col`` is None, as for ``train``)
+        n_folds : int
+            Number of folds
+        horizon : int
+            Days in each test window
+        window : str
+            'expanding' (train on all earlier days) or 'sliding' (train on
+            the ``train_days`` days before the cutoff)
+        train_days : int, optional
+            Training window of 'sliding' (defaults to the history available
+            to the first fold)
+        step : int, optional
+            Days between cutoffs (defaults to ``horizon``)
+        group_col : str, optional
+            Backtest a pooled model over all series of this column (with the
+            series code as a feature) instead of a single series
+        date_col : str
+            Name of date column
+        n_jobs : int, optional
+            Worker processes (None: 1, negative: all CPUs)
+        cache_dir : str, optional
+            Directory of the on-disk feature column cache (no caching if None)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            One row per fold: dates of the windows, n_train, n_test, RMSE,
+            R² and MAPE (%) for cases and deaths, fit and total seconds
+        """
+        if window not in BACKTEST_WINDOWS:
+            raise ValueError(f"window must be one of {BACKTEST_WINDOWS}")
+        step = step or horizon
+        
+        if group_col:
+            features = self.prepare_series(data, group_col, date_col, cache_dir=cache_dir)
+            codes, _ = self._series_codes(features, group_col)
+            X = np.column_stack([features[self.FEATURE_COLUMNS].to_numpy(dtype=np.float64),
+                                 codes])
+        else:
+            features = self.create_time_features(data, date_col, cache_dir=cache_dir)
+            features = features.dropna(subset=self.FEATURE_COLUMNS)
+            X = features[self.FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        
+        # Features, day number and targets in one matrix shared by every fold
+        dates = pd.DatetimeIndex(features[date_col])
+        first_date = dates.min()
+        days = (dates - first_date).days.to_numpy(dtype=np.float64)
+        matrix = np.ascontiguousarray(np.column_stack(
+            [X, days, features[FORECAST_TARGETS].to_numpy(dtype=np.float64)]))
+        n_features = X.shape[1]
+        
+        last_day = int(days.max())
+        test_starts = [last_day + 1 - horizon - step * i for i in range(n_folds)][::-1]
+        if test_starts[0] < horizon:
+            raise ValueError(f"Not enough history for {n_folds} folds of {horizon} days "
+                             f"every {step} days")
+        if train_days is None:
+            train_days = test_starts[0]
+        folds = [(0 if window == 'expanding' else max(start - train_days, 0),
+                  start, start + horizon) for start in test_starts]
+        
+        print(f"🔁 Walk-forward backtest: {n_folds} {window} folds, {horizon}-day horizon, "
+              f"{len(matrix):,} feature rows")
+        
+        start = time.perf_counter()
+        model_params = dict(FORECAST_MODEL_PARAMS, n_jobs=1)
+        n_jobs = min(resolve_n_jobs(n_jobs), n_folds)
+        if n_jobs > 1:
+            shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+            try:
+                np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    # Largest training sets first; one fold per task
+                    order = sorted(range(n_folds), key=lambda i: folds[i][0] - folds[i][1])
+                    futures = {i: executor.submit(_backtest_fold_worker, shm.name, matrix.shape,
+                                                  n_features, [folds[i]], model_params)
+                               for i in order}
+                    scores = [futures[i].result()[0] for i in range(n_folds)]
+            finally:
+                shm.close()
+                shm.unlink()
+        else:
+            scores = [_fit_backtest_fold(matrix, n_features, *fold, model_params)
+                      for fold in folds]
+        seconds = time.perf_counter() - start
+        
+        day = pd.Timedelta(days=1)
+        rows = [dict({'fold': i + 1,
+                      'train_start': first_date + train_start * day,
+                      'test_start': first_date + test_start * day,
+                      'test_end': first_date + (test_end - 1) * day}, **fold_scores)
+                for i, ((train_start, test_start, test_end), fold_scores)
+                in enumerate(zip(folds, scores))]
+        results = pd.DataFrame(rows)
+        
+        print(f"✅ {n_folds} folds in {seconds:.1f}s ({n_jobs} worker(s))")
+        for target in ('cases', 'deaths'):
+            rmse, r2 = results[f'{target}_rmse'], results[f'{target}_r2']
+            print(f"  {target.capitalize()} - RMSE: {rmse.mean():,.0f} ± {rmse.std():,.0f}, "
+                  f"R²: {r2.mean():.3f} ± {r2.std():.3f}, "
+                  f"MAPE: {results[f'{target}_mape'].mean():.1f}%")
+        
+        return results
+    
+    def _series_codes(self, features, group_col):
+        """Codes of ``group_col`` from the vocabulary store, adding (and saving) new series."""
+        encoded, vocabularies = encode_with_vocabulary(features[[group_col]], [group_col],
+                                                       self.vocabulary_path)
+        return encoded[f'{group_col}_encoded'].to_numpy(), vocabularies[group_col]
+    
+    def _forecast_predictor(self, groups, group_col, unseen='unknown'):
+        """Return a function mapping step features (n_series, n_features) to (n_series, 2)."""
+        if group_col and self.pooled_models is not None:
+            cases_model, deaths_model = self.pooled_models
+            codes = self.series_vocabulary.transform(pd.Series(groups, dtype=object),
+                                                     unseen=unseen).astype(np.float64)
+            
+            def predict_pooled(X):
+                X = np.column_stack([X, codes])
+                return np.column_stack([cases_model.predict(X), deaths_model.predict(X)])
+            return predict_pooled
+        
+        if group_col and self.series_models:
+            missing = [g for g in groups if g not in self.series_models]
+            if missing:
+                raise ValueError(f"No per-series model for {len(missing)} series, "
+                                 f"e.g. {missing[0]}")
+            # Cases forests of every series, then deaths forests, each reading its own row
+            stacked = _stack_forests([self.series_models[g][0] for g in groups]
+                                     + [self.series_models[g][1] for g in groups])
+            rows = np.tile(np.arange(len(groups)), 2)
+            
+            def predict_per_series(X):
+                return _predict_stacked(stacked, X, rows).reshape(2, -1).T
+            return predict_per_series
+        
+        if not hasattr(self.cases_model, 'estimators_'):
+            raise ValueError("No fitted forecasting model; run train or train_batch first")
+        
+        def predict_global(X):
+            return np.column_stack([self.cases_model.predict(X), self.deaths_model.predict(X)])
+        return predict_global
 
 
 class OutbreakPredictor:
@@ -199,6 +1108,10 @@ class OutbreakPredictor:
     Ensemble model for predicting outbreak risk levels.
     """
     
+    FEATURE_COLUMNS = ['New_cases', 'New_deaths', 'Cumulative_cases', 'Cumulative_deaths',
+                       'Case_Fatality_Rate', 'New_cases_7day_avg', 'New_deaths_7day_avg',
+                       'WHO_region_encoded', 'Month', 'Year']
+    
     def __init__(self):
         self.scaler = StandardScaler()
         self.ensemble_model = None
@@ -221,22 +1134,33 @@ class OutbreakPredictor:
             Data with risk labels
         """
         df_risk = data.copy()
+        df_risk['Outbreak_Risk'] = outbreak_risk_levels(df_risk[growth_col])
+        return df_risk
+    
+    def prepare_features(self, data, cache_dir=None):
+        """
+        Build the feature matrix and risk labels, computing only missing columns.
         
-        # Calculate percentiles
-        growth_p75 = df_risk[growth_col].quantile(0.75)
-        growth_p90 = df_risk[growth_col].quantile(0.90)
-        
-        # Define risk levels
-        conditions = [
-            (df_risk[growth_col] <= growth_p75),
-            (df_risk[growth_col] > growth_p75) & (df_risk[growth_col] <= growth_p90),
-            (df_risk[growth_col] > growth_p90)
-        ]
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Cleaned dataset grouped by Country and ordered by date, with or
+            without engineered features
+        cache_dir : str, optional
+            Directory of the on-disk feature column cache (no caching if None)
         
-        risk_levels = ['Low', 'Medium', 'High']
-        df_risk['Outbreak_Risk'] = np.select(conditions, risk_levels, default='Low')
+        Returns:
+        --------
+        tuple
+            (X, y) with FEATURE_COLUMNS and Outbreak_Risk labels
+        """
+        wanted = self.FEATURE_COLUMNS + ['Outbreak_Risk']
+        missing = [col for col in wanted if col not in data.columns]
+        if missing:
+            data = compute_features(data, missing, cache_dir=cache_dir)
         
-        return df_risk
+        self.feature_cols = list(self.FEATURE_COLUMNS)
+        return data[self.feature_cols].fillna(0), data['Outbreak_Risk']
     
     def train(self, X, y, test_size=0.2):
         """
@@ -13,12 +13,75 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
 import warnings
 warnings.filterwarnings('ignore')
 
+from .cleaning import clean_frame
+from .data_cache import load_cached_frame
+from .dtype_optimizer import optimize_dtypes
+from .feature_engine import add_series_features
+from .phase_calendar import assign_pandemic_phase
+from .storage import DEFAULT_PARTITION_COLS, output_path_for, write_dataset
+from .streaming import (iter_csv_chunks, map_partitions, print_representativeness,
+                        stratified_reservoir_sample)
+from .validation import summarize_anomalies
+from .vocabulary import encode_with_vocabulary
 
-def load_covid_data_optimized(file_path, sample_size=None, random_state=42):
+
+SAMPLE_CHUNK_SIZE = 100000
+
+
+def parse_who_csv(file_path):
+    """
+    Parse the raw WHO CSV into a typed DataFrame.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the CSV file
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Parsed dataset with categorical text columns and integer counts
+    """
+    # Define data types to optimize memory usage (avoid int types due to NA values)
+    dtype_dict = {
+        'Country_code': 'category',
+        'Country': 'category', 
+        'WHO_region': 'category'
+        # Note: Keeping numeric columns as default to handle NA values
+    }
+    
+    # Load the full dataset with optimized dtypes
+    df = pd.read_csv(file_path, dtype=dtype_dict, parse_dates=['Date_reported'])
+    
+    # Convert numeric columns after loading to handle NA values properly
+    numeric_cols = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')  # Convert NA to NaN
+            df[col] = df[col].fillna(0).astype('int64')  # Fill NaN with 0 and convert to int
+    
+    return df
+
+
+def _finish_sample(sample_df, region_counts, columns):
+    """Report a drawn sample and restrict it to the requested columns."""
+    print(f"✅ Sample created! Shape: {sample_df.shape}")
+    print(f"💾 Sample memory usage: {sample_df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    
+    # Verify sample representativeness
+    print_representativeness(region_counts, sample_df)
+    
+    if columns is not None:
+        sample_df = sample_df[list(columns)]
+    return sample_df
+
+
+def load_covid_data_optimized(file_path, sample_size=None, random_state=42,
+                              use_cache=True, columns=None, cache_dir=None,
+                              stratify_by_year=False, optimize_memory=True):
     """
     Load COVID-19 dataset with memory optimization and optional sampling.
     
@@ -30,69 +93,72 @@ def load_covid_data_optimized(file_path, sample_size=None, random_state=42):
         Number of rows to sample for faster processing
     random_state : int
         Random state for reproducible sampling
+    use_cache : bool
+        Read through the columnar cache (see ``src.data_cache``)
+    columns : list, optional
+        Columns to return (all columns if None)
+    cache_dir : str, optional
+        Cache directory (defaults to ``.covid_cache`` next to the source)
+    stratify_by_year : bool
+        Stratify the sample by WHO region and year instead of region only
+    optimize_memory : bool
+        Downcast columns with ``optimize_dtypes`` after loading
     
     Returns:
     --------
     pd.DataFrame
-        Loaded dataset (full or sampled)
+        Loaded dataset (full or sampled), or None if the file does not exist
+        (other errors are raised after printing them, as in ``load_covid_data``)
     """
     print("🔄 Loading COVID-19 dataset...")
     
     try:
-        # First, get basic info about the dataset
-        df_info = pd.read_csv(file_path, nrows=5)
-        print(f"📊 Dataset columns: {list(df_info.columns)}")
+        # The sampler also needs its stratification columns
+        read_columns = columns
+        if columns is not None and sample_size:
+            strata_cols = ['WHO_region'] + (['Date_reported'] if stratify_by_year else [])
+            read_columns = list(columns) + [c for c in strata_cols if c not in columns]
         
-        # Define data types to optimize memory usage (avoid int types due to NA values)
-        dtype_dict = {
-            'Country_code': 'category',
-            'Country': 'category', 
-            'WHO_region': 'category'
-            # Note: Keeping numeric columns as default to handle NA values
-        }
+        # Stream CSV chunks straight into the sampler when there is no cache
+        if sample_size and not use_cache:
+            print(f"🎯 Streaming representative sample of {sample_size:,} rows...")
+            sample_df, region_counts = stratified_reservoir_sample(
+                iter_csv_chunks(file_path, usecols=read_columns), sample_size,
+                random_state=random_state, stratify_by_year=stratify_by_year)
+            if optimize_memory:
+                sample_df = optimize_dtypes(sample_df, label='sample')
+            return _finish_sample(sample_df, region_counts, columns)
         
-        # Load the full dataset with optimized dtypes
-        df = pd.read_csv(file_path, dtype=dtype_dict, parse_dates=['Date_reported'])
+        if use_cache:
+            df, cache_hit = load_cached_frame(file_path, parse_who_csv, variant='typed',
+                                              columns=read_columns, cache_dir=cache_dir)
+            if cache_hit:
+                print("⚡ Loaded from columnar cache")
+        else:
+            df = parse_who_csv(file_path)
+            if read_columns is not None:
+                df = df[list(read_columns)]
         
-        # Convert numeric columns after loading to handle NA values properly
-        numeric_cols = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')  # Convert NA to NaN
-                df[col] = df[col].fillna(0).astype('int64')  # Fill NaN with 0 and convert to int
+        print(f"📊 Dataset columns: {list(df.columns)}")
         print(f"✅ Full dataset loaded! Shape: {df.shape}")
+        if optimize_memory:
+            df = optimize_dtypes(df, label='load')
         print(f"💾 Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
         
         # Create sample if requested
         if sample_size and sample_size < len(df):
             print(f"🎯 Creating representative sample of {sample_size:,} rows...")
             
-            # Stratified sampling by WHO region to maintain representation
-            sample_df = df.groupby('WHO_region').apply(
-                lambda x: x.sample(min(len(x), sample_size // df['WHO_region'].nunique()), 
-                                 random_state=random_state)
-            ).reset_index(drop=True)
-            
-            # Ensure we get close to requested sample size
-            if len(sample_df) < sample_size:
-                additional_needed = sample_size - len(sample_df)
-                remaining_df = df[~df.index.isin(sample_df.index)]
-                additional_sample = remaining_df.sample(min(additional_needed, len(remaining_df)), 
-                                                      random_state=random_state)
-                sample_df = pd.concat([sample_df, additional_sample]).reset_index(drop=True)
-            
-            print(f"✅ Sample created! Shape: {sample_df.shape}")
-            print(f"💾 Sample memory usage: {sample_df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-            
-            # Verify sample representativeness
-            print("\n📊 Sample representativeness check:")
-            for region in df['WHO_region'].unique():
-                original_pct = (df['WHO_region'] == region).mean() * 100
-                sample_pct = (sample_df['WHO_region'] == region).mean() * 100
-                print(f"  {region}: Original {original_pct:.1f}% → Sample {sample_pct:.1f}%")
-            
-            return sample_df
+            # Single pass over the cached frame in chunks, stratified by WHO region
+            chunks = (df.iloc[start:start + SAMPLE_CHUNK_SIZE]
+                      for start in range(0, len(df), SAMPLE_CHUNK_SIZE))
+            sample_df, region_counts = stratified_reservoir_sample(
+                chunks, sample_size, random_state=random_state,
+                stratify_by_year=stratify_by_year)
+            return _finish_sample(sample_df, region_counts, columns)
         
+        if columns is not None:
+            df = df[list(columns)]
         return df
         
     except FileNotFoundError:
@@ -100,182 +166,172 @@ def load_covid_data_optimized(file_path, sample_size=None, random_state=42):
         return None
     except Exception as e:
         print(f"❌ Error loading dataset: {e}")
-        return None
+        raise
+
+
+def _silent(*args, **kwargs):
+    """Stand-in for ``print`` when progress output is off."""
 
 
-def clean_data_optimized(df):
+def clean_data_optimized(df, optimize_memory=True, repair_policy=None, conflict_policy=None,
+                         inplace=False, verbose=True):
     """
     Optimized data cleaning for large datasets.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        Raw dataset
+    df : pd.DataFrame or iterator
+        Raw dataset, or an iterator of (key, partition) pairs such as
+        ``src.streaming.stream_covid_partitions``
+    optimize_memory : bool
+        Downcast columns with ``optimize_dtypes`` after cleaning
+    repair_policy : str, optional
+        Cumulative repair policy passed to ``validate_cumulative_consistency``
+        ('flag', 'clip' or 'redistribute'; detect only if None)
+    conflict_policy : str, optional
+        Deduplicate by (Country_code, Date_reported), resolving conflicting
+        revisions with 'latest', 'max' or 'error' (see
+        ``src.cleaning.resolve_key_conflicts``); full-row deduplication if None
+    inplace : bool
+        Clean ``df`` itself, keeping its row order (see ``src.cleaning.clean_frame``)
+    verbose : bool
+        Print progress (partitions are always processed silently)
     
     Returns:
     --------
-    pd.DataFrame
-        Cleaned dataset
+    pd.DataFrame or generator
+        Cleaned dataset, or a generator of cleaned (key, partition) pairs
     """
-    print("🧹 Starting optimized data cleaning...")
-    
-    df_clean = df.copy()
-    original_shape = df_clean.shape
-    
-    # 1. Standardize column names (if needed)
-    df_clean.columns = df_clean.columns.str.strip().str.replace(' ', '_')
-    
-    # 2. Handle missing values efficiently
-    print("  🔧 Handling missing values...")
-    numerical_cols = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
-    
-    for col in numerical_cols:
-        if col in df_clean.columns:
-            missing_count = df_clean[col].isna().sum()
-            if missing_count > 0:
-                df_clean[col] = df_clean[col].fillna(0)
-                print(f"    - {col}: {missing_count:,} missing values filled with 0")
-    
-    # 3. Remove duplicates
-    print("  🔧 Removing duplicates...")
-    duplicates_before = len(df_clean)
-    df_clean = df_clean.drop_duplicates()
-    duplicates_removed = duplicates_before - len(df_clean)
-    print(f"    - Removed {duplicates_removed:,} duplicate rows")
-    
-    # 4. Data validation and cleaning
-    print("  🔧 Data validation...")
-    
-    # Remove rows with negative values (data errors)
-    for col in numerical_cols:
-        if col in df_clean.columns:
-            negative_count = (df_clean[col] < 0).sum()
-            if negative_count > 0:
-                df_clean = df_clean[df_clean[col] >= 0]
-                print(f"    - Removed {negative_count:,} rows with negative {col}")
-    
-    # Ensure cumulative values are non-decreasing within countries
-    print("  🔧 Validating cumulative data consistency...")
-    df_clean = df_clean.sort_values(['Country', 'Date_reported'])
-    
-    print(f"✅ Data cleaning completed!")
-    print(f"📊 Shape: {original_shape} → {df_clean.shape}")
-    print(f"💾 Memory usage: {df_clean.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    if not isinstance(df, pd.DataFrame):
+        return map_partitions(clean_data_optimized, df, optimize_memory=optimize_memory,
+                              repair_policy=repair_policy, conflict_policy=conflict_policy,
+                              inplace=inplace, verbose=False)
+    
+    log = print if verbose else _silent
+    log("🧹 Starting optimized data cleaning...")
+    original_shape = df.shape
+    
+    # Column names, missing values, duplicates, cumulative validation and
+    # negative values in one pass (see src.cleaning)
+    df_clean, report = clean_frame(df, drop_negative=True, validate=True,
+                                   repair_policy=repair_policy, conflict_policy=conflict_policy,
+                                   inplace=inplace)
+    
+    log("  🔧 Handling missing values...")
+    for col, filled in report['filled'].items():
+        if filled > 0:
+            log(f"    - {col}: {filled:,} missing values filled with 0")
+    
+    log("  🔧 Removing duplicates...")
+    log(f"    - Removed {report['removed'].get('duplicates', 0):,} duplicate rows")
+    if report['conflicts'] is not None and len(report['conflicts']):
+        log(f"    - Resolved {len(report['conflicts']):,} conflicting keys "
+            f"('{conflict_policy}' policy)")
+    
+    log("  🔧 Validating cumulative data consistency...")
+    for row in summarize_anomalies(report['anomalies']).itertuples(index=False):
+        log(f"    - {row.metric} {row.anomaly}: {row.rows:,} rows in {row.countries:,} countries")
+    if repair_policy is not None and len(report['anomalies']):
+        log(f"    - Applied '{repair_policy}' repair policy")
+    
+    log("  🔧 Data validation...")
+    for rule, removed in report['removed'].items():
+        if rule.startswith('negative_') and removed > 0:
+            log(f"    - Removed {removed:,} rows with negative {rule[len('negative_'):]}")
+    
+    log(f"✅ Data cleaning completed!")
+    log(f"📊 Shape: {original_shape} → {df_clean.shape}")
+    if optimize_memory:
+        df_clean = optimize_dtypes(df_clean, inplace=inplace, report=verbose,
+                                   label='clean')
+    if verbose:
+        print(f"💾 Memory usage: {df_clean.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
     
     return df_clean
 
 
-def create_features_optimized(df, chunk_size=50000):
+def create_features_optimized(df, chunk_size=50000, optimize_memory=True, phase_calendar=None,
+                              n_jobs=None, verbose=True):
     """
     Optimized feature engineering with chunked processing for large datasets.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        Cleaned dataset
+    df : pd.DataFrame or iterator
+        Cleaned dataset, or an iterator of cleaned (key, partition) pairs
     chunk_size : int
         Size of chunks for memory-efficient processing
+    optimize_memory : bool
+        Downcast columns with ``optimize_dtypes`` after feature engineering
+    phase_calendar : PhaseCalendar, dict or str, optional
+        Pandemic phase calendar, config or JSON path (see ``src.phase_calendar``)
+    n_jobs : int, optional
+        Worker processes for the growth/rolling features (None or 1: in-process,
+        -1: all CPUs)
+    verbose : bool
+        Print progress (partitions are always processed silently)
     
     Returns:
     --------
-    pd.DataFrame
-        Dataset with engineered features
+    pd.DataFrame or generator
+        Dataset with engineered features, or a generator of (key, partition) pairs
     """
-    print("🔧 Starting optimized feature engineering...")
+    if not isinstance(df, pd.DataFrame):
+        return map_partitions(create_features_optimized, df, chunk_size=chunk_size,
+                              optimize_memory=optimize_memory, phase_calendar=phase_calendar,
+                              n_jobs=n_jobs, verbose=False)
+    
+    log = print if verbose else _silent
+    log("🔧 Starting optimized feature engineering...")
     
     df_features = df.copy()
     
     # 1. Basic date features (vectorized operations)
-    print("  📅 Creating date-based features...")
+    log("  📅 Creating date-based features...")
     df_features['Year'] = df_features['Date_reported'].dt.year.astype('int16')
     df_features['Month'] = df_features['Date_reported'].dt.month.astype('int8')
     df_features['Day_of_week'] = df_features['Date_reported'].dt.dayofweek.astype('int8')
     df_features['Week_of_year'] = df_features['Date_reported'].dt.isocalendar().week.astype('int8')
     
     # 2. Case Fatality Rate (vectorized)
-    print("  💀 Calculating Case Fatality Rate...")
+    log("  💀 Calculating Case Fatality Rate...")
     df_features['Case_Fatality_Rate'] = np.where(
         df_features['Cumulative_cases'] > 0,
         (df_features['Cumulative_deaths'] / df_features['Cumulative_cases']) * 100,
         0
     ).astype('float32')
     
-    # 3. Growth rates (chunked processing by country)
-    print("  📈 Calculating growth rates...")
-    df_features = df_features.sort_values(['Country', 'Date_reported'])
-    
-    # Process in chunks to manage memory
-    growth_rates_cases = []
-    growth_rates_deaths = []
-    
-    for country in df_features['Country'].unique():
-        country_data = df_features[df_features['Country'] == country].copy()
-        
-        # Calculate growth rates
-        country_data['Cases_Growth_Rate'] = country_data['Cumulative_cases'].pct_change() * 100
-        country_data['Deaths_Growth_Rate'] = country_data['Cumulative_deaths'].pct_change() * 100
-        
-        growth_rates_cases.extend(country_data['Cases_Growth_Rate'].fillna(0).tolist())
-        growth_rates_deaths.extend(country_data['Deaths_Growth_Rate'].fillna(0).tolist())
-    
-    df_features['Cases_Growth_Rate'] = pd.Series(growth_rates_cases, dtype='float32')
-    df_features['Deaths_Growth_Rate'] = pd.Series(growth_rates_deaths, dtype='float32')
-    
-    # 4. Rolling averages (memory efficient)
-    print("  📊 Calculating rolling averages...")
-    df_features = df_features.sort_values(['Country', 'Date_reported'])
-    
-    rolling_cases = []
-    rolling_deaths = []
-    
-    for country in df_features['Country'].unique():
-        country_data = df_features[df_features['Country'] == country]
-        
-        rolling_cases.extend(
-            country_data['New_cases'].rolling(7, min_periods=1).mean().fillna(0).tolist()
-        )
-        rolling_deaths.extend(
-            country_data['New_deaths'].rolling(7, min_periods=1).mean().fillna(0).tolist()
-        )
-    
-    df_features['New_cases_7day_avg'] = pd.Series(rolling_cases, dtype='float32')
-    df_features['New_deaths_7day_avg'] = pd.Series(rolling_deaths, dtype='float32')
+    # 3-4. Growth rates and rolling averages (one vectorized pass over all countries)
+    log("  📈 Calculating growth rates and rolling averages...")
+    df_features = add_series_features(df_features, float_dtype='float32', fill_value=0,
+                                      n_jobs=n_jobs)
     
     # 5. Pandemic phases (optimized)
-    print("  🦠 Assigning pandemic phases...")
-    
-    def get_pandemic_phase_optimized(date):
-        """Optimized pandemic phase assignment."""
-        if date < pd.Timestamp('2020-06-01'):
-            return 'Early_Phase'
-        elif date < pd.Timestamp('2021-01-01'):
-            return 'First_Wave'
-        elif date < pd.Timestamp('2022-01-01'):
-            return 'Vaccination_Phase'
-        else:
-            return 'Endemic_Phase'
+    log("  🦠 Assigning pandemic phases...")
     
-    df_features['Pandemic_Phase'] = df_features['Date_reported'].apply(
-        get_pandemic_phase_optimized
-    ).astype('category')
+    df_features['Pandemic_Phase'] = assign_pandemic_phase(df_features, phase_calendar)
     
-    print("✅ Feature engineering completed!")
-    print(f"📊 Final shape: {df_features.shape}")
-    print(f"💾 Memory usage: {df_features.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    log("✅ Feature engineering completed!")
+    log(f"📊 Final shape: {df_features.shape}")
+    if optimize_memory:
+        df_features = optimize_dtypes(df_features, report=verbose, label='features')
+    if verbose:
+        print(f"💾 Memory usage: {df_features.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
     
     # Display created features
     new_features = ['Year', 'Month', 'Day_of_week', 'Week_of_year', 'Case_Fatality_Rate', 
                     'Cases_Growth_Rate', 'Deaths_Growth_Rate', 'New_cases_7day_avg', 
                     'New_deaths_7day_avg', 'Pandemic_Phase']
     
-    print("📋 Created features:")
+    log("📋 Created features:")
     for feature in new_features:
-        print(f"  ✓ {feature}")
+        log(f"  ✓ {feature}")
     
     return df_features
 
 
-def prepare_modeling_data_optimized(df, sample_for_modeling=100000):
+def prepare_modeling_data_optimized(df, sample_for_modeling=100000, optimize_memory=True,
+                                    vocabulary_path=None, unseen='add'):
     """
     Prepare optimized modeling dataset.
     
@@ -285,11 +341,17 @@ def prepare_modeling_data_optimized(df, sample_for_modeling=100000):
         Feature-engineered dataset
     sample_for_modeling : int
         Sample size for modeling (to handle memory constraints)
+    optimize_memory : bool
+        Downcast columns with ``optimize_dtypes`` after encoding
+    vocabulary_path : str, optional
+        JSON vocabulary store keeping codes stable across runs (see ``src.vocabulary``)
+    unseen : str
+        Policy for values missing from the vocabulary: 'add', 'unknown' or 'error'
     
     Returns:
     --------
-    pd.DataFrame
-        Modeling-ready dataset
+    tuple
+        (modeling-ready dataset, {variable: CategoryVocabulary})
     """
     print("🤖 Preparing modeling data...")
     
@@ -320,24 +382,23 @@ def prepare_modeling_data_optimized(df, sample_for_modeling=100000):
     
     # Encode categorical variables
     print("  🔤 Encoding categorical variables...")
-    label_encoders = {}
     categorical_vars = ['Country', 'WHO_region', 'Pandemic_Phase']
-    
-    for var in categorical_vars:
-        if var in modeling_data.columns:
-            le = LabelEncoder()
-            modeling_data[f'{var}_encoded'] = le.fit_transform(modeling_data[var])
-            label_encoders[var] = le
-            print(f"    ✓ {var}: {len(le.classes_)} categories")
+    modeling_data, label_encoders = encode_with_vocabulary(
+        modeling_data, categorical_vars, vocabulary_path=vocabulary_path, unseen=unseen)
+    for var, vocabulary in label_encoders.items():
+        print(f"    ✓ {var}: {len(vocabulary)} categories")
     
     print(f"✅ Modeling data prepared!")
     print(f"📊 Final shape: {modeling_data.shape}")
+    if optimize_memory:
+        modeling_data = optimize_dtypes(modeling_data, label='modeling')
     print(f"💾 Memory usage: {modeling_data.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
     
     return modeling_data, label_encoders
 
 
-def save_processed_data(df, output_dir='../data/processed', filename='covid19_processed.csv'):
+def save_processed_data(df, output_dir='../data/processed', filename='covid19_processed.csv',
+                        file_format='csv', partition_cols=DEFAULT_PARTITION_COLS, n_workers=None):
     """
     Save processed data with memory optimization.
     
@@ -348,18 +409,28 @@ def save_processed_data(df, output_dir='../data/processed', filename='covid19_pr
     output_dir : str
         Output directory
     filename : str
-        Output filename
+        Output filename (its extension is replaced for formats other than 'csv')
+    file_format : str
+        'csv' (gzip), 'csv.zst', 'feather' or 'parquet' (partitioned dataset)
+    partition_cols : tuple
+        Partition columns for the 'parquet' format
+    n_workers : int, optional
+        Number of parallel partition writers for the 'parquet' format
+    
+    Returns:
+    --------
+    str
+        Path of the written file or dataset directory
     """
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, filename)
+    output_path = output_path_for(output_dir, filename, file_format)
     
-    print(f"💾 Saving processed data to {output_path}...")
+    print(f"💾 Saving processed data to {output_path} ({file_format})...")
     
-    # Save with compression to reduce file size
-    df.to_csv(output_path, index=False, compression='gzip')
+    size_bytes = write_dataset(df, output_path, file_format,
+                               partition_cols=partition_cols, n_workers=n_workers)
     
-    file_size = os.path.getsize(output_path) / 1024**2
-    print(f"✅ Data saved successfully! File size: {file_size:.2f} MB")
+    print(f"✅ Data saved successfully! File size: {size_bytes / 1024**2:.2f} MB")
     
     return output_path
 
@@ -390,4 +461,4 @@ if __name__ == "__main__":
         print("\n✅ All preprocessing completed successfully!")
         print(f"📊 Final dataset ready for analysis: {modeling_data.shape}")
     else:
-        print("❌ Failed to load dataset. Please check the file path.")
\ No newline at end of file
+        print(f"❌ Dataset not found at {data_path}. Please check the file path.")
\ No newline at end of file
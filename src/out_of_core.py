@@ -0,0 +1,158 @@
+"""
+Out-of-Core Preprocessing Pipeline for COVID-19 Data
+====================================================
+
+This module runs the clean → features → modeling-prep chain on datasets that
+do not fit in memory. Country blocks are streamed from the raw CSV (spilling
+to disk above the row budget), cleaned and feature-engineered one block at a
+time, and written in batches to a partitioned Parquet store. The modeling
+sample is drawn from the same stream with the stratified reservoir sampler.
+
+Rows held in memory are bounded by ``max_rows`` (input buffers and the write
+batch) plus ``sample_for_modeling`` (the modeling reservoir), independently
+of the size of the dataset. A single country must fit in the budget.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .optimized_preprocessing import (clean_data_optimized, create_features_optimized,
+                                      prepare_modeling_data_optimized)
+from .storage import DEFAULT_PARTITION_COLS, PartitionedParquetWriter, output_path_for
+from .streaming import stratified_reservoir_sample, stream_covid_partitions
+
+
+CRITICAL_COLUMNS = ['Cases_Growth_Rate', 'Deaths_Growth_Rate', 'Case_Fatality_Rate']
+
+
+def iter_feature_blocks(file_path, max_rows=200000, chunk_size=None, repair_policy=None,
+                        phase_calendar=None, spill_dir=None):
+    """
+    Stream cleaned, feature-engineered country blocks from the raw CSV.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the raw WHO CSV file
+    max_rows : int
+        Ceiling for raw rows buffered in memory before spilling to disk
+    chunk_size : int, optional
+        CSV rows parsed per chunk (defaults to a quarter of ``max_rows``)
+    repair_policy : str, optional
+        Cumulative repair policy (see ``src.validation``)
+    phase_calendar : PhaseCalendar, dict or str, optional
+        Pandemic phase calendar (see ``src.phase_calendar``)
+    spill_dir : str, optional
+        Directory for spill files
+
+    Yields:
+    -------
+    tuple
+        (country, feature_dataframe)
+    """
+    chunk_size = chunk_size or max(max_rows // 4, 1)
+    partitions = stream_covid_partitions(file_path, 'Country', chunk_size=chunk_size,
+                                         max_memory_mb=float('inf'), spill_dir=spill_dir,
+                                         max_rows=max_rows)
+    cleaned = clean_data_optimized(partitions, optimize_memory=False,
+                                   repair_policy=repair_policy)
+    for country, block in create_features_optimized(cleaned, optimize_memory=False,
+                                                    phase_calendar=phase_calendar):
+        if len(block) > max_rows:
+            raise ValueError(f"Country '{country}' has {len(block):,} rows, more than "
+                             f"max_rows={max_rows:,}")
+        yield country, block
+
+
+def run_out_of_core_pipeline(file_path, output_dir='../data/processed',
+                             dataset_name='covid19_features', max_rows=200000, chunk_size=None,
+                             partition_cols=DEFAULT_PARTITION_COLS, sample_for_modeling=100000,
+                             repair_policy=None, phase_calendar=None, random_state=42,
+                             spill_dir=None):
+    """
+    Run clean → features → modeling-prep with a bounded number of rows in memory.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the raw WHO CSV file
+    output_dir : str
+        Output directory of the feature store
+    dataset_name : str
+        Name of the partitioned Parquet dataset inside ``output_dir``
+    max_rows : int
+        Row budget, split between input buffers and the write batch
+    chunk_size : int, optional
+        CSV rows parsed per chunk
+    partition_cols : tuple
+        Partition columns of the feature store
+    sample_for_modeling : int
+        Size of the stratified modeling sample
+    repair_policy : str, optional
+        Cumulative repair policy (see ``src.validation``)
+    phase_calendar : PhaseCalendar, dict or str, optional
+        Pandemic phase calendar (see ``src.phase_calendar``)
+    random_state : int
+        Seed of the modeling sample
+    spill_dir : str, optional
+        Directory for spill files
+
+    Returns:
+    --------
+    tuple
+        (dataset_path, modeling_data, label_encoders)
+    """
+    print(f"🌊 Running out-of-core pipeline on {file_path} (max {max_rows:,} rows in memory)...")
+
+    dataset_path = output_path_for(output_dir, dataset_name, 'parquet')
+    batch_rows = max(max_rows // 2, 1)
+    blocks = iter_feature_blocks(file_path, max_rows=batch_rows, chunk_size=chunk_size,
+                                 repair_policy=repair_policy, phase_calendar=phase_calendar,
+                                 spill_dir=spill_dir)
+    stats = {'countries': 0, 'rows': 0, 'batches': 0}
+
+    def flush(writer, pending):
+        batch = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+        writer.write(batch)
+        stats['batches'] += 1
+        print(f"  💾 Batch {stats['batches']}: {len(batch):,} rows "
+              f"({stats['countries']:,} countries, {stats['rows']:,} rows so far)")
+
+        # Only rows usable for modeling enter the reservoir
+        finite = np.isfinite(batch[CRITICAL_COLUMNS].to_numpy(dtype=np.float64)).all(axis=1)
+        return batch[finite]
+
+    def modeling_candidates(writer):
+        pending, pending_rows = [], 0
+        for _, block in blocks:
+            if pending and pending_rows + len(block) > batch_rows:
+                yield flush(writer, pending)
+                pending, pending_rows = [], 0
+            pending.append(block)
+            pending_rows += len(block)
+            stats['countries'] += 1
+            stats['rows'] += len(block)
+        if pending:
+            yield flush(writer, pending)
+
+    os.makedirs(output_dir, exist_ok=True)
+    with PartitionedParquetWriter(dataset_path, partition_cols) as writer:
+        sample_df, _ = stratified_reservoir_sample(modeling_candidates(writer),
+                                                   sample_for_modeling, random_state)
+
+    print(f"✅ Feature store written to {dataset_path}: {stats['rows']:,} rows, "
+          f"{stats['countries']:,} countries, {stats['batches']:,} batches")
+
+    modeling_data, label_encoders = prepare_modeling_data_optimized(
+        sample_df, sample_for_modeling=sample_for_modeling)
+    return dataset_path, modeling_data, label_encoders
+
+
+if __name__ == "__main__":
+    print("COVID-19 Out-of-Core Preprocessing Module")
+    print("This module processes country blocks from disk with a bounded row budget.")
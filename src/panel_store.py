@@ -0,0 +1,312 @@
+"""
+Panel Store Module for COVID-19 Analysis
+========================================
+
+This module stores the cleaned WHO dataset as a dense, memory-mapped
+(country, date, metric) array with country and date index sidecars.
+
+Countries are ordered by WHO region and then by name, so every region is a
+contiguous block of the array. Selections by country, region or date range
+are therefore plain NumPy views of the memory-mapped file, and rolling, lag
+and growth computations run as array operations along the date axis.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+PANEL_METRICS = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+
+DATA_FILE = 'panel.dat'
+COUNTRIES_FILE = 'countries.csv'
+DATES_FILE = 'dates.npy'
+META_FILE = 'meta.json'
+
+
+class COVIDPanel:
+    """
+    Dense memory-mapped country x date x metric panel.
+    """
+
+    def __init__(self, data, countries, dates, metrics):
+        self.data = data
+        self.countries = countries
+        self.dates = dates
+        self.metrics = list(metrics)
+
+        self._country_pos = pd.Index(countries['Country'])
+        self._metric_pos = {metric: i for i, metric in enumerate(self.metrics)}
+
+        regions = countries['WHO_region'].to_numpy()
+        self._region_bounds = {}
+        for region in pd.unique(regions):
+            positions = np.flatnonzero(regions == region)
+            self._region_bounds[region] = (positions[0], positions[-1] + 1)
+
+    @classmethod
+    def build(cls, df, path, metrics=None, dtype='float64'):
+        """
+        Build a panel store on disk from a cleaned dataset.
+
+        Missing (country, date) cells are stored as NaN. If a country reports
+        the same date twice, the last row wins.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Cleaned dataset with Date_reported, Country, Country_code and WHO_region
+        path : str
+            Output directory for the panel files
+        metrics : list, optional
+            Metric columns to store (defaults to the four WHO count columns)
+        dtype : str
+            Floating point dtype of the panel array
+
+        Returns:
+        --------
+        COVIDPanel
+            Panel opened read-only on the written files
+        """
+        metrics = list(metrics or PANEL_METRICS)
+        os.makedirs(path, exist_ok=True)
+
+        countries = (
+            df[['Country', 'Country_code', 'WHO_region']]
+            .astype(str)
+            .drop_duplicates('Country', keep='last')
+            .sort_values(['WHO_region', 'Country'])
+            .reset_index(drop=True)
+        )
+        dates = np.sort(pd.unique(df['Date_reported'].to_numpy().astype('datetime64[D]')))
+
+        country_idx = pd.Index(countries['Country']).get_indexer(df['Country'].astype(str))
+        date_idx = np.searchsorted(dates, df['Date_reported'].to_numpy().astype('datetime64[D]'))
+
+        shape = (len(countries), len(dates), len(metrics))
+        data = np.memmap(os.path.join(path, DATA_FILE), dtype=dtype, mode='w+', shape=shape)
+        data[:] = np.nan
+        data[country_idx, date_idx, :] = df[metrics].to_numpy(dtype=dtype)
+        data.flush()
+        del data
+
+        countries.to_csv(os.path.join(path, COUNTRIES_FILE), index=False)
+        np.save(os.path.join(path, DATES_FILE), dates)
+        with open(os.path.join(path, META_FILE), 'w') as f:
+            json.dump({'shape': list(shape), 'dtype': np.dtype(dtype).str, 'metrics': metrics}, f)
+
+        print(f"✅ Panel store built at {path}: {shape[0]} countries × "
+              f"{shape[1]} dates × {shape[2]} metrics")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """
+        Open an existing panel store.
+
+        Parameters:
+        -----------
+        path : str
+            Directory containing the panel files
+        mode : str
+            ``np.memmap`` mode ('r' for read-only, 'r+' for read-write)
+
+        Returns:
+        --------
+        COVIDPanel
+            Panel backed by the memory-mapped array
+        """
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+
+        data = np.memmap(os.path.join(path, DATA_FILE), dtype=np.dtype(meta['dtype']),
+                         mode=mode, shape=tuple(meta['shape']))
+        countries = pd.read_csv(os.path.join(path, COUNTRIES_FILE), dtype=str,
+                                keep_default_na=False)
+        dates = np.load(os.path.join(path, DATES_FILE))
+
+        return cls(data, countries, dates, meta['metrics'])
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def country_slice(self, country):
+        """Return the country index range (slice) for a single country."""
+        pos = self._country_pos.get_loc(country)
+        return slice(pos, pos + 1)
+
+    def region_slice(self, region):
+        """Return the contiguous country index range (slice) for a WHO region."""
+        start, stop = self._region_bounds[region]
+        return slice(start, stop)
+
+    def date_slice(self, start=None, end=None):
+        """Return the date index range (slice) for an inclusive date interval."""
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, 'D'), 'left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(end, 'D'), 'right')
+        return slice(lo, hi)
+
+    def metric_index(self, metric):
+        """Return the position of a metric along the last axis."""
+        return self._metric_pos[metric]
+
+    def select(self, country=None, region=None, start=None, end=None, metric=None):
+        """
+        Select a zero-copy view of the panel.
+
+        Parameters:
+        -----------
+        country : str, optional
+            Single country name
+        region : str, optional
+            WHO region code (ignored if ``country`` is given)
+        start, end : str or datetime-like, optional
+            Inclusive date range
+        metric : str, optional
+            Single metric; the metric axis is dropped when given
+
+        Returns:
+        --------
+        np.ndarray
+            View of shape (countries, dates[, metrics])
+        """
+        if country is not None:
+            rows = self.country_slice(country)
+        elif region is not None:
+            rows = self.region_slice(region)
+        else:
+            rows = slice(None)
+
+        cols = self.date_slice(start, end)
+        if metric is None:
+            return self.data[rows, cols, :]
+        return self.data[rows, cols, self.metric_index(metric)]
+
+    def rolling_mean(self, metric, window=7, min_periods=1):
+        """
+        Trailing rolling mean along the date axis for every country at once.
+
+        Missing cells are skipped, so the window averages the observed values.
+
+        Parameters:
+        -----------
+        metric : str
+            Metric to average
+        window : int
+            Window length in date steps
+        min_periods : int
+            Minimum number of observations required for a value
+
+        Returns:
+        --------
+        np.ndarray
+            Array of shape (countries, dates)
+        """
+        values = self.select(metric=metric)
+        observed = ~np.isnan(values)
+
+        sums = np.cumsum(np.where(observed, values, 0.0), axis=1)
+        counts = np.cumsum(observed, axis=1)
+        sums[:, window:] = sums[:, window:] - sums[:, :-window]
+        counts[:, window:] = counts[:, window:] - counts[:, :-window]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = sums / counts
+        result[counts < min_periods] = np.nan
+        return result
+
+    def lag(self, metric, periods=1):
+        """
+        Shift a metric forward along the date axis for every country.
+
+        Parameters:
+        -----------
+        metric : str
+            Metric to shift
+        periods : int
+            Number of date steps to shift by
+
+        Returns:
+        --------
+        np.ndarray
+            Array of shape (countries, dates) with NaN in the first ``periods`` dates
+        """
+        values = self.select(metric=metric)
+        result = np.full(values.shape, np.nan)
+        if periods < values.shape[1]:
+            result[:, periods:] = values[:, :values.shape[1] - periods]
+        return result
+
+    def growth_rate(self, metric, periods=1):
+        """
+        Percentage change of a metric along the date axis for every country.
+
+        Parameters:
+        -----------
+        metric : str
+            Metric to compare
+        periods : int
+            Number of date steps between compared values
+
+        Returns:
+        --------
+        np.ndarray
+            Array of shape (countries, dates); inf where the previous value is 0
+        """
+        values = self.select(metric=metric)
+        previous = self.lag(metric, periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (values - previous) / previous * 100
+
+    def to_frame(self, country=None, region=None, start=None, end=None, dropna=True):
+        """
+        Convert a selection back to the long (row per country-date) format.
+
+        Parameters:
+        -----------
+        country, region, start, end
+            Selection arguments, as in ``select``
+        dropna : bool
+            Drop (country, date) cells that were missing in the source data
+
+        Returns:
+        --------
+        pd.DataFrame
+            Long-format dataset sorted by Country and Date_reported
+        """
+        if country is not None:
+            rows = self.country_slice(country)
+        elif region is not None:
+            rows = self.region_slice(region)
+        else:
+            rows = slice(None)
+        cols = self.date_slice(start, end)
+
+        block = self.data[rows, cols, :]
+        n_countries, n_dates, n_metrics = block.shape
+        countries = self.countries.iloc[rows]
+
+        df = pd.DataFrame({
+            'Date_reported': np.tile(self.dates[cols].astype('datetime64[ns]'), n_countries),
+            'Country_code': np.repeat(countries['Country_code'].to_numpy(), n_dates),
+            'Country': np.repeat(countries['Country'].to_numpy(), n_dates),
+            'WHO_region': np.repeat(countries['WHO_region'].to_numpy(), n_dates),
+        })
+        flat = block.reshape(n_countries * n_dates, n_metrics)
+        for i, metric in enumerate(self.metrics):
+            df[metric] = flat[:, i]
+
+        if dropna:
+            df = df[~np.isnan(flat).all(axis=1)]
+        return df.sort_values(['Country', 'Date_reported']).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print("COVID-19 Panel Store Module")
+    print("This module provides a memory-mapped country × date × metric panel.")
@@ -0,0 +1,167 @@
+"""
+Pandemic Phase Calendar Module for COVID-19 Analysis
+====================================================
+
+A phase calendar is an ordered list of breakpoint dates plus one label per
+interval: dates before the first breakpoint get the first label, dates on or
+after the last breakpoint get the last label. Phases are assigned with
+``np.searchsorted`` over datetime64 values and returned as a categorical, so
+no Python function runs per row.
+
+Calendars can be loaded from a JSON config and may override the default
+breakpoints for individual WHO regions:
+
+{
+    "breakpoints": ["2020-06-01", "2021-01-01", "2022-01-01"],
+    "labels": ["Early_Phase", "First_Wave", "Vaccination_Phase", "Endemic_Phase"],
+    "regions": {
+        "WPR": {"breakpoints": ["2020-04-01", "2021-03-01", "2022-06-01"]}
+    }
+}
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+
+class PhaseCalendar:
+    """
+    Ordered phase breakpoints and labels, with optional per-region calendars.
+    """
+
+    def __init__(self, breakpoints, labels, regions=None):
+        self.breakpoints = np.array(pd.to_datetime(list(breakpoints)), dtype='datetime64[ns]')
+        self.labels = list(labels)
+
+        if len(self.labels) != len(self.breakpoints) + 1:
+            raise ValueError(f"A calendar with {len(self.breakpoints)} breakpoints needs "
+                             f"{len(self.breakpoints) + 1} labels, got {len(self.labels)}")
+        if np.any(np.diff(self.breakpoints) <= np.timedelta64(0)):
+            raise ValueError("Phase breakpoints must be strictly increasing")
+
+        self.regions = {}
+        for region, calendar in (regions or {}).items():
+            if not isinstance(calendar, PhaseCalendar):
+                calendar = PhaseCalendar(calendar['breakpoints'],
+                                         calendar.get('labels', self.labels))
+            self.regions[region] = calendar
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a calendar from a config dictionary or a JSON file path.
+
+        Parameters:
+        -----------
+        config : dict or str
+            Dictionary with 'breakpoints', 'labels' and optional 'regions',
+            or path to a JSON file with that content
+
+        Returns:
+        --------
+        PhaseCalendar
+            Configured calendar
+        """
+        if isinstance(config, str):
+            with open(config) as f:
+                config = json.load(f)
+        return cls(config['breakpoints'], config['labels'], config.get('regions'))
+
+    def to_config(self):
+        """Return the calendar as a JSON-serialisable dictionary."""
+        def dates(calendar):
+            return [str(pd.Timestamp(d).date()) for d in calendar.breakpoints]
+
+        config = {'breakpoints': dates(self), 'labels': self.labels}
+        if self.regions:
+            config['regions'] = {region: {'breakpoints': dates(cal), 'labels': cal.labels}
+                                 for region, cal in self.regions.items()}
+        return config
+
+    @property
+    def categories(self):
+        """All labels of the default and regional calendars, in first-seen order."""
+        categories = list(self.labels)
+        for calendar in self.regions.values():
+            categories.extend(label for label in calendar.labels if label not in categories)
+        return categories
+
+    def _codes(self, dates, categories):
+        positions = np.searchsorted(self.breakpoints, dates, side='right')
+        label_codes = np.array([categories.index(label) for label in self.labels])
+        return label_codes[positions]
+
+    def assign(self, dates, regions=None):
+        """
+        Assign a phase to every date.
+
+        Parameters:
+        -----------
+        dates : array-like of datetime
+            Report dates
+        regions : array-like, optional
+            WHO region of every date, used to pick regional calendars
+
+        Returns:
+        --------
+        pd.Categorical
+            Phase labels (NaN for missing dates)
+        """
+        values = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+        categories = self.categories
+        codes = self._codes(values, categories)
+
+        if regions is not None and self.regions:
+            regions = np.asarray(regions, dtype=object)
+            for region, calendar in self.regions.items():
+                mask = regions == region
+                if mask.any():
+                    codes[mask] = calendar._codes(values[mask], categories)
+
+        codes[np.isnat(values)] = -1
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+
+DEFAULT_PHASE_CALENDAR = PhaseCalendar(
+    breakpoints=['2020-06-01', '2021-01-01', '2022-01-01'],
+    labels=['Early_Phase', 'First_Wave', 'Vaccination_Phase', 'Endemic_Phase']
+)
+
+
+def assign_pandemic_phase(df, calendar=None, date_col='Date_reported', region_col='WHO_region'):
+    """
+    Return the Pandemic_Phase column for a dataset.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset with a date column
+    calendar : PhaseCalendar, dict or str, optional
+        Calendar, config dictionary or JSON path (defaults to DEFAULT_PHASE_CALENDAR)
+    date_col : str
+        Name of the date column
+    region_col : str
+        Name of the region column used by regional calendars
+
+    Returns:
+    --------
+    pd.Categorical
+        Phase labels aligned with the rows of ``df``
+    """
+    if calendar is None:
+        calendar = DEFAULT_PHASE_CALENDAR
+    elif not isinstance(calendar, PhaseCalendar):
+        calendar = PhaseCalendar.from_config(calendar)
+
+    regions = df[region_col].to_numpy() if calendar.regions and region_col in df.columns else None
+    return calendar.assign(df[date_col], regions)
+
+
+if __name__ == "__main__":
+    print("COVID-19 Pandemic Phase Calendar Module")
+    print("This module assigns pandemic phases with vectorized date lookups.")
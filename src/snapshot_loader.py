@@ -0,0 +1,163 @@
+"""
+Multi-Snapshot Loading Module for COVID-19 Analysis
+===================================================
+
+WHO republishes the full daily dataset with every release, and historical
+snapshots are compared to study data revisions. This module parses several
+snapshot files in parallel worker processes and tags every row with the
+date of the snapshot it came from.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .data_cache import load_cached_frame
+from .optimized_preprocessing import parse_who_csv
+from .streaming import TEXT_COLUMNS
+
+
+SNAPSHOT_DATE_PATTERN = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+
+def resolve_snapshot_paths(paths):
+    """
+    Expand a glob pattern or a list of paths/patterns into sorted file paths.
+
+    Parameters:
+    -----------
+    paths : str or list
+        Glob pattern, single path, or list of either
+
+    Returns:
+    --------
+    list
+        Sorted, de-duplicated file paths
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    resolved = []
+    for pattern in paths:
+        matches = glob.glob(pattern)
+        resolved.extend(matches if matches else [pattern])
+    return sorted(set(resolved))
+
+
+def snapshot_date(file_path, df=None):
+    """
+    Determine the snapshot date of a file.
+
+    The date is taken from the file name (``YYYY-MM-DD`` or ``YYYYMMDD``) and
+    falls back to the latest Date_reported in the data.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the snapshot file
+    df : pd.DataFrame, optional
+        Parsed snapshot used for the fallback
+
+    Returns:
+    --------
+    pd.Timestamp
+        Snapshot date
+    """
+    match = SNAPSHOT_DATE_PATTERN.search(os.path.basename(file_path))
+    if match:
+        try:
+            return pd.Timestamp(f'{match.group(1)}-{match.group(2)}-{match.group(3)}')
+        except ValueError:
+            pass
+    if df is not None and 'Date_reported' in df.columns:
+        return pd.Timestamp(df['Date_reported'].max())
+    return pd.Timestamp(os.path.getmtime(file_path), unit='s').normalize()
+
+
+def _load_snapshot(file_path, use_cache):
+    """Worker: parse one snapshot and tag it with its snapshot date."""
+    if use_cache:
+        df, _ = load_cached_frame(file_path, parse_who_csv, variant='typed')
+    else:
+        df = parse_who_csv(file_path)
+    df['Snapshot_date'] = snapshot_date(file_path, df)
+    return df
+
+
+def load_snapshots(paths, n_workers=None, combine=True, deduplicate=True, use_cache=False):
+    """
+    Load several WHO snapshot files in parallel worker processes.
+
+    Parameters:
+    -----------
+    paths : str or list
+        Glob pattern or list of snapshot paths
+    n_workers : int, optional
+        Number of worker processes (defaults to ``os.cpu_count()``; 1 loads serially)
+    combine : bool
+        Return one combined frame instead of a per-snapshot dictionary (which
+        raises a ValueError if two files have the same snapshot date)
+    deduplicate : bool
+        In the combined frame, keep a row only for the first snapshot that
+        published it with those values, so that later rows are revisions
+    use_cache : bool
+        Read each snapshot through the columnar cache
+
+    Returns:
+    --------
+    pd.DataFrame or dict
+        Combined frame with a Snapshot_date column, or {snapshot_date: frame}
+    """
+    file_paths = resolve_snapshot_paths(paths)
+    if not file_paths:
+        raise FileNotFoundError(f"No snapshot files match {paths}")
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(file_paths))
+    print(f"🔄 Loading {len(file_paths)} snapshots with {n_workers} worker(s)...")
+
+    if n_workers == 1:
+        frames = [_load_snapshot(path, use_cache) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            frames = list(executor.map(_load_snapshot, file_paths,
+                                       [use_cache] * len(file_paths)))
+
+    if not combine:
+        snapshots = {}
+        sources = {}
+        for path, frame in zip(file_paths, frames):
+            date = frame['Snapshot_date'].iloc[0]
+            if date in snapshots:
+                raise ValueError(f"Snapshots {sources[date]} and {path} have the same "
+                                 f"snapshot date {date.date()}")
+            snapshots[date] = frame
+            sources[date] = path
+        print(f"✅ Loaded {len(snapshots)} snapshots")
+        return snapshots
+
+    combined = pd.concat(frames, ignore_index=True)
+    for col in TEXT_COLUMNS:
+        if col in combined.columns:
+            combined[col] = combined[col].astype('category')
+
+    if deduplicate:
+        before = len(combined)
+        data_cols = [col for col in combined.columns if col != 'Snapshot_date']
+        combined = (combined.sort_values('Snapshot_date', kind='mergesort')
+                    .drop_duplicates(subset=data_cols, keep='first')
+                    .reset_index(drop=True))
+        print(f"  🔧 Removed {before - len(combined):,} rows repeated across snapshots")
+
+    print(f"✅ Combined snapshots loaded! Shape: {combined.shape}")
+    return combined
+
+
+if __name__ == "__main__":
+    print("COVID-19 Multi-Snapshot Loading Module")
+    print("This module loads several WHO snapshot files in parallel.")
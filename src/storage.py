@@ -0,0 +1,304 @@
+"""
+Processed Data Storage Module for COVID-19 Analysis
+===================================================
+
+This module writes processed datasets in several output formats and reads
+them back:
+
+- 'csv'      : single gzip-compressed CSV (the original format)
+- 'csv.zst'  : single zstd-compressed CSV
+- 'feather'  : single uncompressed Feather (Arrow IPC) file
+- 'parquet'  : Parquet dataset partitioned by WHO_region/Year
+
+Parquet partitions are written in parallel and a ``_manifest.json`` file is
+written last, listing every partition file with its key values and row
+count. Readers use the manifest to open only the partitions they need.
+``PartitionedParquetWriter`` writes the same layout batch by batch.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+
+OUTPUT_FORMATS = ('csv', 'csv.zst', 'feather', 'parquet')
+DEFAULT_PARTITION_COLS = ('WHO_region', 'Year')
+MANIFEST_FILE = '_manifest.json'
+
+
+def output_path_for(output_dir, filename, file_format):
+    """
+    Return the output path of a dataset for a given format.
+
+    The 'csv' format keeps ``filename`` unchanged for backward compatibility;
+    the other formats replace its extension.
+
+    Parameters:
+    -----------
+    output_dir : str
+        Output directory
+    filename : str
+        Requested file name
+    file_format : str
+        One of OUTPUT_FORMATS
+
+    Returns:
+    --------
+    str
+        File path, or directory path for partitioned Parquet
+    """
+    if file_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{file_format}', expected one of {OUTPUT_FORMATS}")
+    if file_format == 'csv':
+        return os.path.join(output_dir, filename)
+
+    stem = filename.split('.')[0]
+    suffix = {'csv.zst': '.csv.zst', 'feather': '.feather', 'parquet': ''}[file_format]
+    return os.path.join(output_dir, stem + suffix)
+
+
+def _partition_dir(values):
+    return os.path.join(*[f'{col}={value}' for col, value in values.items()])
+
+
+class PartitionedParquetWriter:
+    """
+    Incremental writer of a partitioned Parquet dataset.
+
+    Every ``write`` call adds one ``part-<n>.parquet`` file to each partition
+    it touches, so datasets can be written batch by batch without holding
+    them in memory. ``close`` writes the manifest.
+    """
+
+    def __init__(self, dataset_dir, partition_cols=DEFAULT_PARTITION_COLS, n_workers=None,
+                 compression='zstd'):
+        self.dataset_dir = dataset_dir
+        self.partition_cols = list(partition_cols)
+        self.n_workers = n_workers
+        self.compression = compression
+        self.partitions = []
+        self.columns = None
+        self.batches = 0
+
+        os.makedirs(dataset_dir, exist_ok=True)
+        self.manifest_path = os.path.join(dataset_dir, MANIFEST_FILE)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def write(self, df):
+        """
+        Write one batch of rows.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Batch to write
+
+        Returns:
+        --------
+        int
+            Number of rows written
+        """
+        if 'Year' in self.partition_cols and 'Year' not in df.columns:
+            df = df.assign(Year=df['Date_reported'].dt.year)
+        if self.columns is None:
+            self.columns = {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+        part_name = f'part-{self.batches}.parquet'
+        self.batches += 1
+        groups = [(keys if isinstance(keys, tuple) else (keys,), group)
+                  for keys, group in df.groupby(self.partition_cols, observed=True, sort=True)]
+
+        def write_group(item):
+            keys, group = item
+            values = {col: (key.item() if hasattr(key, 'item') else key)
+                      for col, key in zip(self.partition_cols, keys)}
+            rel_path = os.path.join(_partition_dir(values), part_name)
+            path = os.path.join(self.dataset_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            group.to_parquet(path, index=False, compression=self.compression)
+            return {'path': rel_path, 'values': values, 'rows': len(group),
+                    'bytes': os.path.getsize(path)}
+
+        with ThreadPoolExecutor(max_workers=self.n_workers or os.cpu_count()) as executor:
+            self.partitions.extend(executor.map(write_group, groups))
+        return len(df)
+
+    def close(self):
+        """
+        Write the manifest and return it.
+
+        Returns:
+        --------
+        dict
+            The manifest that was written
+        """
+        manifest = {
+            'format': 'parquet',
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'partition_cols': self.partition_cols,
+            'columns': self.columns or {},
+            'rows': int(sum(p['rows'] for p in self.partitions)),
+            'partitions': self.partitions,
+        }
+
+        # The manifest is written last so that a complete manifest implies complete data
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+        return manifest
+
+
+def write_partitioned_parquet(df, dataset_dir, partition_cols=DEFAULT_PARTITION_COLS,
+                              n_workers=None, compression='zstd'):
+    """
+    Write a Parquet dataset partitioned by the given columns, plus a manifest.
+
+    ``Year`` is derived from Date_reported when it is a partition column but
+    not present in the frame.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset to write
+    dataset_dir : str
+        Output directory of the dataset
+    partition_cols : tuple
+        Partition columns, outermost first
+    n_workers : int, optional
+        Number of writer threads (defaults to ``os.cpu_count()``)
+    compression : str
+        Parquet compression codec
+
+    Returns:
+    --------
+    dict
+        The manifest that was written
+    """
+    writer = PartitionedParquetWriter(dataset_dir, partition_cols, n_workers, compression)
+    writer.write(df)
+    return writer.close()
+
+
+def read_manifest(dataset_dir):
+    """Read the manifest of a partitioned dataset."""
+    with open(os.path.join(dataset_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def write_dataset(df, output_path, file_format, partition_cols=DEFAULT_PARTITION_COLS,
+                  n_workers=None):
+    """
+    Write a dataset in one of the supported output formats.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset to write
+    output_path : str
+        Target path (see ``output_path_for``)
+    file_format : str
+        One of OUTPUT_FORMATS
+    partition_cols : tuple
+        Partition columns for the 'parquet' format
+    n_workers : int, optional
+        Number of writer threads for the 'parquet' format
+
+    Returns:
+    --------
+    int
+        Total size written, in bytes
+    """
+    if file_format == 'csv':
+        df.to_csv(output_path, index=False, compression='gzip')
+    elif file_format == 'csv.zst':
+        df.to_csv(output_path, index=False, compression='zstd')
+    elif file_format == 'feather':
+        df.reset_index(drop=True).to_feather(output_path, compression='uncompressed')
+    elif file_format == 'parquet':
+        manifest = write_partitioned_parquet(df, output_path, partition_cols, n_workers)
+        return sum(p['bytes'] for p in manifest['partitions'])
+    else:
+        raise ValueError(f"Unknown output format '{file_format}', expected one of {OUTPUT_FORMATS}")
+
+    return os.path.getsize(output_path)
+
+
+def load_processed_data(path, columns=None, filters=None):
+    """
+    Load a dataset written by ``save_processed_data``.
+
+    For partitioned Parquet datasets only the partitions matching ``filters``
+    are read, using the manifest instead of scanning the directory.
+
+    Parameters:
+    -----------
+    path : str
+        Dataset file, or directory of a partitioned Parquet dataset
+    columns : list, optional
+        Columns to read (all columns if None)
+    filters : dict, optional
+        Partition column -> allowed value or list of values,
+        e.g. ``{'WHO_region': ['AFR', 'EUR'], 'Year': 2021}``
+
+    Returns:
+    --------
+    pd.DataFrame
+        Loaded dataset
+    """
+    if os.path.isdir(path):
+        return _load_partitioned(path, columns, filters)
+
+    if path.endswith('.feather'):
+        return pd.read_feather(path, columns=columns)
+
+    compression = 'zstd' if path.endswith('.zst') else 'gzip'
+    df = pd.read_csv(path, usecols=columns, compression=compression)
+    if 'Date_reported' in df.columns:
+        df['Date_reported'] = pd.to_datetime(df['Date_reported'])
+    return df
+
+
+def _load_partitioned(dataset_dir, columns, filters):
+    manifest = read_manifest(dataset_dir)
+    filters = {col: set(v) if isinstance(v, (list, tuple, set)) else {v}
+               for col, v in (filters or {}).items()}
+
+    unknown = set(filters) - set(manifest['partition_cols'])
+    if unknown:
+        raise ValueError(f"Can only filter on partition columns {manifest['partition_cols']}, "
+                         f"got {sorted(unknown)}")
+
+    selected = [p for p in manifest['partitions']
+                if all(p['values'][col] in allowed for col, allowed in filters.items())]
+    if not selected:
+        return pd.DataFrame(columns=columns or list(manifest['columns']))
+
+    df = pd.concat([pd.read_parquet(os.path.join(dataset_dir, p['path']), columns=columns)
+                    for p in selected], ignore_index=True)
+
+    # Categories differ between partitions, so restore them after concatenation
+    for col, dtype in manifest['columns'].items():
+        if dtype == 'category' and col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+if __name__ == "__main__":
+    print("COVID-19 Processed Data Storage Module")
+    print("This module writes and reads partitioned, compressed processed datasets.")
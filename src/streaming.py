@@ -0,0 +1,390 @@
+"""
+Streaming Data Loading Module for Large COVID-19 Snapshots
+==========================================================
+
+This module reads the WHO CSV in chunks and yields complete per-country (or
+per-WHO_region) partitions, so that snapshots larger than memory can be
+processed on small workers.
+
+Rows are buffered per partition up to a configurable memory ceiling. When the
+ceiling is reached, buffered rows are spilled to temporary files on disk and
+read back only when their partition is emitted.
+
+The module also provides a single-pass stratified reservoir sampler that
+builds a per-WHO_region sample directly from CSV chunks, using memory
+proportional to the sample size.
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import itertools
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+TEXT_COLUMNS = ['Country_code', 'Country', 'WHO_region']
+NUMERIC_COLUMNS = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+
+
+def iter_csv_chunks(file_path, chunk_size=100000, usecols=None):
+    """
+    Read the WHO CSV in typed chunks.
+
+    Text columns are kept as strings (categories are assigned per partition),
+    dates are parsed and count columns are converted to int64 with NA as 0,
+    matching ``load_covid_data_optimized``.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the CSV file
+    chunk_size : int
+        Number of rows per chunk
+    usecols : list, optional
+        Columns to read (all columns if None)
+
+    Yields:
+    -------
+    pd.DataFrame
+        Typed chunk of the dataset
+    """
+    dtype_dict = {col: 'str' for col in TEXT_COLUMNS}
+    reader = pd.read_csv(file_path, dtype=dtype_dict, chunksize=chunk_size, usecols=usecols)
+
+    for chunk in reader:
+        if 'Date_reported' in chunk.columns:
+            chunk['Date_reported'] = pd.to_datetime(chunk['Date_reported'])
+        for col in NUMERIC_COLUMNS:
+            if col in chunk.columns:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').fillna(0).astype('int64')
+        yield chunk
+
+
+def _finalize_partition(frames, partition_by):
+    """Concatenate buffered frames, sort by date and restore categorical dtypes."""
+    partition = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    sort_cols = ['Date_reported'] if partition_by == 'Country' else ['Country', 'Date_reported']
+    partition = partition.sort_values(sort_cols, kind='mergesort').reset_index(drop=True)
+
+    for col in TEXT_COLUMNS:
+        if col in partition.columns:
+            partition[col] = partition[col].astype('category')
+
+    return partition
+
+
+def stream_covid_partitions(file_path, partition_by='Country', chunk_size=100000,
+                            max_memory_mb=256, assume_sorted=False, spill_dir=None,
+                            max_rows=None):
+    """
+    Stream complete per-country or per-region partitions from the WHO CSV.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the CSV file
+    partition_by : str
+        Partition column, 'Country' or 'WHO_region'
+    chunk_size : int
+        Number of CSV rows parsed per chunk
+    max_memory_mb : float
+        Ceiling for rows buffered in memory; above it buffers are spilled to disk
+    assume_sorted : bool
+        If the file is grouped by ``partition_by``, emit each partition as soon
+        as the next one starts instead of waiting for the end of the file
+    spill_dir : str, optional
+        Directory for spill files (a temporary directory if None)
+    max_rows : int, optional
+        Ceiling for the number of rows buffered in memory, applied on top of
+        ``max_memory_mb``
+
+    Yields:
+    -------
+    tuple
+        (partition_key, partition_dataframe), sorted by date within each country
+    """
+    if partition_by not in ('Country', 'WHO_region'):
+        raise ValueError("partition_by must be 'Country' or 'WHO_region'")
+
+    max_bytes = max_memory_mb * 1024**2
+    buffers = {}
+    buffer_bytes = 0
+    buffer_rows = 0
+    spilled = {}
+    # File numbers only increase, so a name is never reused after take_partition
+    spill_numbers = itertools.count()
+    work_dir = tempfile.mkdtemp(prefix='covid_spill_', dir=spill_dir)
+
+    def spill_all():
+        for key, frames in buffers.items():
+            if key not in spilled:
+                spilled[key] = os.path.join(work_dir, f'part_{next(spill_numbers)}.pkl')
+            path = spilled[key]
+            frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            with open(path, 'ab') as f:
+                pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        buffers.clear()
+
+    def take_partition(key):
+        frames = []
+        if key in spilled:
+            with open(spilled[key], 'rb') as f:
+                while True:
+                    try:
+                        frames.append(pickle.load(f))
+                    except EOFError:
+                        break
+            os.remove(spilled.pop(key))
+        frames.extend(buffers.pop(key, []))
+        return _finalize_partition(frames, partition_by)
+
+    try:
+        current_key = None
+        for chunk in iter_csv_chunks(file_path, chunk_size=chunk_size):
+            # Measured once per chunk; per-group memory_usage dominates with many partitions
+            row_bytes = chunk.memory_usage(deep=True).sum() / max(len(chunk), 1)
+            for key, group in chunk.groupby(partition_by, sort=False):
+                if assume_sorted and current_key is not None and key != current_key:
+                    if current_key in buffers or current_key in spilled:
+                        released = sum(len(f) for f in buffers.get(current_key, []))
+                        buffer_bytes -= released * row_bytes
+                        buffer_rows -= released
+                        yield current_key, take_partition(current_key)
+                current_key = key
+
+                buffers.setdefault(key, []).append(group)
+                buffer_bytes += len(group) * row_bytes
+                buffer_rows += len(group)
+
+            if buffer_bytes > max_bytes or (max_rows is not None and buffer_rows > max_rows):
+                spill_all()
+                buffer_bytes = 0
+                buffer_rows = 0
+
+        for key in sorted(set(buffers) | set(spilled)):
+            yield key, take_partition(key)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def map_partitions(func, partitions, **kwargs):
+    """
+    Lazily apply a frame-level stage to each (key, partition) pair.
+
+    Parameters:
+    -----------
+    func : callable
+        Stage taking a DataFrame (e.g. ``clean_data``), called with ``kwargs``
+    partitions : iterable
+        (key, partition) pairs such as ``stream_covid_partitions`` yields
+    **kwargs
+        Keyword arguments of ``func``
+
+    Yields:
+    -------
+    tuple
+        (partition_key, result of ``func``)
+    """
+    for key, partition in partitions:
+        yield key, func(partition, **kwargs)
+
+
+def print_representativeness(original_counts, sample_df, column='WHO_region'):
+    """
+    Print the share of each stratum in the original data and in the sample.
+
+    Parameters:
+    -----------
+    original_counts : pd.Series
+        Row counts per value of ``column`` in the original data
+    sample_df : pd.DataFrame
+        Sampled rows
+    column : str
+        Stratification column
+    """
+    total = original_counts.sum()
+    sample_shares = sample_df[column].value_counts(normalize=True)
+
+    print("\n📊 Sample representativeness check:")
+    for value, count in original_counts.items():
+        original_pct = count / total * 100
+        sample_pct = sample_shares.get(value, 0.0) * 100
+        print(f"  {value}: Original {original_pct:.1f}% → Sample {sample_pct:.1f}%")
+
+
+def _smallest_mask(keys, n):
+    """Boolean mask of the ``n`` smallest keys, selected with ``np.argpartition``."""
+    mask = np.zeros(len(keys), dtype=bool)
+    if n >= len(keys):
+        mask[:] = True
+    elif n > 0:
+        mask[np.argpartition(keys, n - 1)[:n]] = True
+    return mask
+
+
+def _stratum_codes(chunk, strata_cols, strata_seen):
+    """
+    Integer stratum code of every chunk row, stable across chunks.
+
+    ``strata_seen`` maps stratum tuples to codes and is extended with the
+    strata that appear for the first time.
+    """
+    combined = np.zeros(len(chunk), dtype=np.int64)
+    for col in strata_cols:
+        col_codes, uniques = pd.factorize(chunk[col])
+        combined = combined * (len(uniques) + 1) + col_codes + 1
+    local_codes, uniques = pd.factorize(combined)
+    first_rows = np.zeros(len(uniques), dtype=np.int64)
+    first_rows[local_codes[::-1]] = np.arange(len(chunk) - 1, -1, -1)
+    strata = chunk[strata_cols].iloc[first_rows].itertuples(index=False, name=None)
+    codes = np.array([strata_seen.setdefault(stratum, len(strata_seen)) for stratum in strata],
+                     dtype=np.int64)
+    return codes[local_codes]
+
+
+def _stratum_ranks(codes, keys):
+    """1-based rank of every key within its stratum code."""
+    order = np.lexsort((keys, codes))
+    sorted_codes = codes[order]
+    boundary = np.ones(len(codes), dtype=bool)
+    boundary[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    positions = np.arange(len(codes))
+    rank = np.empty(len(codes), dtype=np.int64)
+    rank[order] = positions - np.maximum.accumulate(np.where(boundary, positions, 0)) + 1
+    return rank
+
+
+def _entry_thresholds(pool, codes, n_strata, per_stratum, sample_size):
+    """
+    Largest key with which rows of the given stratum codes can still enter the reservoir.
+
+    A row enters if its key is below the ``per_stratum``-th smallest key of
+    its stratum or the ``sample_size``-th smallest key overall (infinite
+    while fewer rows have been kept).
+    """
+    keys = pool['_key'].to_numpy()
+    global_threshold = (np.partition(keys, sample_size - 1)[sample_size - 1]
+                        if len(keys) >= sample_size else np.inf)
+    stratum_threshold = np.full(n_strata, np.inf)
+    at_rank = pool['_rank'].to_numpy() == per_stratum
+    stratum_threshold[pool['_stratum'].to_numpy()[at_rank]] = keys[at_rank]
+    return np.maximum(stratum_threshold[codes], global_threshold)
+
+
+def _trim_reservoir(pool, per_stratum, sample_size):
+    """Keep the ``per_stratum`` smallest keys of every stratum and the ``sample_size`` smallest."""
+    keys = pool['_key'].to_numpy()
+    rank = _stratum_ranks(pool['_stratum'].to_numpy(), keys)
+    keep = (rank <= per_stratum) | _smallest_mask(keys, sample_size)
+    pool = pool[keep].reset_index(drop=True)
+    # Every stratum keeps all of its keys below a kept one, so the ranks stay exact
+    pool['_rank'] = rank[keep]
+    return pool
+
+
+def stratified_reservoir_sample(chunks, sample_size, random_state=42,
+                                stratify_by_year=False):
+    """
+    Draw a stratified sample from a stream of chunks in a single pass.
+
+    Every row receives a random key. For each stratum (WHO region, and
+    optionally year) the rows with the smallest keys are kept, which is a
+    uniform sample of that stratum; the per-stratum size shrinks to
+    ``sample_size // n_strata`` as new strata appear. A global reservoir of
+    the ``sample_size`` smallest keys is kept alongside to top the sample up
+    when some strata are smaller than their share. Chunk rows are compared
+    with the current entry thresholds first, and the reservoir is trimmed
+    with ``np.argpartition`` and per-stratum ranks instead of a full sort.
+
+    The sample has exactly ``min(sample_size, rows in the stream)`` rows. If
+    there are more strata than ``sample_size``, it holds one row from each
+    of ``sample_size`` strata.
+
+    At most ``2 * sample_size`` rows plus one chunk are held in memory.
+
+    Parameters:
+    -----------
+    chunks : iterable of pd.DataFrame
+        Data chunks, e.g. from ``iter_csv_chunks``
+    sample_size : int
+        Number of rows to sample
+    random_state : int
+        Seed of the random keys (results also depend on the chunk sizes)
+    stratify_by_year : bool
+        Stratify by (WHO_region, year of Date_reported) instead of WHO_region
+
+    Returns:
+    --------
+    tuple
+        (sample_dataframe, region_counts) where region_counts holds the number
+        of rows per WHO region in the full stream
+    """
+    rng = np.random.default_rng(random_state)
+    strata_cols = ['WHO_region', '_year'] if stratify_by_year else ['WHO_region']
+
+    pool = None
+    region_counts = pd.Series(dtype='int64')
+    strata_seen = {}
+    rows_seen = 0
+
+    for chunk in chunks:
+        chunk = chunk.reset_index(drop=True)
+        if isinstance(chunk['WHO_region'].dtype, pd.CategoricalDtype):
+            chunk['WHO_region'] = chunk['WHO_region'].astype(str)
+        if stratify_by_year:
+            chunk['_year'] = chunk['Date_reported'].dt.year
+        chunk['_key'] = rng.random(len(chunk))
+        chunk['_row'] = np.arange(rows_seen, rows_seen + len(chunk))
+        rows_seen += len(chunk)
+
+        region_counts = region_counts.add(chunk['WHO_region'].value_counts(), fill_value=0)
+
+        n_strata = len(strata_seen)
+        chunk['_stratum'] = _stratum_codes(chunk, strata_cols, strata_seen)
+        per_stratum = max(sample_size // len(strata_seen), 1)
+
+        if pool is not None:
+            entering = chunk['_key'].to_numpy() < _entry_thresholds(
+                pool, chunk['_stratum'].to_numpy(), len(strata_seen), per_stratum, sample_size)
+            if not entering.any() and len(strata_seen) == n_strata:
+                continue
+            chunk = pd.concat([pool, chunk[entering]], ignore_index=True)
+        pool = _trim_reservoir(chunk, per_stratum, sample_size)
+
+    if pool is None:
+        return pd.DataFrame(), region_counts.astype('int64')
+
+    per_stratum = max(sample_size // len(strata_seen), 1)
+    keys, rank = pool['_key'].to_numpy(), pool['_rank'].to_numpy()
+    stratified = rank <= per_stratum
+    if stratified.sum() > sample_size:
+        # More strata than rows to sample: lowest ranks first, then smallest keys
+        order = np.lexsort((keys, rank))
+        stratified[:] = False
+        stratified[order[:sample_size]] = True
+    shortfall = max(sample_size - stratified.sum(), 0)
+    rest = np.flatnonzero(~stratified)
+    stratified[rest[_smallest_mask(keys[rest], shortfall)]] = True
+
+    sample_df = (pool[stratified]
+                 .sort_values('_row')
+                 .drop(columns=['_key', '_row', '_rank', '_stratum']
+                       + (['_year'] if stratify_by_year else []))
+                 .reset_index(drop=True))
+    for col in TEXT_COLUMNS:
+        if col in sample_df.columns:
+            sample_df[col] = sample_df[col].astype('category')
+
+    return sample_df, region_counts.astype('int64')
+
+
+if __name__ == "__main__":
+    print("COVID-19 Streaming Data Loading Module")
+    print("This module yields per-country partitions with bounded memory usage.")
@@ -0,0 +1,307 @@
+"""
+Cumulative Consistency Validation Module for COVID-19 Data
+==========================================================
+
+WHO series contain retroactive corrections: cumulative totals that go down,
+daily counts that do not match the change in the cumulative total, and
+negative daily counts. This module detects all three for every country in
+one vectorized pass over the (Country, Date_reported)-sorted frame and can
+repair them with one of three policies:
+
+- 'flag'         : keep values, add boolean Cases_anomaly/Deaths_anomaly columns
+- 'clip'         : negative daily counts become 0 and cumulative totals are
+                   made non-decreasing with a running maximum per country
+- 'redistribute' : each negative daily count is removed proportionally from
+                   the earlier daily counts of the same country (what they
+                   cannot absorb is taken from the following days), then the
+                   cumulative total of every country with an anomaly is
+                   rebuilt from the daily counts. The country total is kept;
+                   countries whose negative counts exceed all their positive
+                   counts are left unchanged and reported as 'unrepaired'
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import numpy as np
+import pandas as pd
+
+from .country_index import CountryIndex, sort_by_country
+from .feature_engine import _segment_starts_per_row, segmented_shift
+
+
+METRIC_PAIRS = {'cases': ('New_cases', 'Cumulative_cases'),
+                'deaths': ('New_deaths', 'Cumulative_deaths')}
+REPAIR_POLICIES = ('flag', 'clip', 'redistribute')
+ANOMALY_COLUMNS = ['Country', 'Date_reported', 'metric', 'anomaly', 'value', 'expected']
+
+
+def _segmented_cummax(values, segment_ids):
+    """Running maximum within segments, using one global accumulate (NaNs are kept)."""
+    missing = np.isnan(values)
+    if missing.all():
+        return values.copy()
+    low = np.nanmin(values)
+    span = np.nanmax(values) - low + 1
+    # Lift every segment above all earlier ones so the running maximum restarts per segment
+    offset = segment_ids * span
+    result = np.maximum.accumulate(np.where(missing, 0, values - low) + offset) - offset + low
+    result[missing] = np.nan
+    return result
+
+
+def _segmented_cumsum(values, row_starts):
+    """Cumulative sum restarting at every segment start."""
+    totals = np.cumsum(values)
+    before = np.concatenate(([0.0], totals))[row_starts]
+    return totals - before
+
+
+def detect_cumulative_anomalies(df, row_starts, tolerance=0):
+    """
+    Detect cumulative inconsistencies in a country-sorted frame.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset sorted by Country and Date_reported
+    row_starts : np.ndarray
+        First row position of the country block of every row
+    tolerance : float
+        Accepted absolute difference between New_* and the cumulative change
+
+    Returns:
+    --------
+    tuple
+        (anomaly_table, masks) where masks maps metric -> boolean row mask
+    """
+    tables = []
+    masks = {}
+    countries = df['Country'].to_numpy()
+    dates = df['Date_reported'].to_numpy()
+
+    for metric, (new_col, cum_col) in METRIC_PAIRS.items():
+        if new_col not in df.columns or cum_col not in df.columns:
+            continue
+
+        new = df[new_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        cumulative = df[cum_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        previous = segmented_shift(cumulative, row_starts)
+        change = cumulative - previous
+
+        checks = {
+            'cumulative_decrease': (change < 0, cumulative, previous),
+            'new_mismatch': (np.abs(new - change) > tolerance, new, change),
+            'negative_new': (new < 0, new, np.zeros_like(new)),
+        }
+
+        metric_mask = np.zeros(len(df), dtype=bool)
+        for anomaly, (mask, value, expected) in checks.items():
+            rows = np.flatnonzero(mask)
+            metric_mask |= mask
+            if len(rows):
+                tables.append(pd.DataFrame({
+                    'Country': countries[rows], 'Date_reported': dates[rows],
+                    'metric': metric, 'anomaly': anomaly,
+                    'value': value[rows], 'expected': expected[rows]
+                }))
+        masks[metric] = metric_mask
+
+    if tables:
+        table = pd.concat(tables, ignore_index=True)
+        table = table.sort_values(['Country', 'Date_reported', 'metric'], kind='mergesort')
+        return table.reset_index(drop=True), masks
+    return pd.DataFrame(columns=ANOMALY_COLUMNS), masks
+
+
+def _row_starts_from_ids(segment_ids):
+    """First row position of the segment of every row, for contiguous segment ids."""
+    boundary = np.ones(len(segment_ids), dtype=bool)
+    boundary[1:] = segment_ids[1:] != segment_ids[:-1]
+    return np.maximum.accumulate(np.where(boundary, np.arange(len(segment_ids)), 0))
+
+
+def _reverse_segmented_cumsum(values, row_starts):
+    """Sum of the values after every row, within its segment."""
+    # row_starts doubles as a contiguous segment id, so reversing it gives reversed segments
+    reverse_starts = _row_starts_from_ids(row_starts[::-1])
+    return _segmented_cumsum(values[::-1], reverse_starts)[::-1] - values
+
+
+def _redistribute_negative(new, row_starts):
+    """
+    Remove negative daily counts from the other counts of the same segment.
+
+    Negative counts are handled in date order: each one is taken from the
+    positive counts before it (as left by earlier negatives) in proportion
+    to their size, as far as they can absorb it. The taken amounts follow
+    from a running minimum and the proportional scaling from a reverse
+    segmented sum of log factors; rounded cumulative shares keep integer
+    counts integer. Any deficit left over is carried forward and taken from
+    the following counts in order, so the segment total is kept.
+
+    Returns:
+    --------
+    tuple
+        (repaired counts, boolean row mask of segments whose negative counts
+        exceed all their positive counts; their counts are left unchanged)
+    """
+    negative = new < 0
+    positive = np.where(new > 0, new, 0.0)
+    owed = np.where(negative, -new, 0.0)
+    segment_ids = np.cumsum(row_starts == np.arange(len(new))) - 1
+
+    # Taken so far: taken[r] = min(taken[r-1] + owed[r], available[r]), solved as the
+    # owed cumulative sum plus the running minimum of (available - owed cumulative sum)
+    available = _segmented_cumsum(positive, row_starts) - positive
+    owed_sum = _segmented_cumsum(owed, row_starts)
+    slack = np.where(negative, available - owed_sum, available.max() + owed_sum.max() + 1)
+    taken = owed_sum + np.minimum(-_segmented_cummax(-slack, segment_ids), 0)
+    taken_before = np.nan_to_num(segmented_shift(taken, row_starts))
+    deficit = taken - taken_before
+
+    # Each negative keeps the share (1 - deficit / remaining) of every earlier count
+    remaining = available - taken_before
+    kept = 1 - np.divide(deficit, remaining, out=np.zeros_like(deficit), where=remaining > 0)
+    emptied = _reverse_segmented_cumsum((kept <= 0).astype(np.float64), row_starts) > 0
+    log_kept = np.log(np.where(kept > 0, kept, 1.0))
+    survival = np.where(emptied, 0.0, np.exp(_reverse_segmented_cumsum(log_kept, row_starts)))
+    shares = np.rint(_segmented_cumsum(positive * (1 - survival), row_starts))
+    removed = shares - np.nan_to_num(segmented_shift(shares, row_starts))
+
+    # Outstanding debt d[i] = max(d[i-1] + leftover[i] - left[i], 0), solved the same way
+    leftover = owed - deficit
+    net = _segmented_cumsum(leftover - (positive - removed), row_starts)
+    debt = net - np.minimum(-_segmented_cummax(-net, segment_ids), 0)
+    carried = np.nan_to_num(segmented_shift(debt, row_starts)) + leftover - debt
+
+    result = new - removed - carried
+    result[negative] = 0
+
+    last = np.append(row_starts[1:] != row_starts[:-1], True)
+    unrepaired = np.isin(segment_ids, segment_ids[last & (debt > 0.5)])
+    result[unrepaired] = new[unrepaired]
+    return result, unrepaired
+
+
+def _as_column_dtype(values, dtype):
+    """
+    Cast repaired float values back to an integer column dtype.
+
+    Rebuilt values can leave the range of a downcast column, in which case
+    the column is widened to 64 bits instead of wrapping around.
+    """
+    if not pd.api.types.is_integer_dtype(dtype):
+        return values
+    nullable = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+    info = np.iinfo(dtype.numpy_dtype if nullable else dtype)
+    finite = values[np.isfinite(values)]
+    if finite.size and (finite.min() < info.min or finite.max() > info.max):
+        dtype = 'Int64' if nullable else np.int64
+    if nullable:
+        return pd.array(values, dtype=dtype)
+    return values.astype(dtype, copy=False)
+
+
+def validate_cumulative_consistency(df, policy=None, tolerance=0):
+    """
+    Detect and optionally repair cumulative inconsistencies.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned dataset
+    policy : str, optional
+        None (detect only), 'flag', 'clip' or 'redistribute'
+    tolerance : float
+        Accepted absolute difference between New_* and the cumulative change
+
+    Returns:
+    --------
+    tuple
+        (dataset sorted by Country and Date_reported, anomaly table with
+        columns Country, Date_reported, metric, anomaly, value, expected;
+        with 'redistribute' it also lists the negative counts that could
+        not be repaired as 'unrepaired')
+    """
+    if policy is not None and policy not in REPAIR_POLICIES:
+        raise ValueError(f"Unknown repair policy '{policy}', expected one of {REPAIR_POLICIES}")
+
+    df_sorted = sort_by_country(df)
+    index = CountryIndex.build(df_sorted)
+    row_starts = _segment_starts_per_row(index.starts, index.lengths)
+    anomalies, masks = detect_cumulative_anomalies(df_sorted, row_starts, tolerance)
+
+    if policy is None or (anomalies.empty and policy != 'flag'):
+        return df_sorted, anomalies
+
+    if policy == 'flag':
+        for metric, mask in masks.items():
+            df_sorted[f'{metric.capitalize()}_anomaly'] = mask
+        return df_sorted, anomalies
+
+    segment_ids = index.segment_ids()
+    unrepaired_tables = []
+    for metric, (new_col, cum_col) in METRIC_PAIRS.items():
+        if metric not in masks or not masks[metric].any():
+            continue
+
+        new = df_sorted[new_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        cumulative = df_sorted[cum_col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        if policy == 'clip':
+            new = np.clip(new, 0, None)
+            cumulative = _segmented_cummax(cumulative, segment_ids)
+        else:
+            # Rebuild only the countries with an anomaly; consistent ones stay untouched
+            affected = np.isin(segment_ids, segment_ids[masks[metric]])
+            rows = np.flatnonzero(affected)
+            starts = _row_starts_from_ids(segment_ids[rows])
+            baseline = (cumulative[rows] - new[rows])[starts]
+            repaired, unrepaired = _redistribute_negative(new[rows], starts)
+            rebuilt = _segmented_cumsum(repaired, starts) + baseline
+            new[rows] = repaired
+            cumulative[rows] = np.where(unrepaired, cumulative[rows], rebuilt)
+            unrepaired_rows = rows[unrepaired & (repaired < 0)]
+            if len(unrepaired_rows):
+                unrepaired_tables.append(pd.DataFrame({
+                    'Country': df_sorted['Country'].to_numpy()[unrepaired_rows],
+                    'Date_reported': df_sorted['Date_reported'].to_numpy()[unrepaired_rows],
+                    'metric': metric, 'anomaly': 'unrepaired',
+                    'value': new[unrepaired_rows], 'expected': 0.0
+                }))
+
+        df_sorted[new_col] = _as_column_dtype(new, df_sorted[new_col].dtype)
+        df_sorted[cum_col] = _as_column_dtype(cumulative, df_sorted[cum_col].dtype)
+
+    if unrepaired_tables:
+        anomalies = pd.concat([anomalies] + unrepaired_tables, ignore_index=True)
+        anomalies = anomalies.sort_values(['Country', 'Date_reported', 'metric'], kind='mergesort')
+        anomalies = anomalies.reset_index(drop=True)
+    return df_sorted, anomalies
+
+
+def summarize_anomalies(anomalies):
+    """
+    Count anomalies per metric and type.
+
+    Parameters:
+    -----------
+    anomalies : pd.DataFrame
+        Table returned by ``validate_cumulative_consistency``
+
+    Returns:
+    --------
+    pd.DataFrame
+        Rows and affected countries per (metric, anomaly)
+    """
+    if anomalies.empty:
+        return pd.DataFrame(columns=['metric', 'anomaly', 'rows', 'countries'])
+    return (anomalies.groupby(['metric', 'anomaly'])
+            .agg(rows=('Country', 'size'), countries=('Country', 'nunique'))
+            .reset_index())
+
+
+if __name__ == "__main__":
+    print("COVID-19 Cumulative Consistency Validation Module")
+    print("This module detects and repairs inconsistent cumulative series.")
@@ -0,0 +1,294 @@
+"""
+Persistent Categorical Vocabulary Module for COVID-19 Analysis
+==============================================================
+
+A vocabulary maps the values of a categorical column (Country, WHO_region,
+Pandemic_Phase) to integer codes that never change once assigned. New
+values are appended at the end, so codes stay stable across runs, samples
+and snapshots, and saved models keep scoring consistently.
+
+Encoding factorizes the column once (category codes for categorical
+columns) and maps only its distinct values to vocabulary codes, so the cost
+is O(n) with no sort over the rows. A fresh vocabulary assigns codes in
+sorted order, matching what ``LabelEncoder.fit_transform`` produced.
+Vocabularies of columns with a fixed value set (WHO_region) start with all
+of its values, so their codes do not depend on which values a sample holds.
+
+Unseen values are handled explicitly with one of three policies:
+
+- 'add'     : append them to the vocabulary (default when fitting)
+- 'unknown' : encode them as UNKNOWN_CODE (-1)
+- 'error'   : raise a ValueError listing them
+
+Author: COVID-19 Analysis Project
+Course: INSY 8413 | Introduction to Big Data Analytics
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+UNKNOWN_CODE = -1
+UNSEEN_POLICIES = ('add', 'unknown', 'error')
+DEFAULT_CATEGORICAL_VARS = ['Country', 'WHO_region', 'Pandemic_Phase']
+# Initial values of new vocabularies, in sorted order
+KNOWN_CATEGORIES = {'WHO_region': ['AFR', 'AMR', 'EMR', 'EUR', 'OTHER', 'SEAR', 'WPR']}
+
+
+class CategoryVocabulary:
+    """
+    Append-only mapping between category values and stable integer codes.
+    """
+
+    def __init__(self, values=()):
+        self._values = []
+        self._index = pd.Index([], dtype=object)
+        self.update(values, sort=False)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        return value in self._index
+
+    @property
+    def classes_(self):
+        """Values in code order (same attribute name as ``LabelEncoder``)."""
+        return np.array(self._values, dtype=object)
+
+    def update(self, values, sort=True):
+        """
+        Append values that are not in the vocabulary yet.
+
+        Parameters:
+        -----------
+        values : iterable
+            Candidate values (missing values are ignored)
+        sort : bool
+            Append new values in sorted order (otherwise in the given order)
+
+        Returns:
+        --------
+        list
+            Values that were added
+        """
+        uniques = pd.unique(pd.Series(list(values), dtype=object).dropna())
+        new_values = [v for v in uniques if v not in self._index]
+        if sort:
+            new_values = sorted(new_values, key=str)
+        if new_values:
+            self._values.extend(new_values)
+            self._index = pd.Index(self._values, dtype=object)
+        return new_values
+
+    def fit(self, values):
+        """Add the values of ``values``; returns the vocabulary."""
+        self.update(_distinct_values(values))
+        return self
+
+    def transform(self, values, unseen='error'):
+        """
+        Encode values as vocabulary codes.
+
+        Parameters:
+        -----------
+        values : array-like or pd.Series
+            Values to encode
+        unseen : str
+            Policy for values missing from the vocabulary: 'add', 'unknown' or 'error'
+
+        Returns:
+        --------
+        np.ndarray
+            Integer codes (UNKNOWN_CODE for missing values and, with
+            'unknown', for unseen values)
+        """
+        if unseen not in UNSEEN_POLICIES:
+            raise ValueError(f"Unknown unseen policy '{unseen}', expected one of {UNSEEN_POLICIES}")
+
+        codes, uniques = _factorize(values)
+        mapping = self._index.get_indexer(pd.Index(uniques, dtype=object))
+
+        # Categorical inputs list every category; only those that occur count as unseen
+        present = np.bincount(codes[codes >= 0], minlength=len(uniques)) > 0
+        missing = (mapping < 0) & present
+        if missing.any():
+            unseen_values = list(np.asarray(uniques, dtype=object)[missing])
+            if unseen == 'error':
+                preview = ', '.join(map(str, unseen_values[:5]))
+                raise ValueError(f"{len(unseen_values)} value(s) not in the vocabulary: {preview}")
+            if unseen == 'add':
+                self.update(unseen_values)
+                mapping = self._index.get_indexer(pd.Index(uniques, dtype=object))
+
+        mapping = np.append(mapping, UNKNOWN_CODE).astype(np.int64)
+        return mapping[codes]
+
+    def fit_transform(self, values):
+        """Encode values, adding unseen ones to the vocabulary."""
+        return self.transform(values, unseen='add')
+
+    def inverse_transform(self, codes):
+        """
+        Decode vocabulary codes.
+
+        Parameters:
+        -----------
+        codes : array-like of int
+            Codes from ``transform`` (UNKNOWN_CODE decodes to None)
+
+        Returns:
+        --------
+        np.ndarray
+            Decoded values
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if codes.size and (codes.max() >= len(self) or codes.min() < UNKNOWN_CODE):
+            raise ValueError("Codes outside the vocabulary")
+        lookup = np.append(np.array(self._values, dtype=object), None)
+        return lookup[codes]
+
+    def to_config(self):
+        """Return the values in code order as a JSON-serialisable list."""
+        return [v.item() if hasattr(v, 'item') else v for v in self._values]
+
+    @classmethod
+    def from_config(cls, values):
+        """Create a vocabulary whose codes follow the order of ``values``."""
+        return cls(values)
+
+
+def _factorize(values):
+    """Codes into the distinct values of ``values`` (-1 for missing), in O(n)."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories.to_numpy(dtype=object)
+    return pd.factorize(series)
+
+
+def _distinct_values(values):
+    codes, uniques = _factorize(values)
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        # Only categories that actually occur
+        uniques = uniques[np.unique(codes[codes >= 0])]
+    return uniques
+
+
+class VocabularyStore:
+    """
+    Named vocabularies, optionally persisted to a JSON file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.vocabularies = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                config = json.load(f)
+            self.vocabularies = {name: CategoryVocabulary.from_config(values)
+                                 for name, values in config.items()}
+
+    def __getitem__(self, name):
+        if name not in self.vocabularies:
+            self.vocabularies[name] = CategoryVocabulary(KNOWN_CATEGORIES.get(name, ()))
+        return self.vocabularies[name]
+
+    def __contains__(self, name):
+        return name in self.vocabularies
+
+    def encode(self, df, columns=None, unseen='add', suffix='_encoded'):
+        """
+        Add ``<column><suffix>`` code columns for the given columns.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Dataset
+        columns : list, optional
+            Columns to encode (defaults to DEFAULT_CATEGORICAL_VARS present in ``df``)
+        unseen : str
+            Policy for values missing from a vocabulary: 'add', 'unknown' or 'error'
+        suffix : str
+            Suffix of the code columns
+
+        Returns:
+        --------
+        tuple
+            (dataframe with code columns, {column: CategoryVocabulary})
+        """
+        columns = [c for c in (columns or DEFAULT_CATEGORICAL_VARS) if c in df.columns]
+        encoded = df.copy(deep=False)
+        used = {}
+        for column in columns:
+            vocabulary = self[column]
+            if len(vocabulary) == 0 and unseen == 'add':
+                # A fresh vocabulary gets sorted codes
+                vocabulary.fit(df[column])
+            codes = vocabulary.transform(df[column], unseen=unseen)
+            encoded[f'{column}{suffix}'] = codes
+            used[column] = vocabulary
+        return encoded, used
+
+    def save(self, path=None):
+        """
+        Write all vocabularies to a JSON file.
+
+        Parameters:
+        -----------
+        path : str, optional
+            Target file (defaults to the path the store was opened with)
+
+        Returns:
+        --------
+        str
+            Path written
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given for the vocabulary store")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({name: vocab.to_config() for name, vocab in self.vocabularies.items()},
+                      f, indent=2, default=str)
+        os.replace(tmp_path, path)
+        self.path = path
+        return path
+
+
+def encode_with_vocabulary(df, columns=None, vocabulary_path=None, unseen='add'):
+    """
+    Encode categorical columns with a (persistent) vocabulary store.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset
+    columns : list, optional
+        Columns to encode (defaults to Country, WHO_region and Pandemic_Phase)
+    vocabulary_path : str, optional
+        JSON file of the vocabulary store; it is read if it exists and
+        written back when values were added (in-memory only if None)
+    unseen : str
+        Policy for unseen values: 'add', 'unknown' or 'error'
+
+    Returns:
+    --------
+    tuple
+        (dataframe with ``<column>_encoded`` columns, {column: CategoryVocabulary})
+    """
+    store = VocabularyStore(vocabulary_path)
+    sizes = {name: len(vocab) for name, vocab in store.vocabularies.items()}
+    encoded, vocabularies = store.encode(df, columns, unseen=unseen)
+
+    if vocabulary_path and any(len(v) != sizes.get(name, 0) for name, v in vocabularies.items()):
+        store.save()
+    return encoded, vocabularies
+
+
+if __name__ == "__main__":
+    print("COVID-19 Categorical Vocabulary Module")
+    print("This module encodes categorical columns with stable, persistent codes.")
@@ -0,0 +1,60 @@
+"""
+Shared fixtures for the COVID-19 pipeline tests.
+
+Tests run on small synthetic WHO-style datasets, so they do not need the
+real WHO download.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+REGIONS = ['AFR', 'AMR', 'EMR', 'EUR', 'SEAR', 'WPR']
+
+
+def make_who_frame(n_countries=12, n_days=120, seed=0):
+    """
+    Build a raw WHO-style daily dataset with some missing counts.
+
+    Rows are ordered by date, then country, like the WHO file.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2020-01-03', periods=n_days, freq='D')
+    frames = []
+    for i in range(n_countries):
+        new_cases = rng.poisson(rng.uniform(1, 500), n_days).astype(float)
+        new_deaths = rng.poisson(np.maximum(new_cases * 0.01, 0.01)).astype(float)
+        cumulative_cases, cumulative_deaths = np.cumsum(new_cases), np.cumsum(new_deaths)
+        new_cases[rng.random(n_days) < 0.1] = np.nan
+        new_deaths[rng.random(n_days) < 0.1] = np.nan
+        frames.append(pd.DataFrame({
+            'Date_reported': dates.strftime('%Y-%m-%d'),
+            'Country_code': f'C{i:03d}',
+            'Country': f'Country {i:03d}',
+            'WHO_region': REGIONS[i % len(REGIONS)],
+            'New_cases': new_cases,
+            'Cumulative_cases': cumulative_cases,
+            'New_deaths': new_deaths,
+            'Cumulative_deaths': cumulative_deaths
+        }))
+    df = pd.concat(frames)
+    return df.sort_values(['Date_reported', 'Country'], kind='mergesort').reset_index(drop=True)
+
+
+def write_who_csv(path, n_countries=12, n_days=120, seed=0):
+    """Write ``make_who_frame`` to a CSV file and return its path."""
+    make_who_frame(n_countries, n_days, seed).to_csv(path, index=False, float_format='%.0f')
+    return str(path)
+
+
+@pytest.fixture
+def who_csv(tmp_path):
+    """Path of a small synthetic WHO CSV file."""
+    return write_who_csv(tmp_path / 'who.csv')
@@ -0,0 +1,144 @@
+"""
+Tests for the cleaning engine (src.cleaning).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.cleaning import clean_frame, resolve_key_conflicts
+from src.data_preprocessing import clean_data
+from src.optimized_preprocessing import clean_data_optimized
+from src.validation import validate_cumulative_consistency
+
+NUMERICAL_COLS = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+
+
+def _revised_frame(count_dtype='int64'):
+    """Three keys: B/01-02 is revised with different counts, A/01-01 repeats unchanged."""
+    df = pd.DataFrame({
+        'Date_reported': pd.to_datetime(['2020-01-01', '2020-01-01', '2020-01-02',
+                                         '2020-01-01', '2020-01-02']),
+        'Country_code': ['A', 'B', 'B', 'A', 'B'],
+        'Country': ['Alpha', 'Beta', 'Beta', 'Alpha', 'Beta'],
+        'New_cases': [1, 2, 9, 1, 4],
+        'Cumulative_cases': [1, 2, 11, 1, 6],
+        'New_deaths': [0, 0, 1, 0, 2],
+        'Cumulative_deaths': [0, 0, 1, 0, 2]
+    })
+    counts = ['New_cases', 'Cumulative_cases', 'New_deaths', 'Cumulative_deaths']
+    df[counts] = df[counts].astype(count_dtype)
+    return df
+
+
+def test_conflicts_are_reported_once_per_key():
+    removed, _, conflicts = resolve_key_conflicts(_revised_frame())
+
+    assert removed.tolist() == [True, False, True, False, False]
+    assert conflicts[['Country_code', 'revisions']].values.tolist() == [['B', 2]]
+    assert conflicts['differing_columns'].iloc[0] == ('New_cases, Cumulative_cases, '
+                                                      'New_deaths, Cumulative_deaths')
+
+
+@pytest.mark.parametrize('count_dtype', ['int64', 'Int32', 'Int64'])
+def test_latest_policy_keeps_the_last_revision(count_dtype):
+    df = _revised_frame(count_dtype)
+    cleaned, report = clean_frame(df, conflict_policy='latest')
+
+    assert cleaned['New_cases'].tolist() == [2, 1, 4]
+    assert cleaned['Cumulative_cases'].tolist() == [2, 1, 6]
+    assert report['removed']['duplicates'] == 2
+    assert (cleaned.dtypes == df.dtypes).all()
+
+
+@pytest.mark.parametrize('count_dtype', ['int64', 'Int32', 'Int64'])
+def test_max_policy_takes_the_maximum_and_keeps_dtypes(count_dtype):
+    df = _revised_frame(count_dtype)
+    cleaned, _ = clean_frame(df, conflict_policy='max')
+
+    beta = cleaned[cleaned['Date_reported'] == '2020-01-02'].iloc[0]
+    assert [beta['New_cases'], beta['Cumulative_cases'], beta['New_deaths']] == [9, 11, 2]
+    assert (cleaned.dtypes == df.dtypes).all()
+    # The input frame is not modified
+    pd.testing.assert_frame_equal(df, _revised_frame(count_dtype))
+
+
+def test_max_policy_with_missing_nullable_counts():
+    df = _revised_frame('Int32')
+    df.loc[2, 'New_cases'] = pd.NA
+    cleaned, _ = clean_frame(df, count_cols=[], conflict_policy='max')
+
+    assert cleaned['New_cases'].dtype == 'Int32'
+    assert cleaned['New_cases'].tolist() == [2, 1, 4]
+
+
+def test_error_policy_raises_on_conflicts_only():
+    with pytest.raises(ValueError, match='conflicting revisions: B / 2020-01-02'):
+        clean_frame(_revised_frame(), conflict_policy='error')
+
+    consistent = _revised_frame().drop(index=2)
+    cleaned, report = clean_frame(consistent, conflict_policy='error')
+    assert len(cleaned) == 3
+    assert report['conflicts'].empty
+    assert np.array_equal(cleaned['Country_code'], ['B', 'A', 'B'])
+
+
+def _old_clean_data(df):
+    """``data_preprocessing.clean_data`` before the cleaning engine."""
+    df_clean = df.copy()
+    df_clean.columns = df_clean.columns.str.strip().str.replace(' ', '_')
+    df_clean['Date_reported'] = pd.to_datetime(df_clean['Date_reported'])
+    for col in NUMERICAL_COLS:
+        if col in df_clean.columns:
+            df_clean[col] = df_clean[col].fillna(0)
+            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+    return df_clean.drop_duplicates()
+
+
+def _old_clean_data_optimized(df):
+    """``clean_data_optimized`` before the cleaning engine, without dtype optimization."""
+    df_clean = df.copy()
+    df_clean.columns = df_clean.columns.str.strip().str.replace(' ', '_')
+    for col in NUMERICAL_COLS:
+        if col in df_clean.columns:
+            df_clean[col] = df_clean[col].fillna(0)
+    df_clean = df_clean.drop_duplicates()
+    df_clean, _ = validate_cumulative_consistency(df_clean)
+    negative = df_clean[NUMERICAL_COLS].to_numpy() < 0
+    return df_clean[~negative.any(axis=1)]
+
+
+def _messy_raw_frame():
+    """Raw frame with padded column names, duplicates, text and negative counts."""
+    df = make_who_frame(n_countries=5, n_days=40)
+    df = pd.concat([df, df.iloc[[3, 17, 50]]], ignore_index=True)
+    df.loc[5, 'New_cases'] = -4
+    df.loc[9, 'New_deaths'] = -1
+    df['New_deaths'] = df['New_deaths'].astype(object)
+    df.loc[11, 'New_deaths'] = 'n/a'
+    return df.rename(columns={'New_cases': ' New cases', 'WHO_region': 'WHO region '})
+
+
+def test_clean_data_equals_the_former_implementation():
+    raw = _messy_raw_frame()
+    expected = _old_clean_data(raw)
+
+    cleaned = clean_data(raw)
+    pd.testing.assert_frame_equal(cleaned, expected)
+    # In place: same rows and values, in the input frame itself
+    inplace = raw.copy()
+    assert clean_data(inplace, inplace=True) is inplace
+    pd.testing.assert_frame_equal(inplace, expected)
+    pd.testing.assert_frame_equal(raw, _messy_raw_frame())
+
+
+def test_clean_data_optimized_equals_the_former_implementation():
+    raw = _messy_raw_frame()
+    raw['New_deaths'] = pd.to_numeric(raw['New_deaths'], errors='coerce')
+    raw['Date_reported'] = pd.to_datetime(raw['Date_reported'])
+
+    cleaned = clean_data_optimized(raw, optimize_memory=False, verbose=False)
+
+    pd.testing.assert_frame_equal(cleaned, _old_clean_data_optimized(raw))
+    assert len(cleaned) == len(raw) - 3 - 2
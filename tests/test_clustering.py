@@ -0,0 +1,115 @@
+"""
+Tests for the k sweep and streaming paths of COVIDClustering (src.modeling).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score, silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from src.modeling import COVIDClustering
+
+
+def _blobs(n_rows=600, n_centers=4, seed=0):
+    """Gaussian blobs on very different scales, so that the scaler matters."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-10, 10, (n_centers, 3))
+    X = centers[rng.integers(n_centers, size=n_rows)] + rng.normal(0, 1.5, (n_rows, 3))
+    return X * np.array([1.0, 1000.0, 0.01])
+
+
+def _serial_sweep(X, k_range):
+    """The former sweep: exact silhouette per k, then a refit of the winner."""
+    X_scaled = StandardScaler().fit_transform(X)
+    scores = [silhouette_score(X_scaled, KMeans(n_clusters=k, random_state=42, n_init=10)
+                               .fit_predict(X_scaled)) for k in k_range]
+    optimal_k = k_range[int(np.argmax(scores))]
+    labels = KMeans(n_clusters=optimal_k, random_state=42, n_init=10).fit_predict(X_scaled)
+    return optimal_k, scores, labels
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_scored_sweep_picks_the_serial_k_and_labels(n_jobs, seed):
+    X = _blobs(seed=seed)
+    k_range = range(2, 8)
+    expected_k, expected_scores, expected_labels = _serial_sweep(X, k_range)
+
+    clustering = COVIDClustering(n_jobs=n_jobs)
+    optimal_k = clustering.find_optimal_clusters(X, k_range=k_range)
+    labels = clustering.fit_predict(X)
+
+    assert optimal_k == expected_k
+    assert list(clustering.cluster_scores['k']) == list(k_range)
+    np.testing.assert_allclose(clustering.silhouette_scores, expected_scores, rtol=1e-12)
+    np.testing.assert_array_equal(labels, expected_labels)
+
+
+def test_sampled_silhouette_keeps_the_serial_k():
+    X = _blobs(n_rows=3000)
+    expected_k, _, _ = _serial_sweep(X, range(2, 7))
+
+    clustering = COVIDClustering(n_jobs=1, silhouette_sample_size=1000)
+
+    assert clustering.find_optimal_clusters(X, k_range=range(2, 7)) == expected_k
+
+
+def test_fit_predict_refits_on_other_data():
+    X = _blobs()
+    clustering = COVIDClustering(n_jobs=1)
+    clustering.find_optimal_clusters(X, k_range=range(2, 6))
+
+    other = _blobs(seed=3)
+    labels = clustering.fit_predict(other)
+
+    expected = KMeans(n_clusters=clustering.n_clusters, random_state=42, n_init=10) \
+        .fit_predict(StandardScaler().fit_transform(other))
+    np.testing.assert_array_equal(labels, expected)
+
+
+def _chunks(X, chunk_rows):
+    """Consecutive row blocks of ``X``."""
+    return [X[start:start + chunk_rows] for start in range(0, len(X), chunk_rows)]
+
+
+def test_streaming_labels_agree_with_batch_kmeans():
+    X = _blobs(n_rows=5000)
+    _, _, expected_labels = _serial_sweep(X, range(2, 8))
+
+    clustering = COVIDClustering(silhouette_sample_size=2000)
+    optimal_k = clustering.fit_streaming(_chunks(X, 1200), k_range=range(2, 8),
+                                         batch_size=512)
+    labels = np.concatenate(list(clustering.predict_streaming(_chunks(X, 700))))
+
+    assert optimal_k == 4
+    assert labels.shape == (len(X),)
+    assert adjusted_rand_score(labels, expected_labels) > 0.99
+
+
+def test_streaming_is_independent_of_the_chunk_source():
+    X = _blobs(n_rows=2000)
+    frames = [pd.DataFrame(chunk, columns=['a', 'b', 'c']).assign(Country='x')
+              for chunk in _chunks(X, 500)]
+
+    from_arrays = COVIDClustering(n_clusters=4)
+    from_arrays.fit_streaming(lambda: iter(_chunks(X, 500)))
+    from_frames = COVIDClustering(n_clusters=4)
+    from_frames.fit_streaming(frames, columns=['a', 'b', 'c'])
+
+    assert from_arrays.n_clusters == from_frames.n_clusters == 4
+    assert list(from_arrays.cluster_scores['k']) == [4]
+    np.testing.assert_allclose(from_arrays.kmeans.cluster_centers_,
+                               from_frames.kmeans.cluster_centers_)
+    # Chunked prediction equals predicting the whole matrix at once
+    labels = np.concatenate(list(from_frames.predict_streaming(frames, columns=['a', 'b', 'c'])))
+    np.testing.assert_array_equal(
+        labels, from_arrays.kmeans.predict(from_arrays.scaler.transform(X)))
+
+
+def test_streaming_requires_rows_and_a_fitted_model():
+    with pytest.raises(ValueError, match='No rows'):
+        COVIDClustering().fit_streaming([])
+    with pytest.raises(ValueError, match='not fitted'):
+        next(COVIDClustering().predict_streaming([np.zeros((2, 3))]))
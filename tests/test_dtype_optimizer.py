@@ -0,0 +1,69 @@
+"""
+Tests for dtype downcasting (src.dtype_optimizer).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dtype_optimizer import optimize_dtypes
+
+
+def _mixed_frame():
+    return pd.DataFrame({
+        'Country': ['Chad', 'Peru', 'Chad', 'Peru'],
+        'New_cases': np.array([0, 5, 3, 100], dtype=np.int64),
+        'Cumulative_cases': np.array([0, 5, 8, 3_000_000_000], dtype=np.int64),
+        'New_deaths': [0.0, 1.0, np.nan, 2.0],
+        'Cumulative_deaths': [0.0, 1.0, 1.0, 3.0],
+        'Day_of_week': np.array([0, 1, 2, 3], dtype=np.int64),
+        'Case_Fatality_Rate': [0.0, 1 / 3, 12345.678901, 2.5],
+        'Share': [0.5, 0.25, np.nan, 1024.0],
+        'Huge': [1e39, 1.0, 2.0, 3.0],
+    })
+
+
+def test_optimized_frame_round_trips_exactly_by_default():
+    df = _mixed_frame()
+    optimized = optimize_dtypes(df, report=False)
+
+    # Only values exactly representable in float32 are downcast
+    assert optimized['Share'].dtype == np.float32
+    assert optimized['Case_Fatality_Rate'].dtype == np.float64
+    assert optimized['Huge'].dtype == np.float64
+    restored = optimized.astype({col: df[col].dtype for col in df.columns})
+    pd.testing.assert_frame_equal(restored, df, check_exact=True)
+
+
+@pytest.mark.parametrize('float_rtol', [1e-3, 1e-7])
+def test_float_tolerance_bounds_the_round_trip_error(float_rtol):
+    df = _mixed_frame()
+    optimized = optimize_dtypes(df, float_rtol=float_rtol, report=False)
+
+    assert optimized['Case_Fatality_Rate'].dtype == np.float32
+    np.testing.assert_allclose(optimized['Case_Fatality_Rate'].astype(np.float64),
+                               df['Case_Fatality_Rate'], rtol=float_rtol, atol=0)
+    # Out of the float32 range whatever the tolerance
+    assert optimized['Huge'].dtype == np.float64
+
+
+def test_counts_stay_at_least_int32():
+    optimized = optimize_dtypes(_mixed_frame(), report=False)
+
+    assert optimized['New_cases'].dtype == np.int32
+    assert optimized['Cumulative_cases'].dtype == np.int64
+    assert optimized['New_deaths'].dtype == 'Int32'
+    assert optimized['Cumulative_deaths'].dtype == np.int32
+    # Non-count integers only keep their value range
+    assert optimized['Day_of_week'].dtype == np.int8
+    assert str(optimized['Country'].dtype) == 'category'
+    # Arithmetic on counts does not wrap around
+    assert (optimized['New_cases'] * 1000).tolist() == [0, 5000, 3000, 100000]
+
+
+def test_inplace_replaces_columns_of_the_input():
+    df = _mixed_frame()
+    result = optimize_dtypes(df, inplace=True, report=False)
+
+    assert result is df
+    assert df['New_cases'].dtype == np.int32
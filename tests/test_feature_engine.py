@@ -0,0 +1,120 @@
+"""
+Tests for the vectorized feature engine (src.feature_engine).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.country_index import CountryIndex, sort_by_country
+from src.data_preprocessing import clean_data
+from src.feature_engine import (ROLLING_STATS, add_series_features, balanced_blocks,
+                                resolve_n_jobs, rolling_features)
+
+
+def _ragged_frame(seed=1):
+    """Countries of different lengths (one with a single row) with 20% missing values."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n_rows in enumerate([30, 1, 12, 45]):
+        values = rng.normal(100, 30, (n_rows, 2))
+        values[rng.random((n_rows, 2)) < 0.2] = np.nan
+        frames.append(pd.DataFrame({'Country': f'C{i}', 'a': values[:, 0], 'b': values[:, 1]}))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize('min_periods', [1, 3, None])
+def test_multi_window_rolling_equals_groupby_rolling(min_periods):
+    df = _ragged_frame()
+    windows = (3, 7, 14)
+
+    features = rolling_features(df, ['a', 'b'], windows=windows, stats=ROLLING_STATS,
+                                group_col='Country', min_periods=min_periods)
+
+    assert features.shape[1] == 2 * len(windows) * len(ROLLING_STATS)
+    for window in windows:
+        rolling = df.groupby('Country', sort=False)[['a', 'b']].rolling(
+            window, min_periods=window if min_periods is None else min_periods)
+        for stat in ROLLING_STATS:
+            expected = getattr(rolling, stat)().reset_index(level=0, drop=True)
+            for column in ('a', 'b'):
+                np.testing.assert_allclose(features[f'{column}_rolling_{window}_{stat}'],
+                                           expected[column], rtol=1e-9, atol=1e-9,
+                                           err_msg=f'{column} {window} {stat}')
+
+
+def test_lags_equal_groupby_shift_and_keep_the_index():
+    df = _ragged_frame().set_index(np.arange(100, 188))
+
+    features = rolling_features(df, ['a'], windows=(), lags=(1, 7), group_col='Country',
+                                aliases={'a': 'cases'})
+
+    assert list(features.columns) == ['cases_lag_1', 'cases_lag_7']
+    assert features.index.equals(df.index)
+    for lag in (1, 7):
+        pd.testing.assert_series_equal(features[f'cases_lag_{lag}'],
+                                       df.groupby('Country')['a'].shift(lag),
+                                       check_names=False)
+
+
+def test_series_features_equal_the_groupby_implementation():
+    raw = _ragged_frame()
+    df = pd.DataFrame({
+        'Country': raw['Country'],
+        'Date_reported': pd.Timestamp('2020-01-01') + pd.to_timedelta(
+            raw.groupby('Country').cumcount(), unit='D'),
+        'Cumulative_cases': raw['a'].abs().round(),
+        'Cumulative_deaths': raw['b'].abs().round(),
+        'New_cases': raw['a'],
+        'New_deaths': raw['b']
+    }).sample(frac=1, random_state=0)
+
+    features = add_series_features(df)
+
+    expected = df.sort_values(['Country', 'Date_reported'])
+    grouped = expected.groupby('Country')
+    for column, name in [('Cumulative_cases', 'Cases_Growth_Rate'),
+                         ('Cumulative_deaths', 'Deaths_Growth_Rate')]:
+        # The former default of pct_change: forward-fill within the country first
+        filled = grouped[column].ffill()
+        growth = filled.groupby(expected['Country']).pct_change(fill_method=None) * 100
+        pd.testing.assert_series_equal(features[name], growth, check_names=False)
+    np.testing.assert_allclose(
+        features['New_cases_7day_avg'],
+        grouped['New_cases'].rolling(7, min_periods=1).mean().reset_index(level=0, drop=True),
+        rtol=1e-12)
+
+
+@pytest.mark.parametrize('n_jobs', [2, 3])
+def test_worker_processes_give_the_in_process_result(n_jobs):
+    df = clean_data(make_who_frame(n_countries=7, n_days=90))
+
+    expected = add_series_features(df, n_jobs=1)
+    result = add_series_features(df, n_jobs=n_jobs)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_balanced_blocks_cover_every_country_once():
+    df = sort_by_country(clean_data(make_who_frame(n_countries=10, n_days=30)))
+    # Uneven country lengths
+    df = df[~((df['Country'] < 'Country 003') & (df['Date_reported'] > '2020-01-10'))]
+    index = CountryIndex.build(df.reset_index(drop=True))
+
+    blocks = balanced_blocks(index, 4)
+
+    assert blocks[0][0] == 0 and blocks[-1][1] == len(index)
+    assert all(a < b == c for (a, b), (c, _) in zip(blocks[:-1], blocks[1:]))
+    assert len(blocks) <= 4
+    assert balanced_blocks(index, 100) == [(i, i + 1) for i in range(len(index))]
+
+
+def test_resolve_n_jobs():
+    cpus = os.cpu_count() or 1
+    assert resolve_n_jobs(None) == resolve_n_jobs(0) == resolve_n_jobs(1) == 1
+    assert resolve_n_jobs(4) == 4
+    assert resolve_n_jobs(-1) == cpus
+    assert resolve_n_jobs(-cpus - 5) == 1
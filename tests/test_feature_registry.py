@@ -0,0 +1,114 @@
+"""
+Tests for dependency resolution and column caching of the feature registry
+(src.feature_registry).
+"""
+
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.country_index import sort_by_country
+from src.data_preprocessing import clean_data
+from src.feature_registry import FeatureRegistry, compute_features, DEFAULT_REGISTRY
+from src.modeling import OutbreakPredictor
+
+
+def _counting_registry(calls):
+    """base -> doubled -> quadrupled, recording every computed feature in ``calls``."""
+    registry = FeatureRegistry()
+
+    @registry.register('doubled', outputs=['doubled'], inputs=['x'], params=['factor'])
+    def _doubled(df, factor=None):
+        calls.append('doubled')
+        return {'doubled': df['x'] * 2 * (factor or 1)}
+
+    @registry.register('quadrupled', outputs=['quadrupled'], depends=['doubled'])
+    def _quadrupled(df):
+        calls.append('quadrupled')
+        return {'quadrupled': df['doubled'] * 2}
+
+    return registry
+
+
+def test_resolve_orders_dependencies_first_and_skips_available_columns():
+    registry = _counting_registry([])
+
+    assert registry.resolve(['quadrupled']) == ['doubled', 'quadrupled']
+    assert registry.resolve(['quadrupled'], available=['doubled']) == ['quadrupled']
+    assert DEFAULT_REGISTRY.resolve(['Outbreak_Risk']) == ['growth_rates', 'outbreak_risk']
+
+
+def test_resolve_detects_cycles_and_unknown_columns():
+    registry = FeatureRegistry()
+    registry.register('a', outputs=['a'], depends=['b'])(lambda df: {})
+    registry.register('b', outputs=['b'], depends=['a'])(lambda df: {})
+
+    with pytest.raises(ValueError, match='cycle'):
+        registry.resolve(['a'])
+    with pytest.raises(KeyError):
+        registry.resolve(['missing'])
+
+
+def test_duplicate_outputs_are_rejected():
+    registry = _counting_registry([])
+    with pytest.raises(ValueError, match='already produced'):
+        registry.register('other', outputs=['doubled'])(lambda df: {})
+
+
+def test_cache_hit_skips_the_feature_and_its_dependencies(tmp_path):
+    calls = []
+    registry = _counting_registry(calls)
+    df = pd.DataFrame({'x': [1, 2, 3]})
+
+    first = registry.compute(df, ['quadrupled'], cache_dir=str(tmp_path))
+    assert calls == ['doubled', 'quadrupled']
+    # Dependencies are computed but not returned
+    assert list(first.columns) == ['x', 'quadrupled']
+
+    calls.clear()
+    second = registry.compute(df, ['quadrupled'], cache_dir=str(tmp_path))
+    assert calls == []
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.parametrize('change', ['input', 'param', 'version'])
+def test_cache_is_invalidated_when_anything_it_depends_on_changes(tmp_path, change):
+    calls = []
+    registry = _counting_registry(calls)
+    df = pd.DataFrame({'x': [1, 2, 3]})
+    registry.compute(df, ['quadrupled'], cache_dir=str(tmp_path))
+    calls.clear()
+
+    params = {}
+    if change == 'input':
+        df = pd.DataFrame({'x': [1, 2, 4]})
+    elif change == 'param':
+        params['factor'] = 3
+    else:
+        registry.features['doubled'].version = 2
+    result = registry.compute(df, ['quadrupled'], cache_dir=str(tmp_path), **params)
+
+    # A changed dependency changes the fingerprint of everything downstream
+    assert calls == ['doubled', 'quadrupled']
+    assert result['quadrupled'].tolist() == (df['x'] * 4 * params.get('factor', 1)).tolist()
+
+
+def test_region_codes_do_not_depend_on_the_regions_present():
+    df = clean_data(make_who_frame(n_countries=12, n_days=10))
+    subset = df[df['WHO_region'].isin(['EUR', 'WPR'])]
+
+    full = compute_features(df, ['WHO_region_encoded'])
+    partial = compute_features(subset, ['WHO_region_encoded'])
+
+    codes = dict(zip(full['WHO_region'], full['WHO_region_encoded']))
+    assert codes == {'AFR': 0, 'AMR': 1, 'EMR': 2, 'EUR': 3, 'SEAR': 5, 'WPR': 6}
+    assert dict(zip(partial['WHO_region'], partial['WHO_region_encoded'])) == {'EUR': 3, 'WPR': 6}
+
+
+def test_outbreak_risk_feature_matches_the_predictor_labels():
+    df = sort_by_country(clean_data(make_who_frame(n_countries=4, n_days=60)))
+    features = compute_features(df, ['Cases_Growth_Rate', 'Outbreak_Risk'])
+
+    labels = OutbreakPredictor().create_risk_labels(features)
+    pd.testing.assert_series_equal(features['Outbreak_Risk'], labels['Outbreak_Risk'])
+    assert set(labels['Outbreak_Risk']) == {'Low', 'Medium', 'High'}
@@ -0,0 +1,203 @@
+"""
+Tests for the batched forecasting paths of COVIDForecaster (src.modeling).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.data_preprocessing import clean_data
+from src.modeling import BACKTEST_WINDOWS, COVIDForecaster
+
+
+@pytest.fixture(scope='module')
+def history():
+    """Two countries of cleaned daily data."""
+    return clean_data(make_who_frame(n_countries=2, n_days=120))
+
+
+def _naive_forecast(cases_model, deaths_model, series, start_date, horizon, n_iterations=2):
+    """Recursive forecast of one series, one feature row and one predict call at a time."""
+    cases = list(series['New_cases'].astype(float))
+    deaths = list(series['New_deaths'].astype(float))
+    date = series['Date_reported'].iloc[-1]
+    for _ in range(horizon):
+        date += pd.Timedelta(days=1)
+        guess = (cases[-1], deaths[-1])
+        for _ in range(n_iterations):
+            c, d = cases + [guess[0]], deaths + [guess[1]]
+            row = [date.dayofyear, date.month, date.quarter, date.year,
+                   (date - start_date).days, c[-8], c[-15], d[-8], d[-15],
+                   np.mean(c[-7:]), np.mean(c[-14:]), np.mean(d[-7:]), np.mean(d[-14:])]
+            X = np.array([row], dtype=np.float64)
+            guess = (cases_model.predict(X)[0], deaths_model.predict(X)[0])
+        cases.append(guess[0])
+        deaths.append(guess[1])
+    return np.array(cases[-horizon:]), np.array(deaths[-horizon:])
+
+
+def test_per_series_forecast_equals_naive_recursive_loop(history):
+    forecaster = COVIDForecaster()
+    forecaster.train_batch(history, mode='per_series', keep_models=True)
+    forecasts = forecaster.forecast(history, horizon=10, group_col='Country')
+
+    for country, series in history.groupby('Country'):
+        cases_model, deaths_model = forecaster.series_models[country]
+        cases, deaths = _naive_forecast(cases_model, deaths_model,
+                                        series.sort_values('Date_reported'),
+                                        forecaster.start_date, horizon=10)
+        result = forecasts[forecasts['Country'] == country]
+        np.testing.assert_allclose(result['New_cases_forecast'], cases, rtol=1e-9)
+        np.testing.assert_allclose(result['New_deaths_forecast'], deaths, rtol=1e-9)
+
+
+def test_global_forecast_equals_naive_recursive_loop(history):
+    daily = history.groupby('Date_reported')[['New_cases', 'New_deaths']].sum().reset_index()
+    forecaster = COVIDForecaster()
+    forecaster.train(forecaster.create_time_features(daily))
+    forecasts = forecaster.forecast(daily, horizon=10)
+
+    cases, deaths = _naive_forecast(forecaster.cases_model, forecaster.deaths_model, daily,
+                                    forecaster.start_date, horizon=10)
+    np.testing.assert_allclose(forecasts['New_cases_forecast'], cases, rtol=1e-9)
+    np.testing.assert_allclose(forecasts['New_deaths_forecast'], deaths, rtol=1e-9)
+
+
+@pytest.fixture(scope='module')
+def panel():
+    """Six countries over three regions, one of them too short to be trained."""
+    df = clean_data(make_who_frame(n_countries=6, n_days=120))
+    return df[(df['Country'] != 'Country 005') | (df['Date_reported'] < '2020-02-15')]
+
+
+METRIC_COLUMNS = ['n_train', 'n_test', 'cases_rmse', 'cases_r2', 'deaths_rmse', 'deaths_r2']
+
+
+def test_per_series_batch_equals_one_train_call_per_series(panel):
+    forecaster = COVIDForecaster()
+    metrics = forecaster.train_batch(panel, mode='per_series')
+
+    assert list(metrics['Country']) == [f'Country {i:03d}' for i in range(5)]
+    for _, row in metrics.iterrows():
+        series = panel[panel['Country'] == row['Country']]
+        daily = series[['Date_reported', 'New_cases', 'New_deaths']].reset_index(drop=True)
+        single = COVIDForecaster()
+        results = single.train(single.create_time_features(daily))
+        for column in ['cases_rmse', 'cases_r2', 'deaths_rmse', 'deaths_r2']:
+            assert row[column] == pytest.approx(results[column], rel=1e-9), column
+        assert row['n_test'] == len(results['test_data']['cases_pred'])
+
+
+def test_worker_processes_give_the_in_process_metrics(panel):
+    serial = COVIDForecaster().train_batch(panel, mode='per_series', n_jobs=1)
+    parallel = COVIDForecaster().train_batch(panel, mode='per_series', n_jobs=2)
+
+    pd.testing.assert_frame_equal(parallel.drop(columns='seconds'),
+                                  serial.drop(columns='seconds'))
+
+
+def test_pooled_batch_uses_the_per_series_splits(panel):
+    per_series = COVIDForecaster().train_batch(panel, mode='per_series')
+    forecaster = COVIDForecaster()
+    pooled = forecaster.train_batch(panel, mode='pooled')
+
+    pd.testing.assert_frame_equal(pooled[['Country', 'n_train', 'n_test']],
+                                  per_series[['Country', 'n_train', 'n_test']])
+    assert np.isfinite(pooled[METRIC_COLUMNS].to_numpy(dtype=float)).all()
+    assert forecaster.batch_stats['models'] == 1
+    assert forecaster.batch_stats['series'] == 5
+    # The series code is the extra feature of the pooled forests
+    cases_model, _ = forecaster.pooled_models
+    assert cases_model.n_features_in_ == len(COVIDForecaster.FEATURE_COLUMNS) + 1
+
+
+def test_regional_batch_trains_one_series_per_region():
+    # Two countries per region, summed per date
+    panel = clean_data(make_who_frame(n_countries=12, n_days=90))
+    metrics = COVIDForecaster().train_batch(panel, group_col='WHO_region', mode='pooled')
+
+    days = panel.groupby('WHO_region')['Date_reported'].nunique() - 14
+    assert list(metrics['WHO_region']) == list(days.index)
+    assert list(metrics['n_train'] + metrics['n_test']) == list(days)
+
+
+def test_unknown_batch_mode_is_rejected(panel):
+    with pytest.raises(ValueError, match='mode'):
+        COVIDForecaster().train_batch(panel, mode='global')
+
+
+SCORE_COLUMNS = ['n_train', 'n_test', 'cases_rmse', 'cases_r2', 'deaths_rmse', 'deaths_r2',
+                 'cases_mape', 'deaths_mape']
+
+
+def _record_fold_days(monkeypatch):
+    """Record the days_since_start values every forest is fitted and scored on."""
+    import src.modeling
+    calls = []
+    day_column = COVIDForecaster.FEATURE_COLUMNS.index('days_since_start')
+
+    class RecordingForest(src.modeling.RandomForestRegressor):
+        def fit(self, X, y):
+            calls.append(('fit', X[:, day_column].copy()))
+            return super().fit(X, y)
+
+        def predict(self, X):
+            calls.append(('predict', X[:, day_column].copy()))
+            return super().predict(X)
+
+    monkeypatch.setattr(src.modeling, 'RandomForestRegressor', RecordingForest)
+    return calls
+
+
+@pytest.mark.parametrize('window, group_col', [('expanding', None), ('sliding', None),
+                                               ('expanding', 'Country')])
+def test_backtest_folds_train_only_on_days_before_the_test_window(
+        monkeypatch, panel, window, group_col):
+    data = panel if group_col else \
+        panel.groupby('Date_reported')[['New_cases', 'New_deaths']].sum().reset_index()
+    calls = _record_fold_days(monkeypatch)
+
+    results = COVIDForecaster().backtest(data, n_folds=3, horizon=14, step=10, window=window,
+                                         train_days=30, group_col=group_col)
+
+    start = pd.Timestamp(data['Date_reported'].min())
+    # Per fold: cases fit, deaths fit, cases predict, deaths predict
+    assert len(calls) == 4 * len(results)
+    for (_, fold), i in zip(results.iterrows(), range(0, len(calls), 4)):
+        train_days = calls[i][1]
+        test_days = calls[i + 2][1]
+        test_start = (fold['test_start'] - start).days
+        test_end = (fold['test_end'] - start).days
+        assert train_days.max() < test_start
+        assert train_days.min() >= (fold['train_start'] - start).days
+        assert test_days.min() == test_start and test_days.max() == test_end
+        np.testing.assert_array_equal(calls[i + 1][1], train_days)
+    assert results['test_end'].iloc[-1] == data['Date_reported'].max()
+    if window == 'sliding':
+        assert ((results['test_start'] - results['train_start']).dt.days == 30).all()
+        assert results['n_train'].nunique() == 1
+
+
+@pytest.mark.parametrize('window', BACKTEST_WINDOWS)
+def test_backtest_folds_ignore_data_after_their_window(window):
+    daily = clean_data(make_who_frame(n_countries=2, n_days=120)) \
+        .groupby('Date_reported')[['New_cases', 'New_deaths']].sum().reset_index()
+    kwargs = dict(horizon=14, step=14, window=window, train_days=40)
+
+    full = COVIDForecaster().backtest(daily, n_folds=3, **kwargs)
+    # Dropping the last fold's days must not change the earlier folds
+    truncated = COVIDForecaster().backtest(daily.iloc[:-14], n_folds=2, **kwargs)
+
+    pd.testing.assert_frame_equal(
+        truncated[['train_start', 'test_start', 'test_end'] + SCORE_COLUMNS],
+        full.iloc[:2][['train_start', 'test_start', 'test_end'] + SCORE_COLUMNS])
+
+
+def test_backtest_worker_processes_give_the_in_process_scores(panel):
+    serial = COVIDForecaster().backtest(panel, n_folds=3, horizon=14, group_col='Country')
+    parallel = COVIDForecaster().backtest(panel, n_folds=3, horizon=14, group_col='Country',
+                                          n_jobs=2)
+
+    pd.testing.assert_frame_equal(parallel.drop(columns=['fit_seconds', 'seconds']),
+                                  serial.drop(columns=['fit_seconds', 'seconds']))
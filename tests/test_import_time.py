@@ -0,0 +1,37 @@
+"""
+Import-time budget for ``import src`` (package names are resolved lazily).
+"""
+
+import json
+import subprocess
+import sys
+
+from tests.conftest import PROJECT_ROOT
+from benchmarks.pipeline import IMPORT_TIME_BUDGETS
+
+HEAVY_MODULES = ['sklearn', 'matplotlib', 'plotly']
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src
+seconds = time.perf_counter() - start
+print(json.dumps({'seconds': seconds,
+                  'loaded': [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _import_in_fresh_interpreter():
+    output = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def test_import_src_is_within_budget():
+    # Best of three fresh interpreters, to absorb scheduling noise
+    seconds = min(_import_in_fresh_interpreter()['seconds'] for _ in range(3))
+    assert seconds <= IMPORT_TIME_BUDGETS['src']
+
+
+def test_import_src_does_not_load_heavy_dependencies():
+    assert _import_in_fresh_interpreter()['loaded'] == []
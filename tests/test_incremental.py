@@ -0,0 +1,102 @@
+"""
+Tests for the incremental feature store (src.incremental).
+"""
+
+import os
+
+import pandas as pd
+
+from src.data_preprocessing import clean_data, create_features, load_covid_data
+from src.incremental import incremental_update, load_feature_store
+
+
+def _staged_snapshots(raw):
+    """Three snapshots with staggered last dates per country, then the full data."""
+    dates = pd.to_datetime(raw['Date_reported'])
+    early_countries = raw['Country'] < 'Country 004'
+    first = raw[((dates < '2020-03-01') | ((dates < '2020-03-20') & early_countries))
+                & (raw['Country'] != 'Country 011')]
+    second = raw[dates < '2020-04-10']
+    return [first, second, raw]
+
+
+def test_incremental_output_equals_full_recompute(who_csv, tmp_path):
+    raw = load_covid_data(who_csv)
+    store_path = str(tmp_path / 'store')
+
+    for snapshot in _staged_snapshots(raw):
+        incremental_update(snapshot, store_path)
+
+    stored = load_feature_store(store_path)
+    expected = create_features(clean_data(raw)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(stored, expected, check_dtype=False)
+
+
+def test_snapshot_without_new_rows_returns_full_schema(who_csv, tmp_path):
+    raw = load_covid_data(who_csv)
+    store_path = str(tmp_path / 'store')
+
+    appended = incremental_update(raw, store_path)
+    unchanged = incremental_update(raw, store_path)
+
+    assert unchanged.empty
+    assert list(unchanged.columns) == list(appended.columns)
+
+
+def test_updates_read_only_the_context_sidecar(who_csv, tmp_path, monkeypatch):
+    from pyarrow import feather
+
+    raw = load_covid_data(who_csv)
+    store_path = str(tmp_path / 'store')
+    first, second, full = _staged_snapshots(raw)
+    incremental_update(first, store_path)
+    incremental_update(second, store_path)
+
+    read_paths = []
+    read_table = feather.read_table
+
+    def recording_read_table(path, *args, **kwargs):
+        read_paths.append(os.path.basename(path))
+        return read_table(path, *args, **kwargs)
+
+    monkeypatch.setattr(feather, 'read_table', recording_read_table)
+    incremental_update(full, store_path)
+
+    assert read_paths == ['context-00000001.arrow']
+    assert sorted(os.listdir(store_path)) == ['context-00000002.arrow', 'part-00000000.arrow',
+                                              'part-00000001.arrow', 'part-00000002.arrow']
+
+
+def test_store_without_sidecar_falls_back_to_the_parts(who_csv, tmp_path):
+    raw = load_covid_data(who_csv)
+    store_path = str(tmp_path / 'store')
+    first, second, full = _staged_snapshots(raw)
+    incremental_update(first, store_path)
+    os.remove(os.path.join(store_path, 'context-00000000.arrow'))
+
+    incremental_update(second, store_path)
+    # A larger window than the sidecar was written for also needs the parts
+    incremental_update(full, store_path, window=14)
+
+    expected = create_features(clean_data(raw)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(load_feature_store(store_path), expected, check_dtype=False)
+
+
+def test_part_names_do_not_depend_on_the_part_count(who_csv, tmp_path):
+    raw = load_covid_data(who_csv)
+    store_path = str(tmp_path / 'store')
+    first, second, full = _staged_snapshots(raw)
+    incremental_update(first, store_path)
+    # As if 99,999 parts had been written with five-digit names
+    os.rename(os.path.join(store_path, 'part-00000000.arrow'),
+              os.path.join(store_path, 'part-99999.arrow'))
+    os.rename(os.path.join(store_path, 'context-00000000.arrow'),
+              os.path.join(store_path, 'context-00099999.arrow'))
+
+    incremental_update(second, store_path)
+    incremental_update(full, store_path)
+
+    assert sorted(os.listdir(store_path)) == ['context-00100001.arrow', 'part-00100000.arrow',
+                                              'part-00100001.arrow', 'part-99999.arrow']
+    expected = create_features(clean_data(raw)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(load_feature_store(store_path), expected, check_dtype=False)
@@ -0,0 +1,31 @@
+"""
+Error contract shared by the CSV loaders: None for a missing file, raise otherwise.
+"""
+
+import pandas as pd
+import pytest
+
+from src.data_preprocessing import load_covid_data
+from src.optimized_preprocessing import load_covid_data_optimized
+
+LOADERS = [load_covid_data,
+           lambda path: load_covid_data_optimized(path, use_cache=False)]
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+def test_missing_file_returns_none(loader, tmp_path):
+    assert loader(str(tmp_path / 'missing.csv')) is None
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+def test_malformed_file_raises(loader, tmp_path):
+    path = tmp_path / 'malformed.csv'
+    path.write_text('Date_reported,Country\n2020-01-01,A\n2020-01-02,A,extra,fields\n')
+
+    with pytest.raises(pd.errors.ParserError):
+        loader(str(path))
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+def test_valid_file_loads(loader, who_csv):
+    assert len(loader(who_csv)) == 12 * 120
@@ -0,0 +1,23 @@
+"""
+Peak-memory bound of the out-of-core pipeline (src.out_of_core).
+"""
+
+from tests.conftest import write_who_csv
+from benchmarks.pipeline import benchmark_out_of_core_memory
+
+MAX_ROWS = 5000
+SAMPLE_FOR_MODELING = 2000
+# Loading the larger file in one piece adds ~25 MB of peak RSS
+TOLERANCE_MB = 16
+
+
+def test_peak_memory_does_not_grow_with_dataset_size(tmp_path):
+    small = write_who_csv(tmp_path / 'small.csv', n_countries=12, n_days=500)
+    large = write_who_csv(tmp_path / 'large.csv', n_countries=60, n_days=1000, seed=1)
+
+    results = benchmark_out_of_core_memory([small, large], max_rows=MAX_ROWS,
+                                           sample_for_modeling=SAMPLE_FOR_MODELING,
+                                           tolerance_mb=TOLERANCE_MB)
+
+    assert results['rows'].tolist() == [6000, 60000]
+    assert results['peak_rss_mb'].iloc[1] <= results['peak_rss_mb'].iloc[0] + TOLERANCE_MB
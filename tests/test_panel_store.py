@@ -0,0 +1,100 @@
+"""
+Tests for the memory-mapped panel store (src.panel_store).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.panel_store import PANEL_METRICS, COVIDPanel
+
+
+@pytest.fixture
+def source():
+    """Long-format data with missing counts and some (country, date) rows absent."""
+    df = make_who_frame(n_countries=8, n_days=60)
+    df['Date_reported'] = pd.to_datetime(df['Date_reported'])
+    rng = np.random.default_rng(0)
+    return df[rng.random(len(df)) > 0.15].reset_index(drop=True)
+
+
+@pytest.fixture
+def panel(source, tmp_path):
+    COVIDPanel.build(source, str(tmp_path / 'panel'))
+    # A fresh memmap on the written files, not the object returned by build
+    return COVIDPanel.open(str(tmp_path / 'panel'))
+
+
+def _full_grid(source):
+    """Source reindexed to every (country, date) cell, sorted by Country and date."""
+    grid = pd.MultiIndex.from_product([sorted(source['Country'].unique()),
+                                       sorted(source['Date_reported'].unique())],
+                                      names=['Country', 'Date_reported'])
+    return source.set_index(['Country', 'Date_reported'])[PANEL_METRICS].reindex(grid)
+
+
+def _by_panel_order(panel, values):
+    """(countries, dates) array of a grid column, in the panel's country order."""
+    n_dates = len(panel.dates)
+    frame = pd.DataFrame(values.to_numpy().reshape(-1, n_dates),
+                         index=values.index.get_level_values('Country').unique())
+    return frame.loc[panel.countries['Country']].to_numpy()
+
+
+def test_reopened_panel_round_trips_to_the_source_frame(source, panel):
+    frame = panel.to_frame()
+
+    expected = source.sort_values(['Country', 'Date_reported']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(frame, expected[frame.columns])
+    assert panel.shape == (8, 60, len(PANEL_METRICS))
+    assert isinstance(panel.data, np.memmap) and not panel.data.flags.writeable
+
+
+def test_selections_match_the_source_rows(source, panel):
+    frame = panel.to_frame(region='AFR', start='2020-01-10', end='2020-01-20')
+
+    dates = source['Date_reported']
+    expected = source[(source['WHO_region'] == 'AFR') & (dates >= '2020-01-10')
+                      & (dates <= '2020-01-20')]
+    pd.testing.assert_frame_equal(
+        frame, expected.sort_values(['Country', 'Date_reported']).reset_index(drop=True)
+        [frame.columns])
+    # Regions are contiguous, so a region selection is a view of the memmap
+    view = panel.select(region='AFR', metric='New_cases')
+    assert np.shares_memory(view, panel.data)
+    assert view.shape == (2, 60)
+
+
+@pytest.mark.parametrize('window, min_periods', [(7, 1), (7, 4), (14, 1)])
+def test_rolling_mean_equals_pandas_rolling_over_the_date_grid(source, panel, window,
+                                                               min_periods):
+    grid = _full_grid(source)
+
+    expected = grid.groupby(level='Country')['New_cases'] \
+        .rolling(window, min_periods=min_periods).mean().droplevel(0)
+
+    np.testing.assert_allclose(panel.rolling_mean('New_cases', window, min_periods),
+                               _by_panel_order(panel, expected), rtol=1e-12)
+
+
+def test_lag_and_growth_equal_pandas_shift_over_the_date_grid(source, panel):
+    grid = _full_grid(source)
+    shifted = grid.groupby(level='Country')['Cumulative_cases'].shift(7)
+
+    np.testing.assert_array_equal(panel.lag('Cumulative_cases', 7),
+                                  _by_panel_order(panel, shifted))
+    growth = (grid['Cumulative_cases'] - shifted) / shifted * 100
+    np.testing.assert_allclose(panel.growth_rate('Cumulative_cases', 7),
+                               _by_panel_order(panel, growth), rtol=1e-12)
+
+
+def test_last_row_wins_for_duplicate_dates(source, tmp_path):
+    revised = source.iloc[[0]].assign(New_cases=12345.0)
+
+    panel = COVIDPanel.build(pd.concat([source, revised]), str(tmp_path / 'panel'))
+
+    row = source.iloc[0]
+    cell = panel.select(country=row['Country'], start=row['Date_reported'],
+                        end=row['Date_reported'], metric='New_cases')
+    assert cell.tolist() == [[12345.0]]
@@ -0,0 +1,84 @@
+"""
+Tests for the pandemic phase calendar (src.phase_calendar).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.phase_calendar import DEFAULT_PHASE_CALENDAR, PhaseCalendar, assign_pandemic_phase
+
+
+def _baseline_phase(date):
+    """The row-wise phase function the calendar replaced."""
+    if date < pd.Timestamp('2020-06-01'):
+        return 'Early_Phase'
+    elif date < pd.Timestamp('2021-01-01'):
+        return 'First_Wave'
+    elif date < pd.Timestamp('2022-01-01'):
+        return 'Vaccination_Phase'
+    else:
+        return 'Endemic_Phase'
+
+
+def test_default_calendar_matches_the_baseline_at_every_boundary():
+    dates = pd.Series(pd.to_datetime([
+        '2019-12-31', '2020-05-31', '2020-06-01', '2020-12-31 23:59', '2021-01-01',
+        '2021-12-31', '2022-01-01', '2030-01-01'], format='ISO8601'))
+    dates = pd.concat([dates, pd.Series(pd.date_range('2020-01-01', '2023-01-01'))],
+                      ignore_index=True)
+
+    phases = DEFAULT_PHASE_CALENDAR.assign(dates)
+
+    assert list(phases) == dates.map(_baseline_phase).tolist()
+    assert list(phases[:8]) == ['Early_Phase', 'Early_Phase', 'First_Wave', 'First_Wave',
+                                'Vaccination_Phase', 'Vaccination_Phase', 'Endemic_Phase',
+                                'Endemic_Phase']
+
+
+def test_regional_override_applies_only_to_its_region():
+    calendar = PhaseCalendar.from_config({
+        'breakpoints': ['2020-06-01', '2021-01-01', '2022-01-01'],
+        'labels': ['Early_Phase', 'First_Wave', 'Vaccination_Phase', 'Endemic_Phase'],
+        'regions': {'WPR': {'breakpoints': ['2020-04-01', '2021-03-01', '2022-06-01']},
+                    'AFR': {'breakpoints': ['2020-09-01'], 'labels': ['Before', 'After']}}
+    })
+    df = pd.DataFrame({
+        'Date_reported': pd.to_datetime(['2020-05-01', '2020-05-01', '2021-02-01',
+                                         '2021-02-01', '2020-10-01', None]),
+        'WHO_region': ['EUR', 'WPR', 'EUR', 'WPR', 'AFR', 'WPR']
+    })
+
+    phases = assign_pandemic_phase(df, calendar)
+
+    assert list(phases[:5]) == ['Early_Phase', 'First_Wave', 'Vaccination_Phase',
+                                'First_Wave', 'After']
+    assert pd.isna(phases[5])
+    assert list(phases.categories) == ['Early_Phase', 'First_Wave', 'Vaccination_Phase',
+                                       'Endemic_Phase', 'Before', 'After']
+
+
+def test_calendar_round_trips_through_a_json_file(tmp_path):
+    calendar = PhaseCalendar(['2020-06-01'], ['Early', 'Late'],
+                             regions={'WPR': {'breakpoints': ['2020-03-01']}})
+    path = tmp_path / 'calendar.json'
+    path.write_text(json.dumps(calendar.to_config()))
+
+    loaded = PhaseCalendar.from_config(str(path))
+
+    assert loaded.to_config() == calendar.to_config()
+    dates = pd.date_range('2020-01-01', periods=300)
+    regions = np.where(np.arange(300) % 2, 'WPR', 'EUR')
+    assert list(loaded.assign(dates, regions)) == list(calendar.assign(dates, regions))
+
+
+@pytest.mark.parametrize('breakpoints, labels', [
+    (['2020-06-01', '2021-01-01'], ['A', 'B']),
+    (['2021-01-01', '2020-06-01'], ['A', 'B', 'C']),
+    (['2020-06-01', '2020-06-01'], ['A', 'B', 'C']),
+])
+def test_invalid_calendars_are_rejected(breakpoints, labels):
+    with pytest.raises(ValueError):
+        PhaseCalendar(breakpoints, labels)
@@ -0,0 +1,52 @@
+"""
+Tests for the multi-snapshot loader (src.snapshot_loader).
+"""
+
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.snapshot_loader import load_snapshots
+
+
+def _write_snapshots(tmp_path, names):
+    """Write growing snapshots (60, 90, ... days) under ``names``; the last revises one row."""
+    raw = make_who_frame(n_countries=3, n_days=30 + 30 * len(names))
+    paths = []
+    for i, name in enumerate(names):
+        end = pd.Timestamp('2020-01-03') + pd.Timedelta(days=60 + 30 * i)
+        snapshot = raw[raw['Date_reported'] < end.strftime('%Y-%m-%d')].copy()
+        if i == len(names) - 1:
+            snapshot.loc[snapshot.index[0], 'New_deaths'] = 99
+        snapshot.to_csv(tmp_path / name, index=False, float_format='%.0f')
+        paths.append(str(tmp_path / name))
+    return paths
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_combined_snapshots_keep_first_publication_and_revisions(tmp_path, n_workers):
+    _write_snapshots(tmp_path, ['who_2020-03-03.csv', 'who_20200402.csv'])
+
+    combined = load_snapshots(str(tmp_path / 'who_*.csv'), n_workers=n_workers)
+
+    counts = combined['Snapshot_date'].value_counts()
+    # 180 rows first published in March, 90 new days and one revised row in April
+    assert counts[pd.Timestamp('2020-03-03')] == 180
+    assert counts[pd.Timestamp('2020-04-02')] == 91
+    assert str(combined['Country'].dtype) == 'category'
+
+
+def test_separate_snapshots_are_keyed_by_date(tmp_path):
+    paths = _write_snapshots(tmp_path, ['who_2020-03-03.csv', 'who_20200402.csv'])
+
+    snapshots = load_snapshots(paths, n_workers=1, combine=False)
+
+    assert list(snapshots) == [pd.Timestamp('2020-03-03'), pd.Timestamp('2020-04-02')]
+    assert [len(frame) for frame in snapshots.values()] == [180, 270]
+
+
+def test_snapshots_with_the_same_date_are_not_overwritten(tmp_path):
+    paths = _write_snapshots(tmp_path, ['who_2020-03-03.csv', 'who_20200303_v2.csv'])
+
+    with pytest.raises(ValueError, match='same snapshot date 2020-03-03'):
+        load_snapshots(paths, n_workers=1, combine=False)
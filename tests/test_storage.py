@@ -0,0 +1,105 @@
+"""
+Tests for the processed data formats and the Parquet manifest (src.storage).
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.data_preprocessing import clean_data
+from src.storage import (MANIFEST_FILE, OUTPUT_FORMATS, PartitionedParquetWriter,
+                         load_processed_data, output_path_for, read_manifest, write_dataset)
+
+
+@pytest.fixture
+def processed():
+    """Cleaned data spanning two years, with a Year column."""
+    df = clean_data(make_who_frame(n_countries=6, n_days=400))
+    return df.assign(Year=df['Date_reported'].dt.year.astype('int64'))
+
+
+def _sorted(df):
+    return df.sort_values(['Country', 'Date_reported']).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('file_format', OUTPUT_FORMATS)
+def test_every_format_round_trips(processed, tmp_path, file_format):
+    path = output_path_for(str(tmp_path), 'covid_processed.csv', file_format)
+
+    size = write_dataset(processed, path, file_format)
+    loaded = load_processed_data(path)
+
+    assert size > 0
+    pd.testing.assert_frame_equal(_sorted(loaded)[processed.columns], _sorted(processed))
+
+
+def test_parquet_filters_read_only_the_matching_partitions(processed, tmp_path):
+    path = str(tmp_path / 'dataset')
+    write_dataset(processed, path, 'parquet')
+    manifest = read_manifest(path)
+
+    loaded = load_processed_data(path, columns=['Country', 'New_cases'],
+                                 filters={'WHO_region': ['AFR', 'EUR'], 'Year': 2021})
+
+    expected = processed[processed['WHO_region'].isin(['AFR', 'EUR'])
+                         & (processed['Year'] == 2021)]
+    assert sorted(loaded['Country']) == sorted(expected['Country'])
+    assert loaded['New_cases'].sum() == expected['New_cases'].sum()
+    assert manifest['rows'] == len(processed)
+    assert len(manifest['partitions']) == 6 * 2
+    with pytest.raises(ValueError, match='partition columns'):
+        load_processed_data(path, filters={'Country': 'Country 000'})
+
+
+def test_batch_writer_adds_one_part_per_batch(processed, tmp_path):
+    path = str(tmp_path / 'dataset')
+    with PartitionedParquetWriter(path) as writer:
+        for _, batch in processed.groupby(processed.index // 500):
+            writer.write(batch)
+
+    manifest = read_manifest(path)
+    assert manifest['rows'] == len(processed)
+    assert {os.path.basename(p['path']) for p in manifest['partitions']} == \
+        {f'part-{i}.parquet' for i in range(writer.batches)}
+    pd.testing.assert_frame_equal(_sorted(load_processed_data(path))[processed.columns],
+                                  _sorted(processed))
+
+
+def test_partial_write_leaves_no_manifest(processed, tmp_path, monkeypatch):
+    path = str(tmp_path / 'dataset')
+    write_dataset(processed, path, 'parquet')
+    original_to_parquet = pd.DataFrame.to_parquet
+    written = []
+
+    def failing_to_parquet(self, *args, **kwargs):
+        if len(written) == 3:
+            raise OSError('disk full')
+        written.append(args[0])
+        return original_to_parquet(self, *args, **kwargs)
+
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', failing_to_parquet)
+    with pytest.raises(OSError, match='disk full'):
+        write_dataset(processed, path, 'parquet', n_workers=1)
+
+    # The manifest of the previous dataset is gone and none was written for the partial one
+    assert len(written) == 3
+    assert not os.path.exists(os.path.join(path, MANIFEST_FILE))
+    with pytest.raises(FileNotFoundError):
+        load_processed_data(path)
+
+
+def test_failing_batch_writer_leaves_no_manifest(processed, tmp_path):
+    path = str(tmp_path / 'dataset')
+    with pytest.raises(RuntimeError):
+        with PartitionedParquetWriter(path) as writer:
+            writer.write(processed.iloc[:500])
+            raise RuntimeError('interrupted')
+
+    assert os.listdir(path) and not os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown output format'):
+        output_path_for(str(tmp_path), 'covid.csv', 'xlsx')
@@ -0,0 +1,127 @@
+"""
+Tests for the streaming loader, partition stream and reservoir sampler
+(src.streaming).
+"""
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from tests.conftest import write_who_csv
+from src.data_preprocessing import clean_data, create_features
+from src.streaming import iter_csv_chunks, stratified_reservoir_sample, stream_covid_partitions
+
+
+@pytest.mark.parametrize('chunk_size', [100, 1000, 5000])
+def test_sample_covers_every_region_equally(who_csv, chunk_size):
+    sample, region_counts = stratified_reservoir_sample(iter_csv_chunks(who_csv, chunk_size), 60)
+
+    assert len(sample) == 60
+    assert sample['WHO_region'].value_counts().tolist() == [10] * 6
+    assert region_counts.sum() == 12 * 120
+    assert not sample.duplicated().any()
+
+
+def test_sample_is_topped_up_from_larger_strata(who_csv):
+    raw = pd.read_csv(who_csv)
+    # AFR keeps 6 rows (2 countries x 3 days), less than its share of 100 // 6
+    small = raw[(raw['WHO_region'] != 'AFR') | (raw['Date_reported'] < '2020-01-06')]
+    sample, _ = stratified_reservoir_sample([small.assign(
+        Date_reported=pd.to_datetime(small['Date_reported']))], 100)
+
+    assert len(sample) == 100
+    assert (sample['WHO_region'] == 'AFR').sum() == 6
+
+
+def test_sample_size_is_capped_when_strata_outnumber_it(who_csv):
+    # 6 regions x 1 year = 6 strata for 4 rows
+    sample, _ = stratified_reservoir_sample(iter_csv_chunks(who_csv, 500), 4,
+                                            stratify_by_year=True)
+
+    assert len(sample) == 4
+    assert sample['WHO_region'].nunique() == 4
+
+
+def test_sample_keeps_one_row_per_stratum_when_it_fits(who_csv):
+    sample, _ = stratified_reservoir_sample(iter_csv_chunks(who_csv, 500), 6,
+                                            stratify_by_year=True)
+
+    assert sorted(sample['WHO_region']) == ['AFR', 'AMR', 'EMR', 'EUR', 'SEAR', 'WPR']
+
+
+def test_sample_larger_than_stream_returns_every_row(who_csv):
+    sample, _ = stratified_reservoir_sample(iter_csv_chunks(who_csv, 500), 10000)
+
+    expected = next(iter_csv_chunks(who_csv, 10000))
+    assert len(sample) == len(expected)
+    pd.testing.assert_frame_equal(sample.astype({c: str for c in ['Country_code', 'Country',
+                                                                  'WHO_region']}),
+                                  expected, check_dtype=False)
+
+
+def _spill_files(spill_dir):
+    return glob.glob(os.path.join(spill_dir, 'covid_spill_*', '*.pkl'))
+
+
+@pytest.mark.parametrize('max_rows', [None, 200])
+def test_partitions_are_complete_per_country_and_in_date_order(who_csv, tmp_path, max_rows):
+    raw = next(iter_csv_chunks(who_csv, 10000))
+    partitions = list(stream_covid_partitions(who_csv, chunk_size=100, max_rows=max_rows,
+                                              spill_dir=str(tmp_path)))
+
+    assert [key for key, _ in partitions] == sorted(raw['Country'].unique())
+    for key, partition in partitions:
+        assert (partition['Country'] == key).all()
+        assert partition['Date_reported'].is_monotonic_increasing
+        expected = raw[raw['Country'] == key].reset_index(drop=True)
+        pd.testing.assert_frame_equal(partition.astype({'Country_code': str, 'Country': str,
+                                                        'WHO_region': str}), expected)
+    # Spill files are removed with their partitions
+    assert _spill_files(str(tmp_path)) == []
+
+
+def test_buffers_are_spilled_above_max_rows(who_csv, tmp_path):
+    spill_dir = str(tmp_path)
+
+    stream = stream_covid_partitions(who_csv, chunk_size=100, spill_dir=spill_dir)
+    next(stream)
+    assert _spill_files(spill_dir) == []
+    stream.close()
+
+    # 1440 rows in chunks of 100: buffers above 200 rows go to disk
+    stream = stream_covid_partitions(who_csv, chunk_size=100, max_rows=200, spill_dir=spill_dir)
+    next(stream)
+    assert len(_spill_files(spill_dir)) == 11
+    stream.close()
+    assert _spill_files(spill_dir) == []
+
+
+def test_grouped_file_emits_partitions_before_the_end(tmp_path):
+    raw = next(iter_csv_chunks(write_who_csv(tmp_path / 'who.csv'), 10000))
+    grouped = raw.sort_values(['Country', 'Date_reported'])
+    path = str(tmp_path / 'grouped.csv')
+    grouped.to_csv(path, index=False)
+
+    stream = stream_covid_partitions(path, chunk_size=150, assume_sorted=True,
+                                     max_rows=100, spill_dir=str(tmp_path))
+    key, partition = next(stream)
+    # Emitted after the second chunk, the first to reach the next country
+    assert key == 'Country 000' and len(partition) == 120
+    assert len(list(stream)) == 11
+
+
+def test_pipeline_stages_accept_the_partition_stream(who_csv, capsys):
+    raw = pd.read_csv(who_csv, parse_dates=['Date_reported'])
+    expected = create_features(clean_data(raw))
+    capsys.readouterr()
+
+    results = dict(create_features(clean_data(stream_covid_partitions(who_csv, chunk_size=100))))
+
+    assert capsys.readouterr().out == ''
+    assert list(results) == sorted(raw['Country'].unique())
+    for country, features in results.items():
+        country_rows = expected[expected['Country'] == country].reset_index(drop=True)
+        pd.testing.assert_frame_equal(features.reset_index(drop=True), country_rows,
+                                      check_dtype=False, check_categorical=False)
@@ -0,0 +1,102 @@
+"""
+Tests for cumulative consistency validation and repair (src.validation).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.validation import validate_cumulative_consistency
+
+
+def _series_frame(series):
+    """Frame with one country per entry of ``series`` (country -> daily cases)."""
+    frames = []
+    for country, new_cases in series.items():
+        new_cases = np.asarray(new_cases, dtype=np.int64)
+        frames.append(pd.DataFrame({
+            'Date_reported': pd.date_range('2020-01-01', periods=len(new_cases)),
+            'Country': country,
+            'WHO_region': 'EUR',
+            'New_cases': new_cases,
+            'Cumulative_cases': np.cumsum(new_cases),
+            'New_deaths': np.zeros(len(new_cases), dtype=np.int64),
+            'Cumulative_deaths': np.zeros(len(new_cases), dtype=np.int64)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _by_country(df, col):
+    return {country: group[col].tolist() for country, group in df.groupby('Country')}
+
+
+def test_anomalies_are_reported_per_row_and_type():
+    df = _series_frame({'A': [2, -5, 3], 'B': [1, 1, 1]})
+    df.loc[5, 'Cumulative_cases'] = 4
+
+    _, anomalies = validate_cumulative_consistency(df)
+
+    rows = anomalies[['Country', 'anomaly', 'value', 'expected']].values.tolist()
+    assert rows == [['A', 'cumulative_decrease', -3.0, 2.0],
+                    ['A', 'negative_new', -5.0, 0.0],
+                    ['B', 'new_mismatch', 1.0, 2.0]]
+
+
+def test_flag_policy_keeps_values_and_adds_flags():
+    df = _series_frame({'A': [2, -5, 3], 'B': [1, 1, 1]})
+
+    flagged, anomalies = validate_cumulative_consistency(df, policy='flag')
+
+    pd.testing.assert_frame_equal(flagged[df.columns], df)
+    assert flagged['Cases_anomaly'].tolist() == [False, True, False, False, False, False]
+    assert not flagged['Deaths_anomaly'].any()
+    assert len(anomalies) == 2
+
+
+def test_clip_policy_zeroes_negatives_and_keeps_cumulatives_non_decreasing():
+    df = _series_frame({'A': [2, -5, 3, 1]})
+
+    clipped, _ = validate_cumulative_consistency(df, policy='clip')
+
+    assert clipped['New_cases'].tolist() == [2, 0, 3, 1]
+    assert clipped['Cumulative_cases'].tolist() == [2, 2, 2, 2]
+
+
+@pytest.mark.parametrize('new_cases, expected', [
+    ([4, 6, -5, 3], [2, 3, 0, 3]),
+    # More than the earlier days can absorb: the rest comes out of the following days
+    ([2, -5, 3], [0, 0, 0]),
+    ([5, -1, -9, 2, 8, 1], [0, 0, 0, 0, 5, 1]),
+    ([10, -10, 10, -10, 5], [0, 0, 0, 0, 5]),
+])
+def test_redistribute_policy_keeps_the_reported_total(new_cases, expected):
+    df = _series_frame({'A': new_cases, 'B': [1, 2, 3]})
+
+    repaired, _ = validate_cumulative_consistency(df, policy='redistribute')
+
+    assert _by_country(repaired, 'New_cases')['A'] == expected
+    assert _by_country(repaired, 'Cumulative_cases')['A'] == list(np.cumsum(expected))
+    assert _by_country(repaired, 'Cumulative_cases')['A'][-1] == sum(new_cases)
+    assert _by_country(repaired, 'Cumulative_cases')['B'] == [1, 3, 6]
+
+
+def test_redistribute_policy_leaves_unrepairable_countries_unchanged():
+    df = _series_frame({'A': [2, -5], 'B': [3, -1, 2]})
+
+    repaired, anomalies = validate_cumulative_consistency(df, policy='redistribute')
+
+    assert _by_country(repaired, 'New_cases') == {'A': [2, -5], 'B': [2, 0, 2]}
+    assert _by_country(repaired, 'Cumulative_cases') == {'A': [2, -3], 'B': [2, 2, 4]}
+    unrepaired = anomalies[anomalies['anomaly'] == 'unrepaired']
+    assert unrepaired[['Country', 'value']].values.tolist() == [['A', -5.0]]
+
+
+def test_redistribute_policy_does_not_touch_consistent_countries():
+    df = _series_frame({'A': [4, 6, -5, 3], 'B': [1, 2, 3]})
+    # A consistent country whose first row carries an earlier baseline
+    df.loc[df['Country'] == 'B', 'Cumulative_cases'] += 100
+
+    repaired, _ = validate_cumulative_consistency(df, policy='redistribute')
+
+    assert _by_country(repaired, 'Cumulative_cases')['B'] == [101, 103, 106]
+    assert repaired['Cumulative_cases'].dtype == np.int64
@@ -0,0 +1,92 @@
+"""
+Tests for persistent category vocabularies (src.vocabulary) and their use by
+the pooled forecaster (src.modeling).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_who_frame
+from src.data_preprocessing import clean_data
+from src.modeling import COVIDForecaster
+from src.vocabulary import UNKNOWN_CODE, CategoryVocabulary, VocabularyStore, encode_with_vocabulary
+
+
+def test_codes_survive_a_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'vocabulary.json')
+    df = pd.DataFrame({'Country': ['Peru', 'Chad', 'Peru', 'Fiji']})
+
+    first, _ = encode_with_vocabulary(df, ['Country'], path)
+    second, vocabularies = encode_with_vocabulary(df.iloc[::-1], ['Country'], path)
+
+    assert first['Country_encoded'].tolist() == [2, 0, 2, 1]
+    assert second['Country_encoded'].tolist() == [1, 2, 0, 2]
+    assert list(VocabularyStore(path)['Country'].classes_) == ['Chad', 'Fiji', 'Peru']
+    assert list(vocabularies['Country'].inverse_transform([0, 2])) == ['Chad', 'Peru']
+
+
+def test_new_values_are_appended_without_changing_existing_codes(tmp_path):
+    path = str(tmp_path / 'vocabulary.json')
+    encode_with_vocabulary(pd.DataFrame({'Country': ['Peru', 'Chad']}), ['Country'], path)
+
+    encoded, _ = encode_with_vocabulary(pd.DataFrame({'Country': ['Benin', 'Peru', 'Angola']}),
+                                        ['Country'], path)
+
+    # Appended in sorted order after the existing values
+    assert encoded['Country_encoded'].tolist() == [3, 1, 2]
+    assert list(VocabularyStore(path)['Country'].classes_) == ['Chad', 'Peru', 'Angola', 'Benin']
+
+
+def test_unknown_and_error_policies(tmp_path):
+    path = str(tmp_path / 'vocabulary.json')
+    encode_with_vocabulary(pd.DataFrame({'Country': ['Peru', 'Chad']}), ['Country'], path)
+    df = pd.DataFrame({'Country': ['Chad', 'Mali', None]})
+
+    encoded, _ = encode_with_vocabulary(df, ['Country'], path, unseen='unknown')
+    assert encoded['Country_encoded'].tolist() == [0, UNKNOWN_CODE, UNKNOWN_CODE]
+    with pytest.raises(ValueError, match='Mali'):
+        encode_with_vocabulary(df, ['Country'], path, unseen='error')
+    # Neither policy adds to the stored vocabulary
+    assert 'Mali' not in VocabularyStore(path)['Country']
+
+
+def test_categorical_input_only_counts_occurring_categories_as_unseen():
+    vocabulary = CategoryVocabulary(['Chad', 'Peru'])
+    values = pd.Series(pd.Categorical(['Peru', 'Chad'], categories=['Chad', 'Mali', 'Peru']))
+
+    assert vocabulary.transform(values, unseen='error').tolist() == [1, 0]
+
+
+@pytest.fixture(scope='module')
+def history():
+    """Three countries of cleaned daily data."""
+    return clean_data(make_who_frame(n_countries=3, n_days=60))
+
+
+def test_pooled_forecaster_keeps_series_codes_in_the_store(tmp_path, history):
+    path = str(tmp_path / 'vocabulary.json')
+    countries = sorted(history['Country'].unique())
+    store = VocabularyStore()
+    store['Country'].update(['Zzz'] + countries[1:], sort=False)
+    store.save(path)
+
+    forecaster = COVIDForecaster(vocabulary_path=path)
+    forecaster.train_batch(history, mode='pooled', min_rows=10)
+
+    # Stored codes are kept and the missing country is appended
+    expected = ['Zzz'] + countries[1:] + countries[:1]
+    assert list(forecaster.series_vocabulary.classes_) == expected
+    assert list(VocabularyStore(path)['Country'].classes_) == expected
+
+
+def test_pooled_forecast_policies_for_unseen_series(history):
+    forecaster = COVIDForecaster()
+    forecaster.train_batch(history, mode='pooled', min_rows=10)
+    renamed = history.replace({'Country': {history['Country'].iloc[0]: 'Elsewhere'}})
+
+    forecasts = forecaster.forecast(renamed, horizon=3, group_col='Country')
+    assert len(forecasts) == 9
+    assert np.isfinite(forecasts['New_cases_forecast']).all()
+    with pytest.raises(ValueError, match='Elsewhere'):
+        forecaster.forecast(renamed, horizon=3, group_col='Country', unseen='error')